@@ -1,9 +1,22 @@
 """envwizard - Smart environment setup tool."""
 
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.2.1"
 __author__ = "Vipin"
 __description__ = "One command to create virtual envs, install deps, and configure .env intelligently"
 
-from envwizard.core import EnvWizard
+if TYPE_CHECKING:
+    from envwizard.core import EnvWizard
 
 __all__ = ["EnvWizard", "__version__"]
+
+
+def __getattr__(name: str) -> Any:
+    # envwizard.core pulls in every detector and generator; import it on first use
+    if name == "EnvWizard":
+        from envwizard.core import EnvWizard
+
+        globals()["EnvWizard"] = EnvWizard
+        return EnvWizard
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
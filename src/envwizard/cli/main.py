@@ -4,24 +4,55 @@ import sys
 import traceback
 from pathlib import Path
 from subprocess import CalledProcessError
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 import click
-from rich.console import Console
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-from rich.tree import Tree
 
 from envwizard import __version__
-from envwizard.core import EnvWizard
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.progress import Progress
+
+# rich and envwizard.core are imported on first use, so that quick commands
+# such as --version and --help start fast
+
+
+class _LazyConsole:
+    """Stand-in for a rich Console that creates it on first use."""
+
+    def __init__(self) -> None:
+        self._console: Optional[Console] = None
+
+    def get(self) -> "Console":
+        """Return the underlying Console, creating it if needed."""
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        return self._console
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+
+console = _LazyConsole()
 
 # Global debug flag
 DEBUG_MODE = False
 
 
+def _spinner() -> "Progress":
+    """Create the transient spinner shown while a step runs."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console.get(),
+    )
+
+
 def print_banner() -> None:
     """Print the envwizard banner."""
     banner = """
@@ -49,6 +80,8 @@ def handle_error(error: Exception, command_name: str = "command") -> None:
         error: The exception that was raised
         command_name: Name of the command that failed
     """
+    from rich.panel import Panel
+
     # Create error title
     error_title = f"[bold red]Error in '{command_name}' command[/bold red]"
 
@@ -279,6 +312,67 @@ def cli(ctx: click.Context, version: bool, debug: bool) -> None:
     is_flag=True,
     help="Skip confirmation prompts (non-interactive mode for CI/CD)",
 )
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Parallel workers for scanning Python files (default: 1, 0 = one per CPU)",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Do not read or write the import cache in .envwizard/cache",
+)
+@click.option(
+    "--deep",
+    is_flag=True,
+    help="Look for imports in whole files, not just module headers (slower)",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Redo every setup step, even those recorded as up to date in .envwizard/state.json",
+)
+@click.option(
+    "--shared-pip",
+    is_flag=True,
+    help="Create the venv without pip and use one pip shared through the envwizard cache",
+)
+@click.option(
+    "--template",
+    "use_template",
+    is_flag=True,
+    help="Clone the venv from a per-interpreter template kept in the envwizard cache (faster)",
+)
+@click.option(
+    "--env-cache",
+    is_flag=True,
+    help="Restore dependencies from the environment cache if this set was installed before",
+)
+@click.option(
+    "--install-jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Concurrent pip workers for lockfiles and cached resolutions (default: CPUs, max 4)",
+)
+@click.option(
+    "--precompile",
+    is_flag=True,
+    help="Install with pip --no-compile, then byte-compile the venv and project on all cores",
+)
+@click.option(
+    "--invalidation-mode",
+    type=click.Choice(["timestamp", "checked-hash", "unchecked-hash"]),
+    default="timestamp",
+    help="How --precompile'd bytecode is checked against its source (default: timestamp)",
+)
+@click.option(
+    "--wheelhouse",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),  # type: ignore[type-var]
+    default=None,
+    help="Install only from this directory of wheels, without any index (offline)",
+)
 @click.pass_context
 def init(
     ctx: click.Context,
@@ -288,6 +382,17 @@ def init(
     no_dotenv: bool,
     python_version: Optional[str],
     yes: bool,
+    jobs: int,
+    no_cache: bool,
+    deep: bool,
+    force: bool,
+    shared_pip: bool,
+    use_template: bool,
+    env_cache: bool,
+    install_jobs: Optional[int],
+    precompile: bool,
+    invalidation_mode: str,
+    wheelhouse: Optional[Path],
 ) -> None:
     """
     Initialize a complete development environment.
@@ -297,6 +402,8 @@ def init(
     - Create a virtual environment
     - Install dependencies (if found)
     - Generate .env files with smart defaults
+
+    Steps whose inputs did not change since the last run are skipped.
     """
     try:
         print_banner()
@@ -304,13 +411,15 @@ def init(
         project_path = path or Path.cwd()
         console.print(f"\n[bold]Project path:[/bold] {project_path}\n")
 
-        wizard = EnvWizard(project_path)
+        from rich.markup import escape
+
+        from envwizard.core import EnvWizard
+
+        wizard = EnvWizard(project_path, jobs=jobs, use_cache=not no_cache, deep_scan=deep)
+        if force:
+            wizard.state.clear()
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
+        with _spinner() as progress:
             # Analyze project
             task = progress.add_task("[cyan]Analyzing project...", total=None)
             project_info = wizard.get_project_info()
@@ -330,17 +439,28 @@ def init(
         console.print()
 
         # Perform setup
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
+        with _spinner() as progress:
             task = progress.add_task("[cyan]Setting up environment...", total=None)
 
+            def show_pip_output(line: str) -> None:
+                # Show the latest pip line next to the spinner
+                latest = escape(line[:80])
+                progress.update(
+                    task, description=f"[cyan]Installing dependencies...[/cyan] [dim]{latest}[/dim]"
+                )
+
             results = wizard.setup(
                 venv_name=venv_name,
                 install_deps=not no_install,
                 create_dotenv=not no_dotenv,
+                project_info=project_info,
+                shared_pip=shared_pip,
+                use_template=use_template,
+                use_env_cache=env_cache,
+                on_output=show_pip_output,
+                install_jobs=install_jobs,
+                precompile=invalidation_mode if precompile else None,
+                wheelhouse=wheelhouse,
             )
 
             progress.update(task, completed=True)
@@ -361,10 +481,29 @@ def init(
     default=None,
     help="Project directory path",
 )
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Parallel workers for scanning Python files (default: 1, 0 = one per CPU)",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Do not read or write the import cache in .envwizard/cache",
+)
+@click.option(
+    "--deep",
+    is_flag=True,
+    help="Look for imports in whole files, not just module headers (slower)",
+)
 @click.pass_context
-def detect(ctx: click.Context, path: Optional[Path]) -> None:
+def detect(ctx: click.Context, path: Optional[Path], jobs: int, no_cache: bool, deep: bool) -> None:
     """
-    Detect project type and frameworks without making any changes.
+    Detect project type and frameworks without changing the environment.
+
+    Only the import cache in .envwizard/cache is written (see --no-cache).
     """
     try:
         print_banner()
@@ -372,19 +511,25 @@ def detect(ctx: click.Context, path: Optional[Path]) -> None:
         project_path = path or Path.cwd()
         console.print(f"\n[bold]Analyzing project at:[/bold] {project_path}\n")
 
-        wizard = EnvWizard(project_path)
+        from envwizard.core import EnvWizard
+
+        wizard = EnvWizard(project_path, jobs=jobs, use_cache=not no_cache, deep_scan=deep)
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
+        with _spinner() as progress:
             task = progress.add_task("[cyan]Detecting project type...", total=None)
             project_info = wizard.get_project_info()
             progress.update(task, completed=True)
 
         _display_project_info(project_info)
 
+        import_cache = wizard.project_detector.import_cache
+        if import_cache is not None and import_cache.enabled:
+            stats = import_cache.stats()
+            console.print(
+                f"[dim]Import cache: {stats['hits']} hits, "
+                f"{stats['content_hits']} content hits, {stats['misses']} misses[/dim]\n"
+            )
+
     except Exception as e:
         handle_error(e, "detect")
         sys.exit(1)
@@ -414,6 +559,17 @@ def detect(ctx: click.Context, path: Optional[Path]) -> None:
     is_flag=True,
     help="Skip confirmation prompts (non-interactive mode for CI/CD)",
 )
+@click.option(
+    "--shared-pip",
+    is_flag=True,
+    help="Create the venv without pip and use one pip shared through the envwizard cache",
+)
+@click.option(
+    "--template",
+    "use_template",
+    is_flag=True,
+    help="Clone the venv from a per-interpreter template kept in the envwizard cache (faster)",
+)
 @click.pass_context
 def create_venv(
     ctx: click.Context,
@@ -421,11 +577,17 @@ def create_venv(
     name: str,
     python_version: Optional[str],
     yes: bool,
+    shared_pip: bool,
+    use_template: bool,
 ) -> None:
     """
     Create a virtual environment only.
     """
+    from rich.panel import Panel
+
     try:
+        from envwizard.core import EnvWizard
+
         project_path = path or Path.cwd()
         wizard = EnvWizard(project_path)
 
@@ -434,7 +596,9 @@ def create_venv(
         if yes:
             console.print("[dim]Non-interactive mode: proceeding without confirmation[/dim]\n")
 
-        success, message, venv_path = wizard.create_venv_only(name, python_version)
+        success, message, venv_path = wizard.create_venv_only(
+            name, python_version, shared_pip=shared_pip, use_template=use_template
+        )
 
         if success:
             console.print(f"[green]✓[/green] {message}\n")
@@ -475,7 +639,11 @@ def create_dotenv(ctx: click.Context, path: Optional[Path], yes: bool) -> None:
     """
     Generate .env files only.
     """
+    from rich.panel import Panel
+
     try:
+        from envwizard.core import EnvWizard
+
         project_path = path or Path.cwd()
         wizard = EnvWizard(project_path)
 
@@ -503,8 +671,409 @@ def create_dotenv(ctx: click.Context, path: Optional[Path], yes: bool) -> None:
         sys.exit(1)
 
 
+@cli.command()
+@click.option(
+    "--path",
+    "-p",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),  # type: ignore[type-var]
+    default=None,
+    help="Project directory path",
+)
+@click.option(
+    "--venv-name",
+    default="venv",
+    help="Virtual environment whose interpreter to resolve for (default: venv)",
+)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Resolve again even if a cached resolution exists",
+)
+def resolve(path: Optional[Path], venv_name: str, refresh: bool) -> None:
+    """
+    Resolve the project's dependencies to exact versions and cache the result.
+
+    Later installs with the same requirements, interpreter and platform
+    install the cached versions without resolving again.
+    """
+    from rich.markup import escape
+    from rich.table import Table
+
+    try:
+        from datetime import datetime
+
+        from envwizard.core import EnvWizard
+
+        wizard = EnvWizard(path or Path.cwd())
+        dep_info = wizard.dependency_detector.get_install_file()
+        if not dep_info:
+            console.print("[yellow]No dependency file found[/yellow]")
+            return
+        dep_name, dep_file = dep_info
+        venv_path = wizard.project_path / venv_name
+        if not venv_path.exists():
+            console.print(
+                f"[red]✗[/red] Virtual environment '{venv_name}' not found", style="bold red"
+            )
+            sys.exit(1)
+
+        with _spinner() as progress:
+            task = progress.add_task(f"[cyan]Resolving {dep_name}...", total=None)
+
+            def show_pip_output(line: str) -> None:
+                latest = escape(line[:80])
+                progress.update(
+                    task, description=f"[cyan]Resolving {dep_name}...[/cyan] [dim]{latest}[/dim]"
+                )
+
+            resolution, message = wizard.venv_manager.resolve_dependencies(
+                venv_path, dep_file, refresh=refresh, on_output=show_pip_output
+            )
+
+        if resolution is None:
+            console.print(f"[red]✗[/red] {message}", style="bold red")
+            sys.exit(1)
+
+        created = datetime.fromtimestamp(resolution.created).strftime("%Y-%m-%d %H:%M")
+        console.print(f"[green]✓[/green] {message} [dim](resolved {created})[/dim]\n")
+        table = Table(title=f"[bold]Resolution of {dep_name}[/bold]")
+        table.add_column("Package", style="cyan")
+        table.add_column("Version", style="green")
+        for pin in sorted(resolution.pins.requirements, key=lambda r: r.key):
+            table.add_row(pin.name, pin.version)
+        console.print(table)
+
+    except Exception as e:
+        handle_error(e, "resolve")
+        sys.exit(1)
+
+
+@cli.group()
+def wheelhouse() -> None:
+    """
+    Collect and serve wheels for offline installs.
+    """
+
+
+@wheelhouse.command("build")
+@click.option(
+    "--path",
+    "-p",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),  # type: ignore[type-var]
+    default=None,
+    help="Project directory path",
+)
+@click.option(
+    "--venv-name",
+    default="venv",
+    help="Virtual environment whose interpreter to collect wheels for (default: venv)",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(file_okay=False, dir_okay=True, path_type=Path),  # type: ignore[type-var]
+    default=None,
+    help="Wheelhouse directory (default: wheelhouse in the project directory)",
+)
+def wheelhouse_build(path: Optional[Path], venv_name: str, output: Optional[Path]) -> None:
+    """
+    Collect wheels for the project's whole dependency set into a directory.
+
+    Packages only published as sdists are built into wheels, so that
+    `envwizard init --wheelhouse DIR` installs without any index or build.
+    """
+    from rich.markup import escape
+
+    try:
+        from envwizard.core import EnvWizard
+
+        wizard = EnvWizard(path or Path.cwd())
+        dep_info = wizard.dependency_detector.get_install_file()
+        if not dep_info:
+            console.print("[yellow]No dependency file found[/yellow]")
+            return
+        dep_name, dep_file = dep_info
+        venv_path = wizard.project_path / venv_name
+        if not venv_path.exists():
+            console.print(
+                f"[red]✗[/red] Virtual environment '{venv_name}' not found", style="bold red"
+            )
+            sys.exit(1)
+        directory = output or wizard.project_path / "wheelhouse"
+
+        with _spinner() as progress:
+            task = progress.add_task(f"[cyan]Collecting wheels for {dep_name}...", total=None)
+
+            def show_pip_output(line: str) -> None:
+                latest = escape(line[:80])
+                progress.update(
+                    task,
+                    description=f"[cyan]Collecting wheels...[/cyan] [dim]{latest}[/dim]",
+                )
+
+            success, message = wizard.venv_manager.build_wheelhouse(
+                venv_path, dep_file, directory, on_output=show_pip_output
+            )
+
+        if not success:
+            console.print(f"[red]✗[/red] {escape(message)}", style="bold red")
+            sys.exit(1)
+        console.print(f"[green]✓[/green] {message}")
+        console.print(f"[dim]Install with: envwizard init --wheelhouse {directory}[/dim]")
+
+    except Exception as e:
+        handle_error(e, "wheelhouse build")
+        sys.exit(1)
+
+
+@wheelhouse.command("serve")
+@click.argument(
+    "directory",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),  # type: ignore[type-var]
+)
+@click.option(
+    "--host",
+    default="127.0.0.1",
+    help="Interface to listen on (default: 127.0.0.1)",
+)
+@click.option(
+    "--port",
+    type=click.IntRange(min=0, max=65535),
+    default=8080,
+    help="Port to listen on (default: 8080, 0 = any free port)",
+)
+def wheelhouse_serve(directory: Path, host: str, port: int) -> None:
+    """
+    Serve a wheelhouse as a simple package index, until interrupted.
+
+    Point pip at it with --index-url; meant for machines and tests without
+    access to a package index.
+    """
+    try:
+        from envwizard.wheelhouse import WheelhouseIndex
+
+        index = WheelhouseIndex(directory, host, port)
+        console.print(f"[green]✓[/green] Serving {directory} at {index.url}")
+        console.print("[dim]Press Ctrl+C to stop[/dim]")
+        try:
+            index.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            index.stop()
+
+    except Exception as e:
+        handle_error(e, "wheelhouse serve")
+        sys.exit(1)
+
+
+@cli.group()
+def cache() -> None:
+    """
+    Inspect and prune the environment cache.
+    """
+
+
+@cache.command("stats")
+def cache_stats() -> None:
+    """
+    Show what the environment cache holds.
+    """
+    from rich.table import Table
+
+    try:
+        from datetime import datetime
+
+        from envwizard.env_cache import EnvCache, format_size
+
+        env_cache = EnvCache()
+        stats = env_cache.stats()
+
+        table = Table(title="[bold]Environment Cache[/bold]", show_header=False)
+        table.add_column("Property", style="cyan")
+        table.add_column("Value", style="green")
+        table.add_row("Location", stats["path"])
+        table.add_row("Environments", str(stats["entries"]))
+        table.add_row("Stored files", str(stats["objects"]))
+        table.add_row("Size on disk", format_size(stats["size"]))
+        table.add_row("Size limit", format_size(stats["max_size"]))
+        console.print(table)
+        console.print()
+
+        entries = env_cache.entries()
+        if entries:
+            table = Table(title="[bold]Environments (least recently used first)[/bold]")
+            table.add_column("Key", style="cyan")
+            table.add_column("Requirements", justify="right")
+            table.add_column("Files", justify="right")
+            table.add_column("Size", justify="right")
+            table.add_column("Last used")
+            for entry in entries:
+                table.add_row(
+                    entry.key[:12],
+                    str(entry.requirements),
+                    str(entry.files),
+                    format_size(entry.size),
+                    datetime.fromtimestamp(entry.last_used).strftime("%Y-%m-%d %H:%M"),
+                )
+            console.print(table)
+            console.print()
+
+    except Exception as e:
+        handle_error(e, "cache stats")
+        sys.exit(1)
+
+
+@cache.command("prune")
+@click.option(
+    "--max-size",
+    help="Evict least recently used environments until the cache fits this size (e.g. 2G)",
+)
+@click.option(
+    "--all",
+    "prune_all",
+    is_flag=True,
+    help="Remove every cached environment",
+)
+def cache_prune(max_size: Optional[str], prune_all: bool) -> None:
+    """
+    Evict least recently used environments from the environment cache.
+
+    Without options the cache is trimmed to its configured limit.
+    """
+    try:
+        from envwizard.env_cache import EnvCache, format_size, parse_size
+
+        try:
+            limit = 0 if prune_all else parse_size(max_size) if max_size else None
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--max-size") from e
+
+        removed, freed = EnvCache().prune(limit)
+        console.print(
+            f"[green]✓[/green] Removed {removed} environments, freed {format_size(freed)}"
+        )
+
+    except click.BadParameter:
+        raise
+    except Exception as e:
+        handle_error(e, "cache prune")
+        sys.exit(1)
+
+
+@cli.group()
+def report() -> None:
+    """
+    Show reports on past envwizard runs.
+    """
+
+
+@report.command("installs")
+@click.option(
+    "--path",
+    "-p",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),  # type: ignore[type-var]
+    default=None,
+    help="Only include installs for this project directory",
+)
+@click.option(
+    "--limit",
+    "-n",
+    type=click.IntRange(min=1),
+    default=10,
+    help="Number of packages to list per table (default: 10)",
+)
+def report_installs(path: Optional[Path], limit: int) -> None:
+    """
+    Show the slowest packages, source builds and regressions of past installs.
+
+    Timings are recorded by every dependency install envwizard runs.
+    """
+    from rich.table import Table
+
+    try:
+        from envwizard.install_history import InstallHistory
+
+        history = InstallHistory()
+        project = path.resolve() if path else None
+        runs = history.runs(project)
+        if not runs:
+            console.print("[yellow]No installs recorded yet[/yellow]")
+            return
+
+        reports = history.package_reports(project)
+        total = sum(run.get("total_seconds", 0) for run in runs)
+        console.print(
+            f"[bold]{len(runs)} install runs[/bold], {len(reports)} packages, "
+            f"{total:.1f}s in total\n"
+        )
+
+        table = Table(title="[bold]Slowest Packages[/bold]")
+        table.add_column("Package", style="cyan")
+        table.add_column("Version")
+        table.add_column("Runs", justify="right")
+        table.add_column("Median", justify="right")
+        table.add_column("Last", justify="right")
+        for item in reports[:limit]:
+            table.add_row(
+                item.name,
+                item.version or "-",
+                str(item.runs),
+                f"{item.median_seconds:.1f}s",
+                f"{item.last_seconds:.1f}s",
+            )
+        console.print(table)
+        console.print()
+
+        builds = sorted(
+            (r for r in reports if r.source_builds),
+            key=lambda r: r.median_build_seconds,
+            reverse=True,
+        )
+        if builds:
+            table = Table(title="[bold]Built From Source[/bold] (candidates for prebuilt wheels)")
+            table.add_column("Package", style="cyan")
+            table.add_column("Version")
+            table.add_column("Builds", justify="right")
+            table.add_column("Median build", justify="right")
+            for item in builds[:limit]:
+                table.add_row(
+                    item.name,
+                    item.version or "-",
+                    str(item.source_builds),
+                    f"{item.median_build_seconds:.1f}s",
+                )
+            console.print(table)
+            console.print()
+
+        regressions = [r for r in reports if r.regressed]
+        if regressions:
+            table = Table(title="[bold]Regressions[/bold] (last run vs. earlier median)")
+            table.add_column("Package", style="cyan")
+            table.add_column("Version")
+            table.add_column("Before", justify="right")
+            table.add_column("Last", justify="right", style="red")
+            for item in regressions[:limit]:
+                table.add_row(
+                    item.name,
+                    item.version or "-",
+                    f"{item.previous_median_seconds:.1f}s",
+                    f"{item.last_seconds:.1f}s",
+                )
+            console.print(table)
+        else:
+            console.print("[green]✓[/green] No regressions")
+
+    except Exception as e:
+        handle_error(e, "report installs")
+        sys.exit(1)
+
+
 def _display_project_info(project_info: dict) -> None:
     """Display detected project information."""
+    from rich.table import Table
+    from rich.tree import Tree
+
     # Create main info table
     table = Table(title="[bold]Project Information[/bold]", show_header=False)
     table.add_column("Property", style="cyan")
@@ -553,6 +1122,8 @@ def _display_project_info(project_info: dict) -> None:
 
 def _display_results(results: dict) -> None:
     """Display setup results."""
+    from rich.panel import Panel
+
     console.print("\n[bold]Setup Results[/bold]\n")
 
     # Virtual environment
@@ -562,7 +1133,11 @@ def _display_results(results: dict) -> None:
         console.print("[yellow]○[/yellow] Virtual environment (skipped or already exists)")
 
     # Dependencies
-    if results.get("deps_installed"):
+    if "deps" in results.get("skipped", []):
+        console.print("[green]✓[/green] Dependencies up to date")
+    elif results.get("deps_restored"):
+        console.print("[green]✓[/green] Dependencies restored from the environment cache")
+    elif results.get("deps_installed"):
         console.print("[green]✓[/green] Dependencies installed")
     elif "No dependency file" in " ".join(results.get("messages", [])):
         console.print("[yellow]○[/yellow] Dependencies (no dependency file found)")
@@ -570,7 +1145,9 @@ def _display_results(results: dict) -> None:
         console.print("[red]✗[/red] Dependencies installation failed")
 
     # .env files
-    if results.get("dotenv_created"):
+    if "dotenv" in results.get("skipped", []):
+        console.print("[green]✓[/green] .env files up to date")
+    elif results.get("dotenv_created"):
         console.print("[green]✓[/green] .env files created")
     else:
         console.print("[yellow]○[/yellow] .env files (skipped or already exist)")
@@ -1,15 +1,35 @@
 """Core EnvWizard functionality."""
 
+import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-
-from envwizard.detectors import DependencyDetector, FrameworkDetector, ProjectDetector
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from envwizard import __version__
+from envwizard.detectors import (
+    DependencyDetector,
+    FrameworkDetector,
+    ProjectDetector,
+    ProjectIndex,
+    ProjectManifest,
+)
+from envwizard.env_cache import EnvCache
 from envwizard.generators import DotEnvGenerator
+from envwizard.locations import user_cache_dir
 from envwizard.logger import get_logger
+from envwizard.state import (
+    STATE_FILENAME,
+    StateLedger,
+    file_digest,
+    fingerprint,
+    stat_signature,
+)
 from envwizard.venv import VirtualEnvManager
 
 logger = get_logger(__name__)
 
+# Per-project directory for envwizard's own caches and state
+STATE_DIR_NAME = ".envwizard"
+
 
 def _validate_project_path(path: Path) -> Path:
     """
@@ -62,21 +82,154 @@ def _validate_project_path(path: Path) -> Path:
 class EnvWizard:
     """Main EnvWizard class for environment setup."""
 
-    def __init__(self, project_path: Optional[Path] = None) -> None:
-        """Initialize EnvWizard."""
+    def __init__(
+        self,
+        project_path: Optional[Path] = None,
+        jobs: Optional[int] = 1,
+        use_cache: bool = True,
+        deep_scan: bool = False,
+    ) -> None:
+        """
+        Initialize EnvWizard.
+
+        Args:
+            project_path: Project directory (default: current directory)
+            jobs: Workers used to parse Python files (1 for serial, 0 for one per CPU)
+            use_cache: Keep a persistent import cache under .envwizard/cache
+            deep_scan: Look for imports in whole files, not just module headers
+        """
         provided_path = project_path or Path.cwd()
         self.project_path = _validate_project_path(provided_path)
         logger.info(f"Initialized EnvWizard for project: {self.project_path}")
-        self.project_detector = ProjectDetector(self.project_path)
-        self.dependency_detector = DependencyDetector(self.project_path)
+        self.state_dir = self.project_path / STATE_DIR_NAME
+        # Phases completed by earlier runs, so unchanged ones can be skipped
+        self.state = StateLedger(self.state_dir / STATE_FILENAME)
+        # One walk of the tree and one parse of each dependency file,
+        # shared by every detector and generator
+        self.index = ProjectIndex(self.project_path)
+        self.manifest = ProjectManifest(self.index)
+        self.project_detector = ProjectDetector(
+            self.project_path,
+            jobs=jobs,
+            cache_dir=self.state_dir / "cache" if use_cache else None,
+            deep_scan=deep_scan,
+            index=self.index,
+            manifest=self.manifest,
+        )
+        self.dependency_detector = DependencyDetector(
+            self.project_path, index=self.index, manifest=self.manifest
+        )
         self.venv_manager = VirtualEnvManager(self.project_path)
-        self.dotenv_generator = DotEnvGenerator(self.project_path)
+        self.dotenv_generator = DotEnvGenerator(self.project_path, manifest=self.manifest)
+        # Last full detection result and the tree signature it was taken at
+        self._project_info: Optional[Dict[str, Any]] = None
+        self._project_info_signature: Optional[Tuple[Any, ...]] = None
+        self._env_cache: Optional[EnvCache] = None
+
+    def refresh(self) -> None:
+        """Forget the filesystem snapshot, parsed manifests and detection result."""
+        self.index.refresh()
+        self.manifest.refresh()
+        self._project_info = None
+        self._project_info_signature = None
+
+    def _remember_project_info(self, project_info: Dict[str, Any]) -> Dict[str, Any]:
+        self._project_info = project_info
+        self._project_info_signature = self.index.signature()
+        return project_info
+
+    def _detect(self, project_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Get the full detection result, scanning the project at most once.
+
+        The result is cached on this instance and reused until the tree
+        changes (see ProjectIndex.signature), at which point the snapshot is
+        dropped and the project is scanned again.
+
+        Args:
+            project_info: Result computed elsewhere to adopt instead of scanning
+
+        Returns:
+            Detection result as returned by ProjectDetector.detect_project_type
+        """
+        if project_info is not None and project_info is not self._project_info:
+            return self._remember_project_info(project_info)
+
+        if self._project_info is not None:
+            if self.index.signature() == self._project_info_signature:
+                return self._project_info
+            logger.info("Project changed since it was analyzed, detecting again")
+            self.refresh()
+
+        recorded = self.state.get("detect")
+        if recorded and self.state.is_current("detect", self._detect_fingerprint()):
+            logger.debug("Project unchanged since the last setup, reusing its analysis")
+            return self._remember_project_info(recorded["project_info"])
+
+        return self._remember_project_info(self.project_detector.detect_project_type())
+
+    def _detect_fingerprint(self) -> str:
+        """Fingerprint of everything project detection looks at."""
+        detector = self.project_detector
+        return fingerprint(
+            __version__,
+            detector.max_depth,
+            detector.deep_scan,
+            self.index.entries_signature(),
+        )
+
+    def _venv_fingerprint(self, venv_path: Path) -> Optional[str]:
+        """Fingerprint of a virtual environment and the interpreter it runs on."""
+        pyvenv_cfg = venv_path / "pyvenv.cfg"
+        venv_signature = stat_signature(pyvenv_cfg)
+        if venv_signature is None:
+            return None
+        python = os.path.realpath(self.venv_manager.get_python_executable(venv_path))
+        interpreter_signature = stat_signature(Path(python))
+        if interpreter_signature is None:
+            return None
+        return fingerprint(venv_signature, file_digest(pyvenv_cfg), python, interpreter_signature)
+
+    def _deps_fingerprint(
+        self, venv_path: Path, dep_file: Path, options: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Fingerprint of a dependency installation.
+
+        It covers every file the dependency set is read from (including
+        -r/-c includes), the install options and the target venv.
+        """
+        venv_fingerprint = self._venv_fingerprint(venv_path)
+        if venv_fingerprint is None or file_digest(dep_file) is None:
+            return None
+        digests = [
+            (str(path), file_digest(path))
+            for path in self.dependency_detector.get_dependency_files(dep_file)
+        ]
+        return fingerprint(dep_file.name, digests, options, venv_fingerprint)
+
+    def _dotenv_fingerprint(self, frameworks: Iterable[str]) -> Optional[str]:
+        """Fingerprint of the generated .env files and what they were generated for."""
+        env_digest = file_digest(self.project_path / ".env")
+        if env_digest is None:
+            return None
+        return fingerprint(
+            sorted(frameworks), env_digest, file_digest(self.project_path / ".env.example")
+        )
 
     def setup(
         self,
         venv_name: str = "venv",
         install_deps: bool = True,
         create_dotenv: bool = True,
+        project_info: Optional[Dict[str, Any]] = None,
+        shared_pip: bool = False,
+        use_template: bool = False,
+        use_env_cache: bool = False,
+        on_output: Optional[Callable[[str], None]] = None,
+        install_jobs: Optional[int] = None,
+        precompile: Optional[str] = None,
+        wheelhouse: Optional[Path] = None,
     ) -> Dict[str, Any]:
         """
         Perform complete environment setup.
@@ -85,6 +238,22 @@ class EnvWizard:
             venv_name: Name for virtual environment
             install_deps: Whether to install dependencies
             create_dotenv: Whether to create .env files
+            project_info: Detection result from get_project_info(), reused
+                unless the project changed since
+            shared_pip: Create the venv without pip and link the pip shared
+                through the user cache
+            use_template: Clone the venv from a per-interpreter template
+            use_env_cache: Restore dependencies from the per-user environment
+                cache when the same set was installed before, and store them
+                after installing them otherwise
+            on_output: Called with each line of pip's output as it arrives
+            install_jobs: Concurrent pip workers for exact install sets
+                (default: VirtualEnvManager's DEFAULT_INSTALL_JOBS)
+            precompile: Install without compiling and byte-compile the venv
+                and project sources afterwards on all cores, with this
+                invalidation mode ("timestamp", "checked-hash", "unchecked-hash")
+            wheelhouse: Install dependencies only from this directory of
+                wheels, without any package index
 
         Returns:
             Dictionary with setup results
@@ -94,18 +263,23 @@ class EnvWizard:
             "venv_created": False,
             "venv_path": None,
             "deps_installed": False,
+            "deps_restored": False,
             "dotenv_created": False,
+            "skipped": [],
             "errors": [],
             "messages": [],
         }
 
-        # Detect project type
-        project_info = self.project_detector.detect_project_type()
+        # Detect project type (reused from the state ledger if nothing changed)
+        project_info = self._detect(project_info)
         results["project_info"] = project_info
 
         # Create virtual environment
         success, message, venv_path = self.venv_manager.create_venv(
-            venv_name, project_info.get("python_version")
+            venv_name,
+            project_info.get("python_version"),
+            shared_pip=shared_pip,
+            use_template=use_template,
         )
         results["venv_created"] = success
         results["venv_path"] = str(venv_path) if venv_path else None
@@ -115,31 +289,77 @@ class EnvWizard:
             results["errors"].append(message)
             return results
 
-        # Install dependencies
+        venv_fingerprint = self._venv_fingerprint(venv_path)
+        if venv_fingerprint:
+            self.state.record(
+                "venv",
+                venv_fingerprint,
+                path=str(venv_path),
+                interpreter=os.path.realpath(self.venv_manager.get_python_executable(venv_path)),
+            )
+
+        # Install dependencies, unless the same files were installed into this venv before,
+        # with the same options
         if install_deps:
-            dep_info = self.dependency_detector.get_dependency_file()
+            dep_info = self.dependency_detector.get_install_file()
             if dep_info:
                 _, dep_file = dep_info
-                success, message = self.venv_manager.install_dependencies(venv_path, dep_file)
-                results["deps_installed"] = success
-                results["messages"].append(message)
-                if not success:
-                    results["errors"].append(message)
+                install_options = {
+                    "jobs": install_jobs,
+                    "precompile": precompile,
+                    "wheelhouse": str(wheelhouse.resolve()) if wheelhouse else None,
+                }
+                deps_fingerprint = self._deps_fingerprint(venv_path, dep_file, install_options)
+                if self.state.is_current("deps", deps_fingerprint):
+                    results["deps_installed"] = True
+                    results["skipped"].append("deps")
+                    results["messages"].append(
+                        f"Dependencies from {dep_file.name} are up to date, skipping installation"
+                    )
+                else:
+                    success, message, restored = self._install_dependencies(
+                        venv_path,
+                        dep_file,
+                        use_env_cache,
+                        on_output,
+                        install_jobs,
+                        precompile,
+                        wheelhouse,
+                    )
+                    results["deps_installed"] = success
+                    results["deps_restored"] = restored
+                    results["messages"].append(message)
+                    if success and deps_fingerprint:
+                        self.state.record("deps", deps_fingerprint, file=dep_file.name)
+                    else:
+                        self.state.forget("deps")
+                    if not success:
+                        results["errors"].append(message)
             else:
                 results["messages"].append("No dependency file found, skipping installation")
 
         # Create .env files
         if create_dotenv:
             frameworks = project_info.get("frameworks", [])
-            success, message = self.dotenv_generator.generate_dotenv(frameworks)
-            results["dotenv_created"] = success
-            results["messages"].append(message)
-
-            if success:
-                # Add .env to .gitignore
-                success, message = self.dotenv_generator.add_to_gitignore()
+            if self.state.is_current("dotenv", self._dotenv_fingerprint(frameworks)):
+                results["skipped"].append("dotenv")
+                results["messages"].append(".env files are up to date")
+            else:
+                success, message = self.dotenv_generator.generate_dotenv(frameworks)
+                results["dotenv_created"] = success
                 results["messages"].append(message)
 
+                if success:
+                    # Add .env to .gitignore
+                    success, message = self.dotenv_generator.add_to_gitignore()
+                    results["messages"].append(message)
+
+                dotenv_fingerprint = self._dotenv_fingerprint(frameworks)
+                if dotenv_fingerprint:
+                    self.state.record("dotenv", dotenv_fingerprint)
+
+        self._save_state(project_info)
+
         # Get activation command
         if results["venv_path"]:
             activation_cmd = self.venv_manager.get_activation_command(venv_path)
@@ -147,27 +367,98 @@ class EnvWizard:
 
         return results
 
-    def get_project_info(self) -> Dict[str, Any]:
-        """Get information about the current project."""
-        return self.project_detector.detect_project_type()
+    @property
+    def env_cache(self) -> EnvCache:
+        """Per-user store of installed dependency sets."""
+        if self._env_cache is None:
+            self._env_cache = EnvCache(user_cache_dir())
+        return self._env_cache
+
+    def _install_dependencies(
+        self,
+        venv_path: Path,
+        dep_file: Path,
+        use_env_cache: bool,
+        on_output: Optional[Callable[[str], None]] = None,
+        install_jobs: Optional[int] = None,
+        precompile: Optional[str] = None,
+        wheelhouse: Optional[Path] = None,
+    ) -> Tuple[bool, str, bool]:
+        """
+        Install dependencies, from the environment cache when possible.
+
+        Returns:
+            Tuple of (success, message, restored from cache)
+        """
+        cache_key = None
+        if use_env_cache and self.env_cache.enabled:
+            requirements = self.dependency_detector.get_dependency_set(dep_file)
+            if requirements:
+                cache_key = self.env_cache.key(venv_path, requirements)
+        if cache_key:
+            method = self.env_cache.restore(cache_key, venv_path)
+            if method:
+                return True, f"Dependencies restored from the environment cache via {method}", True
+
+        success, message = self.venv_manager.install_dependencies(
+            venv_path,
+            dep_file,
+            on_output=on_output,
+            jobs=install_jobs,
+            precompile=precompile,
+            wheelhouse=wheelhouse,
+        )
+        if success and cache_key:
+            self.env_cache.store(cache_key, venv_path, requirements)
+        return success, message, False
+
+    def _save_state(self, project_info: Dict[str, Any]) -> None:
+        """Record the analysis of the tree as setup left it, then write the ledger."""
+        try:
+            # Create the state directory before taking signatures, so that
+            # creating it does not count as a change to the project
+            self.state_dir.mkdir(exist_ok=True)
+        except OSError:
+            pass
+        self.refresh()
+        self.state.record("detect", self._detect_fingerprint(), project_info=project_info)
+        self.state.save()
+        self._remember_project_info(project_info)
+
+    def get_project_info(self, frameworks: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Get information about the current project.
+
+        Args:
+            frameworks: Only look for these frameworks; detection stops once all are found
+        """
+        if frameworks is None:
+            return self._detect()
+        return self.project_detector.detect_project_type(frameworks)
 
     def create_venv_only(
-        self, venv_name: str = "venv", python_version: Optional[str] = None
+        self,
+        venv_name: str = "venv",
+        python_version: Optional[str] = None,
+        shared_pip: bool = False,
+        use_template: bool = False,
     ) -> Tuple[bool, str, Optional[Path]]:
         """Create only the virtual environment."""
-        return self.venv_manager.create_venv(venv_name, python_version)
+        return self.venv_manager.create_venv(
+            venv_name, python_version, shared_pip=shared_pip, use_template=use_template
+        )
 
     def create_dotenv_only(self, frameworks: Optional[list] = None) -> Tuple[bool, str]:
         """Create only .env files."""
         if frameworks is None:
-            project_info = self.project_detector.detect_project_type()
+            project_info = self._detect()
             frameworks = project_info.get("frameworks", [])
 
         return self.dotenv_generator.generate_dotenv(frameworks)
 
     def install_dependencies_only(self, venv_path: Path) -> Tuple[bool, str]:
         """Install dependencies only."""
-        dep_info = self.dependency_detector.get_dependency_file()
+        dep_info = self.dependency_detector.get_install_file()
         if not dep_info:
             return False, "No dependency file found"
 
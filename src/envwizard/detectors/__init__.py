@@ -3,5 +3,16 @@
 from envwizard.detectors.base import ProjectDetector
 from envwizard.detectors.framework import FrameworkDetector
 from envwizard.detectors.dependency import DependencyDetector
+from envwizard.detectors.index import ProjectIndex
+from envwizard.detectors.lockfile import LockedSet
+from envwizard.detectors.manifest import ProjectManifest, Requirement
 
-__all__ = ["ProjectDetector", "FrameworkDetector", "DependencyDetector"]
+__all__ = [
+    "ProjectDetector",
+    "FrameworkDetector",
+    "DependencyDetector",
+    "ProjectIndex",
+    "LockedSet",
+    "ProjectManifest",
+    "Requirement",
+]
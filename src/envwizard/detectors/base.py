@@ -2,16 +2,45 @@
 
 import ast
 import os
+from contextlib import closing
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
-import yaml
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Any,
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from envwizard.detectors.framework_index import FrameworkIndex
+from envwizard.detectors.imports import (
+    extract_imports_from_ast,
+    map_file_imports,
+    scan_file_imports,
+)
+from envwizard.detectors.index import ProjectIndex
+from envwizard.detectors.manifest import ProjectManifest, Requirement
+from envwizard.detectors.walker import DEFAULT_MAX_DEPTH, iter_project_files
+from envwizard.logger import get_logger
+
+if TYPE_CHECKING:
+    # sqlite3 is only needed when the cache is enabled
+    from envwizard.detectors.import_cache import ImportCache
+
+logger = get_logger(__name__)
 
 
 class ProjectDetector:
     """Detects project type and characteristics."""
 
     FRAMEWORK_INDICATORS = {
-        "django": ["manage.py", "django", "settings.py"],
+        "django": ["manage.py", "django", "settings.py", "djangorestframework"],
         "fastapi": ["fastapi", "main.py", "app.py"],
         "flask": ["flask", "app.py", "wsgi.py"],
         "streamlit": ["streamlit", ".streamlit"],
@@ -27,26 +56,97 @@ class ProjectDetector:
 
     # Framework-specific import patterns for AST detection
     FRAMEWORK_IMPORTS = {
-        "django": ["django"],
-        "fastapi": ["fastapi"],
-        "flask": ["flask"],
+        "django": ["django", "rest_framework"],
+        "fastapi": ["fastapi", "starlette"],
+        "flask": ["flask", "flask_sqlalchemy"],
         "streamlit": ["streamlit"],
         "pandas": ["pandas"],
         "numpy": ["numpy"],
         "pytest": ["pytest"],
         "requests": ["requests"],
-        "sqlalchemy": ["sqlalchemy"],
+        "sqlalchemy": ["sqlalchemy", "flask_sqlalchemy"],
         "celery": ["celery"],
     }
 
-    def __init__(self, project_path: Optional[Path] = None) -> None:
-        """Initialize detector with project path."""
+    # Reverse index over the two tables above, built on first use per class
+    _framework_index: Optional[FrameworkIndex] = None
+
+    def __init__(
+        self,
+        project_path: Optional[Path] = None,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        jobs: Optional[int] = 1,
+        cache_dir: Optional[Path] = None,
+        deep_scan: bool = False,
+        index: Optional[ProjectIndex] = None,
+        manifest: Optional[ProjectManifest] = None,
+    ) -> None:
+        """Initialize detector with project path.
+
+        Args:
+            project_path: Project root directory (default: current directory)
+            max_depth: How many directory levels below the root to scan for Python files
+            jobs: Workers used to parse Python files (1 for serial, 0 for one per CPU)
+            cache_dir: Directory for the persistent import cache (disabled if None)
+            deep_scan: Look for imports in whole files, not just module headers
+            index: Shared filesystem snapshot (one is created if not given)
+            manifest: Shared parsed dependency files (one is created if not given)
+        """
         self.project_path = project_path or Path.cwd()
+        self.max_depth = max_depth
+        self.index = index or ProjectIndex(self.project_path, max_depth=max_depth)
+        self.manifest = manifest or ProjectManifest(self.index)
+        self.jobs = jobs
+        self.cache_dir = cache_dir
+        self.deep_scan = deep_scan
+        self._import_cache: Optional[ImportCache] = None
         self.detected_frameworks: Set[str] = set()
         self.detected_files: List[str] = []
 
-    def detect_project_type(self) -> Dict[str, Any]:
-        """Detect project type and return detailed information."""
+    @classmethod
+    def framework_index(cls) -> FrameworkIndex:
+        """Get the name -> framework index for this class's framework tables."""
+        index = cls.__dict__.get("_framework_index")
+        if index is None:
+            index = FrameworkIndex.build(cls.FRAMEWORK_INDICATORS, cls.FRAMEWORK_IMPORTS)
+            cls._framework_index = index
+        return index
+
+    @classmethod
+    def register_framework(
+        cls,
+        framework: str,
+        packages: Iterable[str] = (),
+        imports: Iterable[str] = (),
+    ) -> None:
+        """
+        Teach the detector about a framework, or extra names for a known one.
+
+        Args:
+            framework: Framework name reported in detection results
+            packages: Distribution names that indicate the framework
+            imports: Top-level import names that indicate the framework
+        """
+        # Copy rather than mutate so subclasses and the base class stay independent
+        indicators = {k: list(v) for k, v in cls.FRAMEWORK_INDICATORS.items()}
+        indicators.setdefault(framework, []).extend(packages)
+        cls.FRAMEWORK_INDICATORS = indicators
+
+        modules = {k: list(v) for k, v in cls.FRAMEWORK_IMPORTS.items()}
+        modules.setdefault(framework, []).extend(imports)
+        cls.FRAMEWORK_IMPORTS = modules
+
+        cls._framework_index = None
+
+    def detect_project_type(self, frameworks: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Detect project type and return detailed information.
+
+        Args:
+            frameworks: Only look for these frameworks (default: all known ones).
+                Scanning stops as soon as all of them have been found, and the
+                reported frameworks are limited to this set.
+        """
+        wanted = frozenset(frameworks) if frameworks is not None else None
         result = {
             "frameworks": [],
             "has_requirements": False,
@@ -58,14 +158,13 @@ class ProjectDetector:
         }
 
         # Check for dependency files
-        result["has_requirements"] = (self.project_path / "requirements.txt").exists()
-        result["has_pyproject"] = (self.project_path / "pyproject.toml").exists()
-        result["has_setup_py"] = (self.project_path / "setup.py").exists()
-        result["has_pipfile"] = (self.project_path / "Pipfile").exists()
+        result["has_requirements"] = self.index.exists("requirements.txt")
+        result["has_pyproject"] = self.index.exists("pyproject.toml")
+        result["has_setup_py"] = self.index.exists("setup.py")
+        result["has_pipfile"] = self.index.exists("Pipfile")
 
         # Detect frameworks
-        frameworks = self._detect_frameworks()
-        result["frameworks"] = list(frameworks)
+        result["frameworks"] = list(self._detect_frameworks(wanted))
 
         # Detect Python version from files
         result["python_version"] = self._detect_python_version()
@@ -75,121 +174,75 @@ class ProjectDetector:
 
         return result
 
-    def _detect_frameworks(self) -> Set[str]:
-        """Detect frameworks used in the project."""
-        frameworks = set()
-
-        # Check requirements.txt
-        req_file = self.project_path / "requirements.txt"
-        if req_file.exists():
-            frameworks.update(self._parse_requirements(req_file))
+    def _detect_frameworks(self, wanted: Optional[AbstractSet[str]] = None) -> Set[str]:
+        """Detect frameworks used in the project.
 
-        # Check pyproject.toml
-        pyproject_file = self.project_path / "pyproject.toml"
-        if pyproject_file.exists():
-            frameworks.update(self._parse_pyproject(pyproject_file))
+        Args:
+            wanted: Frameworks of interest; None means all known frameworks
+        """
+        # Runtime dependencies declared in requirements.txt, pyproject.toml,
+        # Pipfile and setup.cfg
+        frameworks = self._match_framework_packages(self.manifest.runtime_requirements())
 
-        # Check Pipfile
-        pipfile = self.project_path / "Pipfile"
-        if pipfile.exists():
-            frameworks.update(self._parse_pipfile(pipfile))
+        if wanted is not None:
+            # Dependency files are cheap; skip the file scan if they answered everything
+            if wanted <= frameworks:
+                return frameworks & wanted
+            frameworks.update(self._detect_from_structure(wanted - frameworks))
+            return frameworks & wanted
 
         # Check file structure
         frameworks.update(self._detect_from_structure())
 
         return frameworks
 
+    def _match_framework_packages(self, requirements: Iterable[Requirement]) -> Set[str]:
+        """Map declared requirements to the frameworks they indicate."""
+        frameworks: Set[str] = set()
+        index = self.framework_index()
+        for requirement in requirements:
+            frameworks.update(index.frameworks_for_package(requirement.name))
+        return frameworks
+
     def _parse_requirements(self, req_file: Path) -> Set[str]:
         """Parse requirements.txt for framework detection."""
-        frameworks = set()
-        try:
-            content = req_file.read_text()
-            for line in content.splitlines():
-                line = line.strip().lower()
-                if not line or line.startswith("#"):
-                    continue
-                # Extract package name
-                pkg_name = line.split("==")[0].split(">=")[0].split("<=")[0].strip()
-                for framework, indicators in self.FRAMEWORK_INDICATORS.items():
-                    if pkg_name in [i.lower() for i in indicators]:
-                        frameworks.add(framework)
-        except Exception:
-            pass
-        return frameworks
+        return self._match_framework_packages(self.manifest.parse(req_file).requirements)
 
     def _parse_pyproject(self, pyproject_file: Path) -> Set[str]:
         """Parse pyproject.toml for framework detection."""
-        frameworks: Set[str] = set()
-        try:
-            import tomllib
-        except ImportError:
-            try:
-                import tomli as tomllib  # type: ignore
-            except ImportError:
-                return frameworks
-
-        try:
-            with open(pyproject_file, "rb") as f:
-                data = tomllib.load(f)
-                dependencies = []
-
-                # Check various dependency locations
-                if "project" in data and "dependencies" in data["project"]:
-                    dependencies.extend(data["project"]["dependencies"])
-
-                if "tool" in data and "poetry" in data["tool"]:
-                    if "dependencies" in data["tool"]["poetry"]:
-                        dependencies.extend(data["tool"]["poetry"]["dependencies"].keys())
-
-                for dep in dependencies:
-                    dep_name = dep.split("[")[0].split(">=")[0].split("==")[0].strip().lower()
-                    for framework, indicators in self.FRAMEWORK_INDICATORS.items():
-                        if dep_name in [i.lower() for i in indicators]:
-                            frameworks.add(framework)
-        except Exception:
-            pass
-        return frameworks
+        return self._match_framework_packages(
+            req for req in self.manifest.parse(pyproject_file).requirements if req.group is None
+        )
 
     def _parse_pipfile(self, pipfile: Path) -> Set[str]:
         """Parse Pipfile for framework detection."""
-        frameworks = set()
-        try:
-            content = pipfile.read_text()
-            # Simple parsing for packages section
-            in_packages = False
-            for line in content.splitlines():
-                line = line.strip()
-                if line == "[packages]":
-                    in_packages = True
-                    continue
-                if line.startswith("[") and in_packages:
-                    break
-                if in_packages and "=" in line:
-                    pkg_name = line.split("=")[0].strip().lower().strip('"').strip("'")
-                    for framework, indicators in self.FRAMEWORK_INDICATORS.items():
-                        if pkg_name in [i.lower() for i in indicators]:
-                            frameworks.add(framework)
-        except Exception:
-            pass
-        return frameworks
+        return self._match_framework_packages(
+            req for req in self.manifest.parse(pipfile).requirements if req.group is None
+        )
 
-    def _detect_from_structure(self) -> Set[str]:
+    def _detect_from_structure(self, wanted: Optional[AbstractSet[str]] = None) -> Set[str]:
         """Detect frameworks from project file structure and Python imports.
 
         This method now prioritizes AST-based import detection over filename patterns
         to avoid false positives.
+
+        Args:
+            wanted: Frameworks still to be found; None means all known frameworks
         """
         frameworks = set()
 
         # First, try AST-based detection on Python files
-        ast_frameworks = self._detect_from_imports()
+        ast_frameworks = self._detect_from_imports(wanted)
         if ast_frameworks:
             frameworks.update(ast_frameworks)
             # If we found frameworks via imports, return early to avoid false positives
             # from filename-based detection
             return frameworks
 
-        # Only fall back to filename-based detection if no imports were found
+        # Only fall back to filename-based detection if no imports were found.
+        # Names at the root and one level below it.
+        names = self.index.names(max_depth=1)
+
         for framework, indicators in self.FRAMEWORK_INDICATORS.items():
             for indicator in indicators:
                 # Skip filename patterns that can cause false positives
@@ -197,48 +250,71 @@ class ProjectDetector:
                 if indicator in ["app.py", "main.py", "wsgi.py"]:
                     continue
 
-                # Check for files
-                if (self.project_path / indicator).exists():
-                    frameworks.add(framework)
-                    continue
-
-                # Check for directories
-                if (self.project_path / indicator).is_dir() if (self.project_path / indicator).exists() else False:
+                # Check for files and directories at the root or in first-level subdirectories
+                if indicator.rstrip("/") in names:
                     frameworks.add(framework)
-                    continue
-
-                # Check in subdirectories (first level only)
-                for item in self.project_path.iterdir():
-                    if item.is_dir():
-                        if (item / indicator).exists():
-                            frameworks.add(framework)
-                            break
+                    break
 
         return frameworks
 
-    def _detect_from_imports(self) -> Set[str]:
+    def _detect_from_imports(self, wanted: Optional[AbstractSet[str]] = None) -> Set[str]:
         """Detect frameworks by parsing Python files and analyzing imports.
 
         This is the primary detection method that uses AST parsing to identify
         actual framework usage, avoiding false positives from filename patterns.
-        """
-        frameworks = set()
+        Only module headers are examined unless ``deep_scan`` is set.
+        With ``jobs`` other than 1 the files are parsed by a pool of workers;
+        the result is identical to a serial scan.
 
-        # Find all Python files in the project (recursively, up to 3 levels deep)
-        python_files = list(self.project_path.glob("*.py"))
-        python_files.extend(self.project_path.glob("*/*.py"))
-        python_files.extend(self.project_path.glob("*/*/*.py"))
-        python_files.extend(self.project_path.glob("*/*/*/*.py"))
+        Args:
+            wanted: Stop reading files once all of these have been found
+                (default: every framework in FRAMEWORK_IMPORTS)
+        """
+        frameworks: Set[str] = set()
+        unresolved = set(self.FRAMEWORK_IMPORTS if wanted is None else wanted)
+        if not unresolved:
+            return frameworks
 
-        # Parse each Python file and extract imports
-        for py_file in python_files:
-            file_frameworks = self._parse_python_file_imports(py_file)
-            frameworks.update(file_frameworks)
+        # Python files from the shared walk, which skips virtualenvs and vendored directories
+        if self.index.max_depth >= self.max_depth:
+            entries = self.index.files(["*.py"], max_depth=self.max_depth)
+        else:
+            entries = iter_project_files(self.project_path, ["*.py"], max_depth=self.max_depth)
+
+        cache = self.import_cache
+        if cache is not None and cache.enabled:
+            results: Generator[FrozenSet[str], None, None] = cache.scan(entries, jobs=self.jobs)
+        else:
+            results = map_file_imports(
+                (entry.path for entry in entries), jobs=self.jobs, deep=self.deep_scan
+            )
+
+        # Closing stops the walk and cancels queued work once nothing is left to find
+        with closing(results):
+            for imports in results:
+                found = self._match_framework_imports(imports)
+                if found:
+                    frameworks.update(found)
+                    unresolved.difference_update(found)
+                    if not unresolved:
+                        break
+
+        if cache is not None and cache.enabled:
+            logger.debug(f"Import cache: {cache.stats()}")
 
         return frameworks
 
+    @property
+    def import_cache(self) -> Optional["ImportCache"]:
+        """Persistent import cache, opened on first use when cache_dir is set."""
+        if self._import_cache is None and self.cache_dir is not None:
+            from envwizard.detectors.import_cache import ImportCache
+
+            self._import_cache = ImportCache(self.cache_dir, deep=self.deep_scan)
+        return self._import_cache
+
     def _parse_python_file_imports(self, file_path: Path) -> Set[str]:
-        """Parse a Python file using AST to extract framework imports.
+        """Parse a Python file to extract framework imports.
 
         Args:
             file_path: Path to the Python file to parse
@@ -246,39 +322,19 @@ class ProjectDetector:
         Returns:
             Set of detected framework names based on imports
         """
-        frameworks = set()
-
-        try:
-            # Read the file content
-            content = file_path.read_text(encoding="utf-8")
-
-            # Skip empty files
-            if not content.strip():
-                return frameworks
-
-            # Parse the file into an AST
-            tree = ast.parse(content, filename=str(file_path))
-
-            # Extract all imports
-            imports = self._extract_imports_from_ast(tree)
+        imports = scan_file_imports(str(file_path), deep=self.deep_scan)
+        return self._match_framework_imports(imports)
 
-            # Match imports against framework patterns
-            for framework, patterns in self.FRAMEWORK_IMPORTS.items():
-                for pattern in patterns:
-                    if any(imp.startswith(pattern) or imp == pattern for imp in imports):
-                        frameworks.add(framework)
+    def _match_framework_imports(self, imports: AbstractSet[str]) -> Set[str]:
+        """Match imported module names against framework patterns.
 
-        except SyntaxError:
-            # Silently ignore syntax errors - file might be incomplete or non-Python
-            pass
-        except UnicodeDecodeError:
-            # Silently ignore files that can't be decoded as UTF-8
-            pass
-        except Exception:
-            # Catch any other exceptions to prevent detection failures
-            pass
+        Args:
+            imports: Top-level imported module names
 
-        return frameworks
+        Returns:
+            Set of detected framework names
+        """
+        return self.framework_index().frameworks_for_imports(imports)
 
     def _extract_imports_from_ast(self, tree: ast.AST) -> Set[str]:
         """Extract all import module names from an AST.
@@ -289,60 +345,22 @@ class ProjectDetector:
         Returns:
             Set of imported module names
         """
-        imports = set()
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                # Handle: import module
-                for alias in node.names:
-                    # Get the top-level module name
-                    module_name = alias.name.split('.')[0]
-                    imports.add(module_name)
-
-            elif isinstance(node, ast.ImportFrom):
-                # Handle: from module import ...
-                if node.module:
-                    # Get the top-level module name
-                    module_name = node.module.split('.')[0]
-                    imports.add(module_name)
-
-        return imports
+        return set(extract_imports_from_ast(tree))
 
     def _detect_python_version(self) -> Optional[str]:
         """Detect required Python version from project files."""
         # Check .python-version
-        python_version_file = self.project_path / ".python-version"
-        if python_version_file.exists():
-            return python_version_file.read_text().strip()
+        if self.index.exists(".python-version"):
+            return self.index.path(".python-version").read_text().strip()
 
         # Check runtime.txt (Heroku style)
-        runtime_file = self.project_path / "runtime.txt"
-        if runtime_file.exists():
-            content = runtime_file.read_text().strip()
+        if self.index.exists("runtime.txt"):
+            content = self.index.path("runtime.txt").read_text().strip()
             if content.startswith("python-"):
                 return content.replace("python-", "")
 
-        # Check pyproject.toml
-        pyproject_file = self.project_path / "pyproject.toml"
-        if pyproject_file.exists():
-            try:
-                import tomllib
-            except ImportError:
-                try:
-                    import tomli as tomllib  # type: ignore
-                except ImportError:
-                    return None
-
-            try:
-                with open(pyproject_file, "rb") as f:
-                    data = tomllib.load(f)
-                    if "project" in data and "requires-python" in data["project"]:
-                        requires_python = data["project"]["requires-python"]
-                        return str(requires_python) if requires_python else None
-            except Exception:
-                pass
-
-        return None
+        # Check pyproject.toml and setup.cfg
+        return self.manifest.requires_python
 
     def _list_project_files(self) -> List[str]:
         """List important project files."""
@@ -359,9 +377,7 @@ class ProjectDetector:
             "manage.py",
         ]
 
-        for pattern in patterns:
-            for file in self.project_path.glob(pattern):
-                if file.is_file():
-                    important_files.append(str(file.relative_to(self.project_path)))
+        for entry in self.index.files(patterns, max_depth=0):
+            important_files.append(entry.name)
 
         return important_files
@@ -1,54 +1,148 @@
 """Dependency detection and management."""
 
-import subprocess
-import sys
+import re
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional, Set, Tuple
+
+from envwizard.detectors.index import ProjectIndex
+from envwizard.detectors.lockfile import LOCKFILES, read_lockfile
+from envwizard.detectors.manifest import ProjectManifest
+
+# pip options that pull in another requirements or constraints file
+_INCLUDE_OPTION_RE = re.compile(r"^(-r|--requirement|-c|--constraint)[\s=]*(\S+)$")
 
 
 class DependencyDetector:
     """Detect and manage project dependencies."""
 
-    def __init__(self, project_path: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        project_path: Optional[Path] = None,
+        index: Optional[ProjectIndex] = None,
+        manifest: Optional[ProjectManifest] = None,
+    ) -> None:
         """Initialize dependency detector."""
         self.project_path = project_path or Path.cwd()
+        self.index = index or ProjectIndex(self.project_path, max_depth=0)
+        self.manifest = manifest or ProjectManifest(self.index)
 
     def get_dependency_file(self) -> Optional[Tuple[str, Path]]:
         """Determine which dependency file to use."""
         # Priority order
-        files = [
-            ("pyproject.toml", self.project_path / "pyproject.toml"),
-            ("Pipfile", self.project_path / "Pipfile"),
-            ("requirements.txt", self.project_path / "requirements.txt"),
-            ("setup.py", self.project_path / "setup.py"),
-        ]
+        files = ["pyproject.toml", "Pipfile", "requirements.txt", "setup.py"]
+
+        for file_type in files:
+            if self.index.exists(file_type):
+                return (file_type, self.index.path(file_type))
 
-        for file_type, file_path in files:
-            if file_path.exists():
-                return (file_type, file_path)
+        return None
 
+    def get_lock_file(self) -> Optional[Tuple[str, Path]]:
+        """Find the lockfile (poetry.lock, Pipfile.lock) of the dependency file, if any."""
+        dep_info = self.get_dependency_file()
+        if not dep_info:
+            return None
+        for lock_name, manifest_name in LOCKFILES.items():
+            if manifest_name == dep_info[0] and self.index.is_file(lock_name):
+                return (lock_name, self.index.path(lock_name))
         return None
 
+    def get_install_file(self) -> Optional[Tuple[str, Path]]:
+        """
+        Determine which file to install dependencies from.
+
+        A lockfile takes precedence over the dependency file it locks, as it
+        gives the exact install set.
+        """
+        return self.get_lock_file() or self.get_dependency_file()
+
     def parse_requirements(self, req_file: Path) -> List[str]:
         """Parse requirements.txt and return list of packages."""
-        packages = []
+        return [req.spec for req in self.manifest.parse(req_file).requirements]
+
+    def get_dependency_set(self, dep_file: Optional[Path] = None) -> List[str]:
+        """
+        Get the normalized dependency set of a dependency file.
+
+        Names are PEP 503 normalized and whitespace is removed, and the
+        result is sorted, so reordering, reformatting or commenting the file
+        does not change it. pip options in requirements files are kept, and
+        files included with -r/-c are expanded, since both change what gets
+        installed.
+
+        Args:
+            dep_file: Dependency file (default: get_install_file())
+
+        Returns:
+            Sorted requirement strings; empty if the file cannot be parsed
+        """
+        if dep_file is None:
+            dep_info = self.get_install_file()
+            if not dep_info:
+                return []
+            dep_file = dep_info[1]
+
+        entries: Set[str] = set()
+        self._collect_dependency_set(dep_file, entries, set())
+        return sorted(entries)
+
+    def get_dependency_files(self, dep_file: Optional[Path] = None) -> List[Path]:
+        """
+        Get every file the dependency set of a dependency file is read from.
+
+        This is the file itself, the files it includes with -r/-c and, for
+        a lockfile that cannot be used, the manifest installed instead.
+
+        Args:
+            dep_file: Dependency file (default: get_install_file())
+
+        Returns:
+            Sorted file paths; empty if there is no dependency file
+        """
+        if dep_file is None:
+            dep_info = self.get_install_file()
+            if not dep_info:
+                return []
+            dep_file = dep_info[1]
+
+        seen: Set[Path] = set()
+        self._collect_dependency_set(dep_file, set(), seen)
+        return sorted(seen)
+
+    def _collect_dependency_set(self, dep_file: Path, entries: Set[str], seen: Set[Path]) -> None:
+        if dep_file in seen:
+            return
+        seen.add(dep_file)
+
+        locked = read_lockfile(dep_file)
+        if locked is not None:
+            for pin in locked.requirements:
+                entries.add(pin.key + re.sub(r"\s+", "", pin.spec[len(pin.name) :]).lower())
+            entries.update(locked.options)
+            return
+        if dep_file.name in LOCKFILES:
+            # Not usable as a lock; installs fall back to the manifest
+            dep_file = dep_file.with_name(LOCKFILES[dep_file.name])
+            seen.add(dep_file)
+
+        for req in self.manifest.parse(dep_file).requirements:
+            entries.add(req.key + re.sub(r"\s+", "", req.spec[len(req.name) :]).lower())
+
+        if dep_file.suffix != ".txt":
+            return
         try:
-            content = req_file.read_text()
-            for line in content.splitlines():
-                line = line.strip()
-                # Skip comments and empty lines
-                if not line or line.startswith("#"):
-                    continue
-                # Skip -e editable installs
-                if line.startswith("-e"):
-                    continue
-                # Skip other pip options
-                if line.startswith("-"):
-                    continue
-                packages.append(line)
-        except Exception:
-            pass
-        return packages
+            lines = dep_file.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            return
+        for line in lines:
+            line = line.split(" #", 1)[0].strip()
+            if not line.startswith("-"):
+                continue
+            include = _INCLUDE_OPTION_RE.match(line)
+            if include:
+                self._collect_dependency_set(dep_file.parent / include.group(2), entries, seen)
+            else:
+                entries.add(" ".join(line.split()))
 
     def get_all_dependencies(self) -> List[str]:
         """Get all project dependencies."""
@@ -69,57 +163,12 @@ class DependencyDetector:
 
     def _parse_pyproject_deps(self, pyproject_file: Path) -> List[str]:
         """Parse dependencies from pyproject.toml."""
-        try:
-            import tomllib
-        except ImportError:
-            try:
-                import tomli as tomllib  # type: ignore
-            except ImportError:
-                return []
-
-        try:
-            with open(pyproject_file, "rb") as f:
-                data = tomllib.load(f)
-                dependencies = []
-
-                # Check project.dependencies
-                if "project" in data and "dependencies" in data["project"]:
-                    dependencies.extend(data["project"]["dependencies"])
-
-                # Check tool.poetry.dependencies
-                if "tool" in data and "poetry" in data["tool"]:
-                    if "dependencies" in data["tool"]["poetry"]:
-                        for dep, version in data["tool"]["poetry"]["dependencies"].items():
-                            if dep != "python":
-                                if isinstance(version, str):
-                                    dependencies.append(f"{dep}{version}")
-                                else:
-                                    dependencies.append(dep)
-
-                return dependencies
-        except Exception:
-            return []
+        requirements = self.manifest.parse(pyproject_file).requirements
+        return [req.spec for req in requirements if req.group is None]
 
     def _parse_pipfile_deps(self, pipfile: Path) -> List[str]:
         """Parse dependencies from Pipfile."""
-        dependencies = []
-        try:
-            content = pipfile.read_text()
-            in_packages = False
-
-            for line in content.splitlines():
-                line = line.strip()
-                if line == "[packages]":
-                    in_packages = True
-                    continue
-                if line.startswith("[") and in_packages:
-                    break
-                if in_packages and "=" in line:
-                    pkg_name = line.split("=")[0].strip().strip('"').strip("'")
-                    dependencies.append(pkg_name)
-        except Exception:
-            pass
-        return dependencies
+        return [req.spec for req in self.manifest.parse(pipfile).requirements if req.group is None]
 
     def has_dev_dependencies(self) -> bool:
         """Check if project has dev dependencies defined."""
@@ -127,31 +176,11 @@ class DependencyDetector:
         if not dep_info:
             return False
 
-        file_type, file_path = dep_info
+        file_type, _ = dep_info
 
         if file_type == "requirements.txt":
-            dev_req = self.project_path / "requirements-dev.txt"
-            return dev_req.exists()
-        elif file_type == "pyproject.toml":
-            try:
-                import tomllib
-            except ImportError:
-                try:
-                    import tomli as tomllib  # type: ignore
-                except ImportError:
-                    return False
-
-            try:
-                with open(file_path, "rb") as f:
-                    data = tomllib.load(f)
-                    if "project" in data and "optional-dependencies" in data["project"]:
-                        return "dev" in data["project"]["optional-dependencies"]
-                    if "tool" in data and "poetry" in data["tool"]:
-                        return "dev-dependencies" in data["tool"]["poetry"]
-            except Exception:
-                pass
-        elif file_type == "Pipfile":
-            content = file_path.read_text()
-            return "[dev-packages]" in content
+            return self.index.exists("requirements-dev.txt")
+        elif file_type in ("pyproject.toml", "Pipfile"):
+            return "dev" in self.manifest.groups(file_type)
 
         return False
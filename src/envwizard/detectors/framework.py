@@ -3,6 +3,9 @@
 from typing import Dict, List, Optional
 from pathlib import Path
 
+from envwizard.detectors.index import ProjectIndex
+from envwizard.detectors.manifest import ProjectManifest
+
 
 class FrameworkDetector:
     """Detect and provide framework-specific configurations."""
@@ -130,13 +133,18 @@ class FrameworkDetector:
         return env_vars
 
     @classmethod
-    def detect_database(cls, project_path: Path) -> Optional[str]:
+    def detect_database(
+        cls, project_path: Path, manifest: Optional[ProjectManifest] = None
+    ) -> Optional[str]:
         """Detect database type from project dependencies."""
-        req_file = project_path / "requirements.txt"
-        if not req_file.exists():
+        if manifest is None:
+            manifest = ProjectManifest(ProjectIndex(project_path, max_depth=0))
+
+        requirements = manifest.runtime_requirements()
+        if not requirements:
             return None
 
-        content = req_file.read_text().lower()
+        content = "\n".join(req.spec for req in requirements).lower()
 
         if "psycopg2" in content or "postgresql" in content:
             return "postgresql"
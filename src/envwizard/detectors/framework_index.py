@@ -0,0 +1,80 @@
+"""Precompiled lookup tables from package and import names to frameworks."""
+
+import re
+from types import MappingProxyType
+from typing import AbstractSet, Dict, FrozenSet, Iterable, Mapping, NamedTuple, Set
+
+_CANONICAL_RE = re.compile(r"[-_.]+")
+
+
+def canonicalize_name(name: str) -> str:
+    """Normalize a distribution name as described in PEP 503."""
+    return _CANONICAL_RE.sub("-", name).lower()
+
+
+def _freeze(table: Dict[str, Set[str]]) -> Mapping[str, FrozenSet[str]]:
+    return MappingProxyType({name: frozenset(values) for name, values in table.items()})
+
+
+class FrameworkIndex(NamedTuple):
+    """Reverse index from names to the frameworks they indicate."""
+
+    # Canonicalized distribution name -> frameworks
+    packages: Mapping[str, FrozenSet[str]]
+    # Top-level import name -> frameworks
+    imports: Mapping[str, FrozenSet[str]]
+
+    @classmethod
+    def build(
+        cls,
+        indicators: Mapping[str, Iterable[str]],
+        imports: Mapping[str, Iterable[str]],
+    ) -> "FrameworkIndex":
+        """
+        Build the index from ProjectDetector-style framework tables.
+
+        Args:
+            indicators: Framework -> package names (and file indicators)
+            imports: Framework -> top-level import names
+
+        Returns:
+            Frozen index
+        """
+        packages: Dict[str, Set[str]] = {}
+        modules: Dict[str, Set[str]] = {}
+
+        for framework, names in indicators.items():
+            for name in names:
+                packages.setdefault(canonicalize_name(name), set()).add(framework)
+
+        for framework, names in imports.items():
+            for name in names:
+                modules.setdefault(name, set()).add(framework)
+                # Import names double as distribution names (flask_sqlalchemy)
+                packages.setdefault(canonicalize_name(name), set()).add(framework)
+
+        return cls(_freeze(packages), _freeze(modules))
+
+    def frameworks_for_package(self, name: str) -> FrozenSet[str]:
+        """Frameworks indicated by a distribution name."""
+        return self.packages.get(canonicalize_name(name), frozenset())
+
+    def frameworks_for_imports(self, imports: AbstractSet[str]) -> Set[str]:
+        """
+        Frameworks indicated by a set of top-level import names.
+
+        Besides exact matches, ``<name>_<suffix>`` modules count towards
+        ``<name>`` (flask_login -> flask, pytest_asyncio -> pytest).
+        """
+        frameworks: Set[str] = set()
+        lookup = self.imports.get
+        for module in imports:
+            found = lookup(module)
+            if found:
+                frameworks.update(found)
+            prefix, sep, _ = module.partition("_")
+            if sep and prefix:
+                found = lookup(prefix)
+                if found:
+                    frameworks.update(found)
+        return frameworks
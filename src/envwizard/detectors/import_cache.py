@@ -0,0 +1,329 @@
+"""Persistent per-file cache of extracted imports."""
+
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+from typing import AbstractSet, Dict, FrozenSet, Generator, Iterable, List, Optional, Set, Tuple
+
+from envwizard.detectors.imports import EMPTY, is_entry_point, map_source_imports, resolve_jobs
+from envwizard.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the stored format or the extraction rules change
+SCHEMA_VERSION = 3
+
+# Cache misses parsed per batch of workers; an early exit stops reading after
+# the current batch
+SCAN_CHUNK_FILES = 256
+
+
+def content_digest(source: bytes) -> str:
+    """Return a short, stable digest of file content."""
+    return hashlib.blake2b(source, digest_size=16).hexdigest()
+
+
+def _encode(imports: FrozenSet[str]) -> str:
+    return "\n".join(sorted(imports))
+
+
+def _decode(value: str) -> FrozenSet[str]:
+    return frozenset(value.split("\n")) if value else EMPTY
+
+
+class ImportCache:
+    """
+    On-disk cache mapping Python files to the top-level modules they import.
+
+    Files are looked up by (path, size, mtime_ns) first, so an unchanged tree
+    costs one stat call per file. When the stat signature does not match, the
+    content digest is checked before parsing, so touched-but-identical files
+    and vendored copies of the same module are parsed only once. A scan that
+    runs to the end prunes entries for files it did not see, so the database
+    only ever describes the current tree.
+    """
+
+    FILENAME = "imports.sqlite"
+
+    def __init__(self, cache_dir: Path, deep: bool = False) -> None:
+        """
+        Open (or create) the cache.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            deep: Cache whole-file scans instead of header scans; the two
+                modes are stored separately
+        """
+        self.cache_dir = cache_dir
+        self.deep = deep
+        self.namespace = "deep" if deep else "header"
+        self.hits = 0
+        self.content_hits = 0
+        self.misses = 0
+        self._files: Dict[str, Tuple[int, int, str]] = {}
+        self._contents: Dict[str, FrozenSet[str]] = {}
+        self._new_files: List[Tuple[str, str, int, int, str]] = []
+        self._new_contents: Dict[str, FrozenSet[str]] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._open()
+
+    @property
+    def path(self) -> Path:
+        """Location of the cache database."""
+        return self.cache_dir / self.FILENAME
+
+    def _open(self) -> None:
+        """Connect to the database and load this namespace into memory."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Keep the cache out of version control, like .pytest_cache does
+            ignore_file = self.cache_dir / ".gitignore"
+            if not ignore_file.exists():
+                ignore_file.write_text("# Created by envwizard\n*\n")
+
+            self._db = sqlite3.connect(str(self.path), timeout=5)
+            self._ensure_schema()
+            self._load()
+        except (OSError, sqlite3.Error) as e:
+            logger.debug(f"Import cache disabled: {e}")
+            self._close()
+
+    def _ensure_schema(self) -> None:
+        assert self._db is not None
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._db.executescript("""
+                DROP TABLE IF EXISTS files;
+                DROP TABLE IF EXISTS contents;
+                CREATE TABLE files (
+                    namespace TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    digest TEXT NOT NULL,
+                    PRIMARY KEY (namespace, path)
+                );
+                CREATE TABLE contents (
+                    namespace TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    imports TEXT NOT NULL,
+                    PRIMARY KEY (namespace, digest)
+                );
+                """)
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._db.commit()
+
+    def _load(self) -> None:
+        assert self._db is not None
+        rows = self._db.execute(
+            "SELECT path, size, mtime_ns, digest FROM files WHERE namespace = ?",
+            (self.namespace,),
+        )
+        self._files = {path: (size, mtime_ns, digest) for path, size, mtime_ns, digest in rows}
+        rows = self._db.execute(
+            "SELECT digest, imports FROM contents WHERE namespace = ?", (self.namespace,)
+        )
+        self._contents = {digest: _decode(imports) for digest, imports in rows}
+
+    def _close(self) -> None:
+        if self._db is not None:
+            try:
+                self._db.close()
+            except sqlite3.Error:
+                pass
+        self._db = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache database could be opened."""
+        return self._db is not None
+
+    def get(self, path: str, size: int, mtime_ns: int) -> Optional[FrozenSet[str]]:
+        """Look up a file by its stat signature."""
+        cached = self._files.get(path)
+        if cached is None or cached[0] != size or cached[1] != mtime_ns:
+            return None
+        return self._contents.get(cached[2])
+
+    def get_content(self, digest: str) -> Optional[FrozenSet[str]]:
+        """Look up previously parsed content by digest."""
+        return self._contents.get(digest)
+
+    def put(
+        self, path: str, size: int, mtime_ns: int, digest: str, imports: FrozenSet[str]
+    ) -> None:
+        """Record the imports of a file; written out by flush()."""
+        self._files[path] = (size, mtime_ns, digest)
+        self._new_files.append((self.namespace, path, size, mtime_ns, digest))
+        if digest not in self._contents:
+            self._contents[digest] = imports
+            self._new_contents[digest] = imports
+
+    def flush(self) -> None:
+        """Write pending entries to disk."""
+        if self._db is None or not (self._new_files or self._new_contents):
+            return
+        try:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO contents VALUES (?, ?, ?)",
+                    [(self.namespace, d, _encode(i)) for d, i in self._new_contents.items()],
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", self._new_files
+                )
+        except sqlite3.Error as e:
+            logger.debug(f"Failed to write import cache: {e}")
+        self._new_files.clear()
+        self._new_contents.clear()
+
+    def prune(self, keep: AbstractSet[str]) -> None:
+        """
+        Forget files not in ``keep`` and content no remaining file has.
+
+        Args:
+            keep: Paths of the files that still exist
+        """
+        stale = [path for path in self._files if path not in keep]
+        for path in stale:
+            del self._files[path]
+        referenced = {digest for _, _, digest in self._files.values()}
+        orphans = [digest for digest in self._contents if digest not in referenced]
+        for digest in orphans:
+            del self._contents[digest]
+        if self._db is None or not (stale or orphans):
+            return
+        try:
+            with self._db:
+                self._db.executemany(
+                    "DELETE FROM files WHERE namespace = ? AND path = ?",
+                    [(self.namespace, path) for path in stale],
+                )
+                self._db.executemany(
+                    "DELETE FROM contents WHERE namespace = ? AND digest = ?",
+                    [(self.namespace, digest) for digest in orphans],
+                )
+        except sqlite3.Error as e:
+            logger.debug(f"Failed to prune import cache: {e}")
+
+    def scan(
+        self, entries: Iterable[os.DirEntry], jobs: Optional[int] = 1
+    ) -> Generator[FrozenSet[str], None, None]:
+        """
+        Yield the imports of each file, parsing only files not in the cache.
+
+        Cached files are yielded as the walk reaches them; misses are parsed
+        as they are read in a serial scan and in chunks of SCAN_CHUNK_FILES
+        with workers, so the order does not follow ``entries``. Callers may
+        stop iterating once they have what they need, which also stops
+        reading files; whatever was parsed so far is still saved. Only a
+        scan that reaches the end prunes the files it did not see.
+
+        Args:
+            entries: Python files to scan
+            jobs: Workers used to parse cache misses (see map_source_imports)
+
+        Yields:
+            One import set per readable file
+        """
+        chunk_files = 1 if resolve_jobs(jobs) <= 1 else SCAN_CHUNK_FILES
+        pending: List[Tuple[str, int, int, str]] = []
+        # Content of the pending files, read once for both hashing and parsing
+        sources: List[bytes] = []
+        # Files whose content duplicates a file already queued for parsing
+        duplicates: List[Tuple[str, int, int, str]] = []
+        queued: Set[str] = set()
+        seen: Set[str] = set()
+        complete = False
+
+        try:
+            for entry in entries:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                seen.add(entry.path)
+
+                imports = self.get(entry.path, st.st_size, st.st_mtime_ns)
+                if imports is not None:
+                    self.hits += 1
+                    yield imports
+                    continue
+
+                try:
+                    with open(entry.path, "rb") as f:
+                        source = f.read()
+                except OSError:
+                    continue
+
+                digest = content_digest(source)
+                if not self.deep and is_entry_point(entry.path):
+                    # Parsed in full, so not interchangeable with a header scan
+                    digest += ":deep"
+                imports = self.get_content(digest)
+                if imports is not None:
+                    self.content_hits += 1
+                    self.put(entry.path, st.st_size, st.st_mtime_ns, digest, imports)
+                    yield imports
+                    continue
+
+                item = (entry.path, st.st_size, st.st_mtime_ns, digest)
+                if digest in queued:
+                    self.content_hits += 1
+                    duplicates.append(item)
+                    continue
+
+                self.misses += 1
+                queued.add(digest)
+                pending.append(item)
+                sources.append(source)
+                if len(pending) >= chunk_files:
+                    yield from self._parse(pending, sources, duplicates, jobs)
+                    queued.clear()
+
+            yield from self._parse(pending, sources, duplicates, jobs)
+            complete = True
+        finally:
+            self.flush()
+            if complete:
+                self.prune(seen)
+
+    def _parse(
+        self,
+        pending: List[Tuple[str, int, int, str]],
+        sources: List[bytes],
+        duplicates: List[Tuple[str, int, int, str]],
+        jobs: Optional[int],
+    ) -> Generator[FrozenSet[str], None, None]:
+        """Parse a chunk of misses, then record its duplicates; empties the lists."""
+        parsed = map_source_imports(
+            [(item[0], source) for item, source in zip(pending, sources)],
+            jobs=jobs,
+            deep=self.deep,
+        )
+        chunk = list(pending)
+        pending.clear()
+        sources.clear()
+        try:
+            for (path, size, mtime_ns, digest), imports in zip(chunk, parsed):
+                self.put(path, size, mtime_ns, digest, imports)
+                yield imports
+        finally:
+            parsed.close()
+
+        chunk_duplicates = list(duplicates)
+        duplicates.clear()
+        for path, size, mtime_ns, digest in chunk_duplicates:
+            imports = self._contents[digest]
+            self.put(path, size, mtime_ns, digest, imports)
+            yield imports
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters for this session."""
+        return {
+            "hits": self.hits,
+            "content_hits": self.content_hits,
+            "misses": self.misses,
+            "entries": len(self._files),
+        }
@@ -0,0 +1,371 @@
+"""Import extraction from Python source files."""
+
+import ast
+import io
+import os
+import sys
+import tokenize
+from functools import partial
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    FrozenSet,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from envwizard.logger import get_logger
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+logger = get_logger(__name__)
+
+# Below this many files the cost of starting workers outweighs the parsing saved
+PARALLEL_MIN_FILES = 64
+
+EMPTY: FrozenSet[str] = frozenset()
+
+# Entry points import their framework inside main() (Django's stock manage.py
+# does), so header mode parses them in full
+ENTRY_POINT_FILES = frozenset({"manage.py", "wsgi.py", "asgi.py", "__main__.py"})
+
+_Item = TypeVar("_Item")
+
+
+def extract_imports_from_ast(tree: ast.AST) -> FrozenSet[str]:
+    """
+    Extract all top-level imported module names from an AST.
+
+    Args:
+        tree: The AST to extract imports from
+
+    Returns:
+        Set of imported top-level module names
+    """
+    imports = set()
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            # Handle: import module
+            for alias in node.names:
+                # Get the top-level module name
+                imports.add(alias.name.split(".")[0])
+
+        elif isinstance(node, ast.ImportFrom):
+            # Handle: from module import ...
+            if node.module:
+                # Get the top-level module name
+                imports.add(node.module.split(".")[0])
+
+    return frozenset(imports)
+
+
+# Compound statements that may hold imports in a module header, e.g.
+# ``try: import ujson as json`` or ``if TYPE_CHECKING:``. The header scan
+# cannot see inside them and hands the file to the full parser instead.
+_UNDECIDABLE_STATEMENTS = frozenset({"if", "try", "with", "for", "while", "match"})
+
+_SKIPPED_TOKENS = frozenset(
+    {tokenize.ENCODING, tokenize.COMMENT, tokenize.NL, tokenize.INDENT, tokenize.DEDENT}
+)
+
+
+def _statement_imports(statement: List[tokenize.TokenInfo]) -> Optional[Set[str]]:
+    """
+    Get the modules imported by one top-level statement of a module header.
+
+    Returns None if the statement is not an import (or a bare string such as
+    the module docstring), which ends the header.
+    """
+    first = statement[0]
+
+    if all(tok.type == tokenize.STRING for tok in statement):
+        return set()
+
+    if first.type != tokenize.NAME:
+        return None
+
+    if first.string == "import":
+        # import a.b as c, d
+        names = set()
+        expect_name = True
+        for tok in statement[1:]:
+            if expect_name and tok.type == tokenize.NAME:
+                names.add(tok.string)
+                expect_name = False
+            elif tok.type == tokenize.OP and tok.string == ",":
+                expect_name = True
+        return names
+
+    if first.string == "from":
+        # from ..pkg.mod import x; relative imports keep the name after the dots
+        for tok in statement[1:]:
+            if tok.type == tokenize.OP and tok.string in (".", "..."):
+                continue
+            if tok.type == tokenize.NAME and tok.string != "import":
+                return {tok.string}
+            break
+        return set()
+
+    return None
+
+
+def extract_header_imports(source: bytes) -> Optional[FrozenSet[str]]:
+    """
+    Extract imports from the module header without building an AST.
+
+    The file is tokenized up to the first top-level statement that is not an
+    import or a string, so only the header of large modules is ever looked at.
+
+    Args:
+        source: Raw file content
+
+    Returns:
+        Set of imported top-level module names, or None when the header holds
+        a compound statement or cannot be tokenized and a full parse is needed
+    """
+    imports: Set[str] = set()
+    statement: List[tokenize.TokenInfo] = []
+
+    try:
+        for tok in tokenize.tokenize(io.BytesIO(source).readline):
+            if tok.type in _SKIPPED_TOKENS:
+                continue
+
+            if tok.type == tokenize.ERRORTOKEN:
+                return None
+
+            end_of_statement = tok.type in (tokenize.NEWLINE, tokenize.ENDMARKER) or (
+                tok.type == tokenize.OP and tok.string == ";"
+            )
+            if not end_of_statement:
+                if not statement and tok.type != tokenize.STRING:
+                    if tok.type == tokenize.NAME and tok.string in _UNDECIDABLE_STATEMENTS:
+                        return None
+                    if tok.type != tokenize.NAME or tok.string not in ("import", "from"):
+                        # First non-import statement: the header is over, and
+                        # there is no need to tokenize the rest of it
+                        break
+                statement.append(tok)
+                continue
+
+            if statement:
+                names = _statement_imports(statement)
+                if names is None:
+                    # First non-import statement: the header is over
+                    break
+                imports.update(names)
+                statement = []
+
+            if tok.type == tokenize.ENDMARKER:
+                break
+    except (tokenize.TokenError, SyntaxError, UnicodeDecodeError):
+        return None
+
+    return frozenset(imports)
+
+
+def is_entry_point(path: str) -> bool:
+    """Check whether a file is an entry point that is always parsed in full."""
+    return os.path.basename(path) in ENTRY_POINT_FILES
+
+
+def extract_imports(
+    source: bytes, filename: str = "<unknown>", deep: bool = False
+) -> FrozenSet[str]:
+    """
+    Return the top-level modules a piece of Python source imports.
+
+    Files without the ``import`` keyword are skipped outright. Unless ``deep``
+    is set, only the module header is tokenized and the full parser is used
+    only when the header scan cannot decide; deep mode always parses the
+    whole file and also finds imports inside functions and classes. Entry
+    points (ENTRY_POINT_FILES) are always scanned as in deep mode.
+    Undecodable, syntactically invalid or unparsably nested source yields
+    an empty set.
+
+    Args:
+        source: Raw file content
+        filename: Filename used in parser error messages
+        deep: Parse the whole file instead of just the header
+
+    Returns:
+        Set of imported top-level module names
+    """
+    # Every import statement contains the keyword, including "from x import y"
+    if b"import" not in source:
+        return EMPTY
+
+    if not deep and not is_entry_point(filename):
+        header = extract_header_imports(source)
+        if header is not None:
+            return header
+
+    try:
+        return extract_imports_from_ast(ast.parse(source, filename=filename))
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        # File might be incomplete, binary, non-Python or too deeply nested
+        # (e.g. generated code) for the parser
+        return EMPTY
+
+
+def scan_file_imports(path: str, deep: bool = False) -> FrozenSet[str]:
+    """
+    Read a Python file and return the top-level modules it imports.
+
+    Unreadable, undecodable or syntactically invalid files yield an empty set.
+    This is a module-level function so it can be shipped to worker processes.
+
+    Args:
+        path: Path to the Python file
+        deep: Parse the whole file instead of just the header
+
+    Returns:
+        Set of imported top-level module names
+    """
+    try:
+        source = Path(path).read_bytes()
+    except OSError:
+        return EMPTY
+    return extract_imports(source, path, deep=deep)
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """Turn a user-supplied job count into a worker count (0 or None means one per CPU)."""
+    if not jobs or jobs < 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def _gil_disabled() -> bool:
+    """Check whether this is a free-threaded interpreter running without the GIL."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _make_executor(workers: int) -> "Executor":
+    """Create a thread pool on free-threaded builds and a process pool otherwise."""
+    # Imported here: multiprocessing is slow to import and most scans are serial
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    if _gil_disabled():
+        return ThreadPoolExecutor(max_workers=workers)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def scan_source_imports(item: Tuple[str, bytes], deep: bool = False) -> FrozenSet[str]:
+    """
+    Return the top-level modules imported by source that was already read.
+
+    Like scan_file_imports, a module-level function so it can be shipped to
+    worker processes.
+
+    Args:
+        item: Tuple of (path, file content); the path is used in parser errors
+        deep: Parse the whole file instead of just the header
+
+    Returns:
+        Set of imported top-level module names
+    """
+    path, source = item
+    return extract_imports(source, path, deep=deep)
+
+
+def map_file_imports(
+    paths: Iterable[str],
+    jobs: Optional[int] = 1,
+    min_files: Optional[int] = None,
+    deep: bool = False,
+) -> Generator[FrozenSet[str], None, None]:
+    """
+    Scan many files for imports, in parallel when it is worth it.
+
+    Results are yielded in the same order as ``paths`` regardless of the
+    execution mode, so callers see exactly what a serial scan would produce.
+    Files are scanned lazily; closing the iterator early cancels pending work.
+
+    Args:
+        paths: Python files to scan
+        jobs: Number of workers (1 for serial, 0 or None for one per CPU)
+        min_files: Smallest number of files for which workers are started
+            (default: PARALLEL_MIN_FILES)
+        deep: Parse whole files instead of just their headers
+
+    Yields:
+        Import sets, one per path
+    """
+    return _map_scan(partial(scan_file_imports, deep=deep), paths, jobs, min_files)
+
+
+def map_source_imports(
+    items: Iterable[Tuple[str, bytes]],
+    jobs: Optional[int] = 1,
+    min_files: Optional[int] = None,
+    deep: bool = False,
+) -> Generator[FrozenSet[str], None, None]:
+    """
+    Scan the content of many files for imports, like map_file_imports.
+
+    For callers that already read the files, e.g. to hash them, so that
+    each file is read only once.
+
+    Args:
+        items: Tuples of (path, file content)
+        jobs: Number of workers (1 for serial, 0 or None for one per CPU)
+        min_files: Smallest number of files for which workers are started
+            (default: PARALLEL_MIN_FILES)
+        deep: Parse whole files instead of just their headers
+
+    Yields:
+        Import sets, one per item
+    """
+    return _map_scan(partial(scan_source_imports, deep=deep), items, jobs, min_files)
+
+
+def _map_scan(
+    scan: Callable[[_Item], FrozenSet[str]],
+    items: Iterable[_Item],
+    jobs: Optional[int],
+    min_files: Optional[int],
+) -> Generator[FrozenSet[str], None, None]:
+    """Apply a module-level scan function to items, in order, in parallel when worth it."""
+    if min_files is None:
+        min_files = PARALLEL_MIN_FILES
+
+    if resolve_jobs(jobs) <= 1:
+        # Consume ``items`` lazily so an early exit also stops the directory walk
+        for item in items:
+            yield scan(item)
+        return
+
+    item_list = list(items)
+    workers = min(resolve_jobs(jobs), len(item_list))
+    if workers <= 1 or len(item_list) < min_files:
+        for item in item_list:
+            yield scan(item)
+        return
+
+    # Modest chunks keep workers busy while letting an early exit cancel most work
+    chunksize = max(1, min(32, len(item_list) // (workers * 4)))
+    done = 0
+    try:
+        executor = _make_executor(workers)
+        try:
+            for imports in executor.map(scan, item_list, chunksize=chunksize):
+                yield imports
+                done += 1
+        finally:
+            # Also runs when the caller stops iterating early
+            executor.shutdown(wait=True, cancel_futures=True)
+    except (OSError, NotImplementedError, RuntimeError) as e:
+        # Some sandboxes forbid spawning processes; finish with a serial scan
+        logger.debug(f"Parallel import scan unavailable, scanning serially: {e}")
+        for item in item_list[done:]:
+            yield scan(item)
@@ -0,0 +1,171 @@
+"""Shared filesystem snapshot of a project."""
+
+import fnmatch
+import os
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Set, Tuple
+
+from envwizard.detectors.walker import DEFAULT_MAX_DEPTH, walk_project
+
+
+class ProjectIndex:
+    """
+    Snapshot of a project tree, built from a single directory walk.
+
+    Detectors and generators query the index instead of calling exists(),
+    iterdir() and glob() themselves, so one analysis costs one scandir per
+    directory. Entries keep their os.DirEntry, whose stat result is cached
+    after the first call. The snapshot is taken on first use; call refresh()
+    after changing the tree.
+    """
+
+    def __init__(self, project_path: Path, max_depth: int = DEFAULT_MAX_DEPTH) -> None:
+        """
+        Initialize the index (the tree is walked lazily).
+
+        Args:
+            project_path: Project root directory
+            max_depth: How many directory levels below the root to index
+        """
+        self.project_path = project_path
+        self.max_depth = max_depth
+        self._entries: Optional[Dict[str, Tuple[os.DirEntry, int]]] = None
+        self._order: List[str] = []
+
+    def _ensure(self) -> Dict[str, Tuple[os.DirEntry, int]]:
+        if self._entries is None:
+            entries: Dict[str, Tuple[os.DirEntry, int]] = {}
+            order: List[str] = []
+            root = str(self.project_path)
+            for entry, depth in walk_project(self.project_path, max_depth=self.max_depth):
+                rel = os.path.relpath(entry.path, root).replace(os.sep, "/")
+                entries[rel] = (entry, depth)
+                order.append(rel)
+            self._entries = entries
+            self._order = order
+        return self._entries
+
+    def refresh(self) -> None:
+        """Forget the snapshot; the next query walks the tree again."""
+        self._entries = None
+        self._order = []
+
+    def signature(self) -> Tuple[int, FrozenSet[Tuple[str, int, int]]]:
+        """
+        Fingerprint the live tree, to notice changes made after a snapshot.
+
+        Always stats the disk, never the snapshot. Covers entries added or
+        removed at the top level and edits to top-level files, which is where
+        every dependency manifest lives; deeper edits are not noticed.
+
+        Returns:
+            Root mtime and (name, size, mtime_ns) of each top-level file
+        """
+        try:
+            root_mtime = os.stat(self.project_path).st_mtime_ns
+            files = set()
+            with os.scandir(self.project_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file():
+                            st = entry.stat()
+                            files.add((entry.name, st.st_size, st.st_mtime_ns))
+                    except OSError:
+                        continue
+        except OSError:
+            return (0, frozenset())
+        return (root_mtime, frozenset(files))
+
+    def entries_signature(self) -> List[Tuple[str, int, int]]:
+        """
+        Describe every indexed entry, to fingerprint the snapshot.
+
+        Returns:
+            (relative path, size, mtime_ns) in walk order; directories report
+            zero size and mtime, since their mtime also moves when pruned
+            children such as __pycache__ change
+        """
+        entries = self._ensure()
+        signature = []
+        for rel in self._order:
+            entry = entries[rel][0]
+            try:
+                if entry.is_dir():
+                    signature.append((rel, 0, 0))
+                else:
+                    st = entry.stat()
+                    signature.append((rel, st.st_size, st.st_mtime_ns))
+            except OSError:
+                continue
+        return signature
+
+    def get(self, rel_path: str) -> Optional[os.DirEntry]:
+        """Get the directory entry for a path relative to the project root."""
+        found = self._ensure().get(rel_path.strip("/"))
+        return found[0] if found else None
+
+    def exists(self, rel_path: str) -> bool:
+        """Check whether a file or directory exists in the snapshot."""
+        return self.get(rel_path) is not None
+
+    def is_file(self, rel_path: str) -> bool:
+        """Check whether a regular file exists in the snapshot."""
+        entry = self.get(rel_path)
+        try:
+            return entry is not None and entry.is_file()
+        except OSError:
+            return False
+
+    def is_dir(self, rel_path: str) -> bool:
+        """Check whether a directory exists in the snapshot."""
+        entry = self.get(rel_path)
+        try:
+            return entry is not None and entry.is_dir()
+        except OSError:
+            return False
+
+    def stat(self, rel_path: str) -> Optional[os.stat_result]:
+        """Get the (cached) stat result of an entry."""
+        entry = self.get(rel_path)
+        if entry is None:
+            return None
+        try:
+            return entry.stat()
+        except OSError:
+            return None
+
+    def path(self, rel_path: str) -> Path:
+        """Absolute path of an entry relative to the project root."""
+        return self.project_path / rel_path
+
+    def files(
+        self, patterns: Optional[Sequence[str]] = None, max_depth: Optional[int] = None
+    ) -> Iterator[os.DirEntry]:
+        """
+        Iterate over indexed regular files in walk order.
+
+        Args:
+            patterns: fnmatch-style filename patterns to keep (all files if None)
+            max_depth: Only files at most this many directories below the root
+
+        Yields:
+            DirEntry objects for matching files
+        """
+        entries = self._ensure()
+        for rel in self._order:
+            entry, depth = entries[rel]
+            if max_depth is not None and depth > max_depth:
+                continue
+            if patterns is not None and not any(
+                fnmatch.fnmatchcase(entry.name, p) for p in patterns
+            ):
+                continue
+            try:
+                if entry.is_file():
+                    yield entry
+            except OSError:
+                continue
+
+    def names(self, max_depth: int = 0) -> Set[str]:
+        """Names of all files and directories at most ``max_depth`` levels down."""
+        return {entry.name for entry, depth in self._ensure().values() if depth <= max_depth}
@@ -0,0 +1,270 @@
+"""Exact install sets from lockfiles and fully pinned requirements files."""
+
+import json
+import re
+import shlex
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from envwizard.detectors.framework_index import canonicalize_name
+from envwizard.detectors.manifest import _load_toml
+from envwizard.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Lockfile name -> the manifest it locks
+LOCKFILES = {"poetry.lock": "pyproject.toml", "Pipfile.lock": "Pipfile"}
+
+# Signs that a requirements file was compiled from a full resolution
+# (pip-compile, uv pip compile) rather than written by hand
+_COMPILED_RE = re.compile(
+    r"^\s*#\s+(?:via\b|This file is autogenerated by pip-compile|uv pip compile)", re.MULTILINE
+)
+
+_PINNED_RE = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)(\[[^\]]*\])?\s*===?\s*([^\s;,*]+)\s*$")
+
+_HASH_OPTION_RE = re.compile(r"^--hash[=\s]\s*(\S+)$")
+
+# Options of a pinned requirements file that are passed on to pip
+_INDEX_OPTIONS = {
+    "-i",
+    "--index-url",
+    "--extra-index-url",
+    "--no-index",
+    "-f",
+    "--find-links",
+    "--trusted-host",
+    "--pre",
+    "--prefer-binary",
+    "--only-binary",
+    "--no-binary",
+}
+
+
+class LockedRequirement(NamedTuple):
+    """One distribution of an exact install set."""
+
+    name: str
+    version: str
+    # PEP 508 environment marker, if the distribution is platform specific
+    markers: Optional[str] = None
+    # Allowed archive hashes as "algorithm:digest"
+    hashes: Tuple[str, ...] = ()
+    extras: str = ""
+    # Normalized names of the distributions it requires, where known
+    dependencies: Tuple[str, ...] = ()
+
+    @property
+    def key(self) -> str:
+        """PEP 503 normalized name."""
+        return canonicalize_name(self.name)
+
+    @property
+    def pin(self) -> str:
+        """The requirement without its marker, e.g. "requests==2.31.0"."""
+        return f"{self.name}{self.extras}=={self.version}"
+
+    @property
+    def spec(self) -> str:
+        """The requirement as pip takes it."""
+        return f"{self.pin}; {self.markers}" if self.markers else self.pin
+
+
+class LockedSet(NamedTuple):
+    """The complete set of distributions a lockfile installs."""
+
+    requirements: Tuple[LockedRequirement, ...]
+    # pip index options (e.g. ("--index-url", "..."))
+    options: Tuple[str, ...] = ()
+
+    @property
+    def hashed(self) -> bool:
+        """Whether every requirement has hashes (pip's hash-checking mode)."""
+        return bool(self.requirements) and all(r.hashes for r in self.requirements)
+
+
+def _poetry_edge_markers(packages: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    """
+    Markers under which packages of an older poetry.lock are needed.
+
+    Before lock format 2.1 Poetry only put markers on dependency edges. A
+    package is needed unconditionally if some edge to it has no marker or if
+    nothing depends on it (a direct dependency); otherwise under any of the
+    edge markers. The markers of the dependents themselves are not followed.
+    """
+    edges: Dict[str, List[Optional[str]]] = {}
+    for package in packages:
+        for name, constraint in (package.get("dependencies") or {}).items():
+            for item in constraint if isinstance(constraint, list) else [constraint]:
+                if isinstance(item, dict) and item.get("optional"):
+                    continue
+                marker = item.get("markers") if isinstance(item, dict) else None
+                edges.setdefault(canonicalize_name(name), []).append(marker)
+
+    result: Dict[str, Optional[str]] = {}
+    for key, markers in edges.items():
+        if all(markers):
+            unique = list(dict.fromkeys(markers))
+            result[key] = unique[0] if len(unique) == 1 else " or ".join(f"({m})" for m in unique)
+    return result
+
+
+def parse_poetry_lock(content: bytes) -> Optional[LockedSet]:
+    """
+    Parse a poetry.lock into the set `poetry install` would install.
+
+    All non-optional packages are included, dev groups too, as Poetry
+    installs them by default.
+
+    Returns:
+        The locked set, or None if the lock cannot be installed by name and
+        version (git, path or URL sources) or is not valid
+    """
+    data = _load_toml(content)
+    if data is None or not isinstance(data.get("package"), list):
+        return None
+    packages: List[Dict[str, Any]] = data["package"]
+    legacy_files = (data.get("metadata") or {}).get("files") or {}
+    edge_markers = _poetry_edge_markers(packages)
+
+    requirements = []
+    indexes: List[str] = []
+    for package in packages:
+        if package.get("optional"):
+            continue
+        name, version = package.get("name"), package.get("version")
+        source = package.get("source") or {}
+        if not name or not version or source.get("type") not in (None, "legacy"):
+            return None
+        if source.get("url") and source["url"] not in indexes:
+            indexes.append(source["url"])
+
+        files = package.get("files") or legacy_files.get(name) or []
+        hashes = tuple(f["hash"] for f in files if isinstance(f, dict) and f.get("hash"))
+        markers = package.get("markers")
+        if not isinstance(markers, str):
+            # Per-group markers (a table) are not modelled; edges are used instead
+            markers = edge_markers.get(canonicalize_name(name))
+        dependencies = tuple(
+            canonicalize_name(dependency) for dependency in package.get("dependencies") or {}
+        )
+        requirements.append(
+            LockedRequirement(name, str(version), markers, hashes, dependencies=dependencies)
+        )
+
+    options: List[str] = []
+    for url in indexes:
+        options += ["--extra-index-url", url]
+    return LockedSet(tuple(requirements), tuple(options))
+
+
+def parse_pipfile_lock(content: bytes) -> Optional[LockedSet]:
+    """
+    Parse a Pipfile.lock into the set `pipenv sync` would install (its default section).
+
+    Returns:
+        The locked set, or None if an entry is not pinned to a version (VCS,
+        path or editable entries) or the lock is not valid
+    """
+    try:
+        data = json.loads(content.decode("utf-8"))
+        default = data.get("default") or {}
+        sources = (data.get("_meta") or {}).get("sources") or []
+    except (ValueError, AttributeError, UnicodeDecodeError) as e:
+        logger.debug(f"Invalid Pipfile.lock: {e}")
+        return None
+
+    requirements = []
+    for name, entry in default.items():
+        version = entry.get("version") if isinstance(entry, dict) else None
+        if not isinstance(version, str) or not version.startswith("=="):
+            return None
+        extras = entry.get("extras") or []
+        requirements.append(
+            LockedRequirement(
+                name,
+                version[2:],
+                entry.get("markers") or None,
+                tuple(entry.get("hashes") or ()),
+                f"[{','.join(extras)}]" if extras else "",
+            )
+        )
+
+    options: List[str] = []
+    for i, source in enumerate(s for s in sources if isinstance(s, dict) and s.get("url")):
+        options += ["--index-url" if i == 0 else "--extra-index-url", source["url"]]
+    return LockedSet(tuple(requirements), tuple(options))
+
+
+def parse_pinned_requirements(text: str) -> Optional[LockedSet]:
+    """
+    Parse a requirements file that pins a complete install set.
+
+    Every requirement must be pinned with ``==`` and either carry
+    ``--hash`` options (pip's hash-checking mode only accepts complete,
+    pinned sets) or come from pip-compile/uv (recognized by their
+    comments). Includes, constraints and editables are not allowed.
+
+    Returns:
+        The locked set, or None if the file is not such a lock
+    """
+    requirements = []
+    options: List[str] = []
+    for line in re.sub(r"\\\r?\n", " ", text).splitlines():
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith("#"):
+            continue
+
+        if line.startswith("-"):
+            try:
+                tokens = shlex.split(line)
+            except ValueError:
+                return None
+            if tokens[0].split("=", 1)[0] not in _INDEX_OPTIONS:
+                return None
+            options.extend(tokens)
+            continue
+
+        # "name==version ; marker --hash=sha256:... --hash=..."
+        spec, *per_requirement = re.split(r"\s+(?=--)", line)
+        hashes = []
+        for option in per_requirement:
+            match = _HASH_OPTION_RE.match(option)
+            if not match:
+                return None
+            hashes.append(match.group(1))
+        spec, _, markers = spec.partition(";")
+        match = _PINNED_RE.match(spec.strip())
+        if not match:
+            return None
+        name, extras, version = match.groups()
+        requirements.append(
+            LockedRequirement(name, version, markers.strip() or None, tuple(hashes), extras or "")
+        )
+
+    locked = LockedSet(tuple(requirements), tuple(options))
+    if not requirements or not (locked.hashed or _COMPILED_RE.search(text)):
+        return None
+    return locked
+
+
+def read_lockfile(path: Path) -> Optional[LockedSet]:
+    """
+    Read the exact install set of a lockfile or pinned requirements file.
+
+    Args:
+        path: poetry.lock, Pipfile.lock or a requirements file
+
+    Returns:
+        The locked set, or None if the file does not lock a complete set
+    """
+    try:
+        if path.name == "poetry.lock":
+            return parse_poetry_lock(path.read_bytes())
+        if path.name == "Pipfile.lock":
+            return parse_pipfile_lock(path.read_bytes())
+        if path.suffix == ".txt":
+            return parse_pinned_requirements(path.read_text(encoding="utf-8", errors="replace"))
+    except OSError as e:
+        logger.debug(f"Failed to read {path}: {e}")
+    return None
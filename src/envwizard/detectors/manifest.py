@@ -0,0 +1,401 @@
+"""Parsed dependency manifests of a project."""
+
+import os
+import re
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from envwizard.detectors.framework_index import canonicalize_name
+from envwizard.detectors.index import ProjectIndex
+from envwizard.logger import get_logger
+from envwizard.versions import poetry_clauses, poetry_constraint
+
+logger = get_logger(__name__)
+
+# Leading distribution name of a requirement specifier ("flask[async]>=2" -> "flask")
+REQUIREMENT_NAME_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+# Manifest files looked for in the project root
+MANIFEST_PATTERNS = ("requirements*.txt", "pyproject.toml", "Pipfile", "setup.cfg")
+
+# "requirements-dev.txt" -> "dev"
+_REQUIREMENTS_GROUP_RE = re.compile(r"^requirements[-_.](.+)\.txt$")
+
+
+class Requirement(NamedTuple):
+    """One dependency declared in a manifest file."""
+
+    # Distribution name as written
+    name: str
+    # Requirement string, e.g. "django[argon2]>=4.2"
+    spec: str
+    # Manifest file, relative to the project root
+    source: str
+    # None for runtime dependencies, otherwise the extra or group name
+    group: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """PEP 503 normalized name."""
+        return canonicalize_name(self.name)
+
+
+class ParsedManifest(NamedTuple):
+    """Everything read from one manifest file."""
+
+    requirements: Tuple[Requirement, ...]
+    # Declared extras and groups, including empty ones
+    groups: FrozenSet[str]
+    # Raw TOML document (pyproject.toml and Pipfile only)
+    data: Mapping[str, Any]
+
+
+EMPTY_MANIFEST = ParsedManifest((), frozenset(), MappingProxyType({}))
+
+
+def parse_requirement(spec: str, source: str, group: Optional[str] = None) -> Optional[Requirement]:
+    """
+    Build a Requirement from a PEP 508 string.
+
+    Returns None for strings that do not start with a distribution name,
+    such as pip options or bare URLs.
+    """
+    spec = spec.strip()
+    if "://" in spec and "@" not in spec:
+        # git+https://... without a "name @" prefix
+        return None
+    match = REQUIREMENT_NAME_RE.match(spec)
+    if not match:
+        return None
+    return Requirement(match.group(0), spec, source, group)
+
+
+def parse_requirements_text(
+    text: str, source: str, group: Optional[str] = None
+) -> List[Requirement]:
+    """
+    Parse requirements.txt-style content.
+
+    Comments, blank lines and pip options (-e, -r, --index-url, ...) are skipped.
+    """
+    requirements = []
+    for line in text.splitlines():
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith(("#", "-")):
+            continue
+        requirement = parse_requirement(line, source, group)
+        if requirement:
+            requirements.append(requirement)
+    return requirements
+
+
+def _load_toml(content: bytes) -> Optional[Dict[str, Any]]:
+    """Parse TOML, or return None if no parser is installed or the file is invalid."""
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib  # type: ignore
+        except ImportError:
+            return None
+
+    try:
+        data = tomllib.loads(content.decode("utf-8"))
+    except Exception as e:
+        logger.debug(f"Failed to parse TOML: {e}")
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _pipfile_spec(name: str, version: Any) -> str:
+    """Turn a Pipfile dependency entry into a requirement string."""
+    if isinstance(version, str) and version.strip() not in ("", "*"):
+        return f"{name}{version.strip()}"
+    return name
+
+
+def poetry_requirement(name: str, value: Any) -> Optional[str]:
+    """
+    Turn a [tool.poetry] dependency entry into a PEP 508 requirement string.
+
+    Args:
+        name: Dependency name
+        value: A constraint string, or a table with version, extras, markers
+            and python keys
+
+    Returns:
+        The requirement, or None for entries pip cannot install by name
+        (git, path and URL sources, multiple-constraint lists, "||" unions)
+    """
+    markers = []
+    extras: List[str] = []
+    if isinstance(value, dict):
+        if any(key in value for key in ("git", "path", "url", "file")):
+            return None
+        extras = [str(extra) for extra in value.get("extras") or ()]
+        if value.get("markers"):
+            markers.append(f"({value['markers']})")
+        if value.get("python"):
+            python = poetry_clauses(str(value["python"]))
+            if python is None:
+                return None
+            markers.extend(f'python_version {op} "{version}"' for op, version in python)
+        value = value.get("version", "*")
+    if not isinstance(value, str):
+        return None
+    specifier = poetry_constraint(value)
+    if specifier is None:
+        return None
+    requirement = name + (f"[{','.join(extras)}]" if extras else "") + specifier
+    return f"{requirement}; {' and '.join(markers)}" if markers else requirement
+
+
+def parse_pyproject(data: Mapping[str, Any], source: str = "pyproject.toml") -> ParsedManifest:
+    """
+    Collect PEP 621 and Poetry dependencies from a pyproject.toml document.
+
+    Args:
+        data: Parsed TOML document
+        source: Name recorded on each requirement
+
+    Returns:
+        Parsed manifest
+    """
+    requirements: List[Requirement] = []
+    groups = set()
+
+    project = data.get("project") or {}
+    for spec in project.get("dependencies") or []:
+        requirement = parse_requirement(str(spec), source)
+        if requirement:
+            requirements.append(requirement)
+    for extra, specs in (project.get("optional-dependencies") or {}).items():
+        groups.add(extra)
+        for spec in specs or []:
+            requirement = parse_requirement(str(spec), source, extra)
+            if requirement:
+                requirements.append(requirement)
+
+    poetry = (data.get("tool") or {}).get("poetry") or {}
+    tables: List[Tuple[Optional[str], Mapping[str, Any]]] = [
+        (None, poetry.get("dependencies") or {})
+    ]
+    if "dev-dependencies" in poetry:
+        groups.add("dev")
+        tables.append(("dev", poetry["dev-dependencies"] or {}))
+    for name, group in (poetry.get("group") or {}).items():
+        groups.add(name)
+        tables.append((name, (group or {}).get("dependencies") or {}))
+
+    for group_name, table in tables:
+        for name, version in table.items():
+            if name.lower() == "python":
+                continue
+            requirement = parse_requirement(
+                poetry_requirement(name, version) or name, source, group_name
+            )
+            if requirement:
+                requirements.append(requirement)
+
+    return ParsedManifest(tuple(requirements), frozenset(groups), MappingProxyType(dict(data)))
+
+
+def _parse_pipfile_lines(text: str, source: str) -> ParsedManifest:
+    """Line-based Pipfile reader used when no TOML parser is available."""
+    requirements = []
+    groups = set()
+    section = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            section = line
+            if section == "[dev-packages]":
+                groups.add("dev")
+            continue
+        if section in ("[packages]", "[dev-packages]") and "=" in line:
+            name = line.split("=")[0].strip().strip('"').strip("'")
+            group = "dev" if section == "[dev-packages]" else None
+            requirement = parse_requirement(name, source, group)
+            if requirement:
+                requirements.append(requirement)
+    return ParsedManifest(tuple(requirements), frozenset(groups), MappingProxyType({}))
+
+
+def parse_pipfile(content: bytes, source: str = "Pipfile") -> ParsedManifest:
+    """
+    Collect [packages] and [dev-packages] from a Pipfile.
+
+    Args:
+        content: Raw file content
+        source: Name recorded on each requirement
+
+    Returns:
+        Parsed manifest
+    """
+    data = _load_toml(content)
+    if data is None:
+        return _parse_pipfile_lines(content.decode("utf-8", errors="replace"), source)
+
+    requirements = []
+    groups = set()
+    for section, group in (("packages", None), ("dev-packages", "dev")):
+        if section not in data:
+            continue
+        if group:
+            groups.add(group)
+        for name, version in (data[section] or {}).items():
+            requirement = parse_requirement(_pipfile_spec(name, version), source, group)
+            if requirement:
+                requirements.append(requirement)
+    return ParsedManifest(tuple(requirements), frozenset(groups), MappingProxyType(data))
+
+
+def parse_setup_cfg(text: str, source: str = "setup.cfg") -> ParsedManifest:
+    """
+    Collect install_requires and extras_require from a setup.cfg.
+
+    Args:
+        text: File content
+        source: Name recorded on each requirement
+
+    Returns:
+        Parsed manifest
+    """
+    import configparser
+
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        parser.read_string(text)
+    except configparser.Error as e:
+        logger.debug(f"Failed to parse {source}: {e}")
+        return EMPTY_MANIFEST
+
+    requirements = parse_requirements_text(
+        parser.get("options", "install_requires", fallback=""), source
+    )
+    groups = set()
+    if parser.has_section("options.extras_require"):
+        for extra, value in parser.items("options.extras_require"):
+            groups.add(extra)
+            requirements.extend(parse_requirements_text(value, source, extra))
+
+    data: Dict[str, Any] = {}
+    python_requires = parser.get("options", "python_requires", fallback=None)
+    if python_requires:
+        data["python_requires"] = python_requires.strip()
+    return ParsedManifest(tuple(requirements), frozenset(groups), MappingProxyType(data))
+
+
+def parse_manifest(name: str, content: bytes, source: str) -> ParsedManifest:
+    """
+    Parse a manifest file, choosing the format from its name.
+
+    Args:
+        name: File name (pyproject.toml, Pipfile, setup.cfg or a requirements file)
+        content: Raw file content
+        source: Name recorded on each requirement
+
+    Returns:
+        Parsed manifest
+    """
+    if name == "pyproject.toml":
+        data = _load_toml(content)
+        return parse_pyproject(data, source) if data is not None else EMPTY_MANIFEST
+    if name == "Pipfile":
+        return parse_pipfile(content, source)
+
+    text = content.decode("utf-8", errors="replace")
+    if name == "setup.cfg":
+        return parse_setup_cfg(text, source)
+
+    match = _REQUIREMENTS_GROUP_RE.match(name)
+    group = match.group(1) if match else None
+    requirements = parse_requirements_text(text, source, group)
+    groups = frozenset([group]) if group else frozenset()
+    return ParsedManifest(tuple(requirements), groups, MappingProxyType({}))
+
+
+class ProjectManifest:
+    """
+    Dependency declarations of a project, parsed once and shared.
+
+    Reads requirements*.txt, pyproject.toml (PEP 621 and Poetry), Pipfile
+    and setup.cfg from the project root into Requirement records. Each file
+    is parsed on first use and kept until refresh().
+    """
+
+    def __init__(self, index: ProjectIndex) -> None:
+        """
+        Initialize the manifest layer.
+
+        Args:
+            index: Filesystem snapshot used to find manifest files
+        """
+        self.index = index
+        self._parsed: Dict[str, ParsedManifest] = {}
+
+    def refresh(self) -> None:
+        """Forget parsed files (the index is refreshed separately)."""
+        self._parsed.clear()
+
+    @property
+    def sources(self) -> List[str]:
+        """Manifest files present in the project root."""
+        return [entry.name for entry in self.index.files(MANIFEST_PATTERNS, max_depth=0)]
+
+    def parse(self, source: Union[str, Path]) -> ParsedManifest:
+        """
+        Get the parsed content of one manifest file.
+
+        Args:
+            source: File name relative to the project root, or a path
+
+        Returns:
+            Parsed manifest (empty if the file is missing or unreadable)
+        """
+        if isinstance(source, Path):
+            path = source
+            rel = os.path.relpath(source, self.index.project_path).replace(os.sep, "/")
+            key = str(source) if rel.startswith("..") else rel
+        else:
+            key = source
+            if not self.index.is_file(key):
+                return EMPTY_MANIFEST
+            path = self.index.path(key)
+
+        parsed = self._parsed.get(key)
+        if parsed is None:
+            try:
+                parsed = parse_manifest(path.name, path.read_bytes(), key)
+            except OSError as e:
+                logger.debug(f"Failed to read {path}: {e}")
+                parsed = EMPTY_MANIFEST
+            self._parsed[key] = parsed
+        return parsed
+
+    def requirements(self, source: Optional[str] = None) -> List[Requirement]:
+        """All requirements of one file, or of every manifest file."""
+        sources = [source] if source else self.sources
+        return [req for name in sources for req in self.parse(name).requirements]
+
+    def runtime_requirements(self, source: Optional[str] = None) -> List[Requirement]:
+        """Requirements that are not tied to an extra or a dev group."""
+        return [req for req in self.requirements(source) if req.group is None]
+
+    def groups(self, source: str) -> FrozenSet[str]:
+        """Extras and dependency groups declared by one file."""
+        return self.parse(source).groups
+
+    @property
+    def pyproject(self) -> Mapping[str, Any]:
+        """The pyproject.toml document (empty if missing or invalid)."""
+        return self.parse("pyproject.toml").data
+
+    @property
+    def requires_python(self) -> Optional[str]:
+        """Declared Python requirement from pyproject.toml or setup.cfg."""
+        requires_python = (self.pyproject.get("project") or {}).get("requires-python")
+        if requires_python:
+            return str(requires_python)
+        return self.parse("setup.cfg").data.get("python_requires")
@@ -0,0 +1,147 @@
+"""Single-pass project directory walker."""
+
+import fnmatch
+import os
+from pathlib import Path
+from typing import FrozenSet, Iterator, Optional, Sequence, Set, Tuple
+
+# Default number of directory levels below the project root to descend into
+DEFAULT_MAX_DEPTH = 3
+
+# Directories that never contain first-party project code
+PRUNED_DIRS: FrozenSet[str] = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".tox",
+        ".nox",
+        ".venv",
+        "venv",
+        "env",
+        ".eggs",
+        ".envwizard",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        "__pycache__",
+        "node_modules",
+        "site-packages",
+        "dist-packages",
+        "build",
+        "dist",
+        "htmlcov",
+    }
+)
+
+
+def _is_pruned(entry: os.DirEntry, pruned: FrozenSet[str]) -> bool:
+    """Check whether a directory entry should not be descended into."""
+    name = entry.name
+    if name in pruned or name.endswith(".egg-info"):
+        return True
+    # Virtual environments can have any name; pyvenv.cfg gives them away
+    return os.path.exists(os.path.join(entry.path, "pyvenv.cfg"))
+
+
+def walk_project(
+    root: Path,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    pruned: FrozenSet[str] = PRUNED_DIRS,
+    same_device: bool = True,
+) -> Iterator[Tuple[os.DirEntry, int]]:
+    """
+    Walk a project tree in a single pass using os.scandir.
+
+    Yields every file and directory entry together with its depth, where
+    entries directly inside ``root`` have depth 0. Directories deeper than
+    ``max_depth`` are not entered, pruned directories are skipped entirely,
+    symlink loops are broken by tracking visited (device, inode) pairs and,
+    when ``same_device`` is set, mount points on other devices are skipped.
+
+    Args:
+        root: Directory to walk
+        max_depth: Deepest directory level to descend into
+        pruned: Directory names that are never descended into
+        same_device: Stay on the filesystem that holds ``root``
+
+    Yields:
+        Tuples of (DirEntry, depth), sorted by name within each directory
+    """
+    try:
+        root_stat = os.stat(root)
+    except OSError:
+        return
+
+    visited: Set[Tuple[int, int]] = {(root_stat.st_dev, root_stat.st_ino)}
+    stack = [(str(root), 0)]
+
+    while stack:
+        directory, depth = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+
+            if not is_dir:
+                yield entry, depth
+                continue
+
+            if _is_pruned(entry, pruned):
+                continue
+
+            yield entry, depth
+
+            if depth >= max_depth:
+                continue
+
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if same_device and st.st_dev != root_stat.st_dev:
+                continue
+            key = (st.st_dev, st.st_ino)
+            if key in visited:
+                continue
+            visited.add(key)
+            subdirs.append((entry.path, depth + 1))
+
+        # Reverse so that directories are visited in name order
+        stack.extend(reversed(subdirs))
+
+
+def iter_project_files(
+    root: Path,
+    patterns: Optional[Sequence[str]] = None,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    pruned: FrozenSet[str] = PRUNED_DIRS,
+) -> Iterator[os.DirEntry]:
+    """
+    Iterate over regular files in a project tree.
+
+    Args:
+        root: Directory to walk
+        patterns: fnmatch-style filename patterns to keep (all files if None)
+        max_depth: Deepest directory level to descend into
+        pruned: Directory names that are never descended into
+
+    Yields:
+        DirEntry objects for matching files
+    """
+    for entry, _ in walk_project(root, max_depth=max_depth, pruned=pruned):
+        try:
+            if not entry.is_file():
+                continue
+        except OSError:
+            continue
+        if patterns is None or any(fnmatch.fnmatchcase(entry.name, p) for p in patterns):
+            yield entry
@@ -0,0 +1,448 @@
+"""Content-addressed store of installed site-packages, shared by all projects."""
+
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from envwizard.locations import user_cache_dir
+from envwizard.logger import get_logger
+from envwizard.pip_cache import SharedPip
+from envwizard.state import fingerprint
+from envwizard.venv_metadata import cfg_version, find_site_packages, read_pyvenv_cfg
+from envwizard.venv_templates import TreeCloner
+
+logger = get_logger(__name__)
+
+# Overrides the size limit of the environment cache, e.g. "20G"
+MAX_SIZE_ENV = "ENVWIZARD_ENV_CACHE_MAX_SIZE"
+DEFAULT_MAX_BYTES = 5 * 1024**3
+
+# Bump when the entry format changes
+ENTRY_VERSION = 1
+
+# Stands in for the venv path in stored console scripts
+_VENV_PLACEHOLDER = b"@@ENVWIZARD_VENV@@"
+
+# bin/ files that belong to the venv rather than to an installed package
+_BASE_SCRIPT_RE = re.compile(r"^(activate.*|Activate\.ps1|python[\d.]*(\.exe)?|pip[\d.]*)$", re.I)
+
+# Objects this young may belong to an entry that is still being written
+_GC_GRACE_SECONDS = 600
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)i?b?\s*$", re.IGNORECASE)
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a size such as "500M", "5G" or "1024".
+
+    Raises:
+        ValueError: If the text is not a size
+    """
+    match = _SIZE_RE.match(text)
+    if not match:
+        raise ValueError(f"Invalid size: {text}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " kmgt".index(unit.lower() or " "))
+
+
+def format_size(size: int) -> str:
+    """Format a byte count for display, e.g. "1.5 GB"."""
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class EnvCacheEntry(NamedTuple):
+    """Summary of one cached environment."""
+
+    key: str
+    # Sum of the sizes of the entry's files (shared objects counted in full)
+    size: int
+    files: int
+    requirements: int
+    created: float
+    last_used: float
+
+
+class EnvCache:
+    """
+    Populated site-packages directories keyed by interpreter and dependencies.
+
+    The key combines the Python version, the platform, the pip mode and the
+    normalized dependency set, so installing the same requirements again
+    anywhere on the machine restores the stored result instead of running
+    pip. Files are kept once per content hash under ``objects/`` and
+    restored by reflink or copy; each entry is a JSON manifest
+    under ``entries/`` whose mtime records when it was last used. Unpinned
+    requirements restore whatever versions were resolved when the entry was
+    stored. The store is kept under a size limit by evicting the least
+    recently used entries.
+    """
+
+    DIRNAME = "envs"
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: User cache directory (default: user_cache_dir())
+            max_bytes: Size limit (default: ENVWIZARD_ENV_CACHE_MAX_SIZE or 5 GB)
+        """
+        self.root = (cache_dir or user_cache_dir()) / self.DIRNAME
+        self.objects_dir = self.root / "objects"
+        self.entries_dir = self.root / "entries"
+        if max_bytes is None:
+            try:
+                max_bytes = parse_size(os.environ.get(MAX_SIZE_ENV, ""))
+            except ValueError:
+                max_bytes = DEFAULT_MAX_BYTES
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache works on this platform."""
+        # Windows console scripts are executables with the venv path baked in
+        return sys.platform != "win32"
+
+    def key(self, venv_path: Path, requirements: Sequence[str]) -> Optional[str]:
+        """
+        Cache key of a dependency set installed into a venv.
+
+        Args:
+            venv_path: Target virtual environment
+            requirements: Normalized dependency set (DependencyDetector.get_dependency_set)
+
+        Returns:
+            Key, or None if the venv's Python version is unknown
+        """
+        version = cfg_version(read_pyvenv_cfg(venv_path))
+        if version is None:
+            return None
+        return fingerprint(
+            ENTRY_VERSION,
+            version,
+            sys.platform,
+            platform.machine(),
+            SharedPip.linked_dir(venv_path) is not None,
+            sorted(requirements),
+        )
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _entry_path(self, key: str) -> Path:
+        return self.entries_dir / f"{key}.json"
+
+    def _load_entry(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != ENTRY_VERSION:
+            return None
+        return data
+
+    def _add_object(self, src: str, content: Optional[bytes] = None) -> str:
+        """Put a file (or the given content) into the object store; returns its hash."""
+        if content is None:
+            digest = _file_hash(src)
+        else:
+            digest = hashlib.blake2b(content, digest_size=20).hexdigest()
+        target = self._object_path(digest)
+        if target.exists():
+            return digest
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        if content is None:
+            # Never hardlink: the store must not share inodes with a live venv
+            TreeCloner(["reflink", "copy"]).clone_file(src, tmp)
+        else:
+            with open(tmp, "wb") as f:
+                f.write(content)
+        os.replace(tmp, target)
+        return digest
+
+    def store(self, key: str, venv_path: Path, requirements: Sequence[str]) -> bool:
+        """
+        Store the site-packages and console scripts of a venv.
+
+        Args:
+            key: Key from key()
+            venv_path: Virtual environment whose dependencies were just installed
+            requirements: Dependency set the venv was populated from
+
+        Returns:
+            True if the entry was stored
+        """
+        site_packages = find_site_packages(venv_path, cfg_version(read_pyvenv_cfg(venv_path)))
+        if site_packages is None:
+            return False
+
+        files: List[Tuple[str, str, int]] = []
+        links: List[Tuple[str, str]] = []
+        scripts: List[Tuple[str, str, int]] = []
+        venv_bytes = os.fsencode(str(venv_path))
+        try:
+            stack = [str(site_packages)]
+            while stack:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        rel = os.path.relpath(entry.path, site_packages)
+                        if entry.is_symlink():
+                            links.append((rel, os.readlink(entry.path)))
+                        elif entry.is_dir():
+                            stack.append(entry.path)
+                        else:
+                            st = entry.stat()
+                            digest = self._add_object(entry.path)
+                            files.append((rel, digest, st.st_size))
+
+            bin_dir = venv_path / ("Scripts" if sys.platform == "win32" else "bin")
+            with os.scandir(bin_dir) as it:
+                for entry in it:
+                    if entry.is_symlink() or not entry.is_file():
+                        continue
+                    if _BASE_SCRIPT_RE.match(entry.name):
+                        continue
+                    with open(entry.path, "rb") as f:
+                        content = f.read().replace(venv_bytes, _VENV_PLACEHOLDER)
+                    digest = self._add_object(entry.path, content)
+                    scripts.append((entry.name, digest, entry.stat().st_mode & 0o777))
+        except OSError as e:
+            logger.debug(f"Failed to store environment {key}: {e}")
+            return False
+
+        data = {
+            "version": ENTRY_VERSION,
+            "requirements": list(requirements),
+            "created": time.time(),
+            "size": sum(size for _, _, size in files),
+            "files": files,
+            "links": links,
+            "scripts": scripts,
+        }
+        path = self._entry_path(key)
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Failed to write environment cache entry {key}: {e}")
+            return False
+
+        logger.info(f"Stored environment {key} ({len(files)} files)")
+        self.prune()
+        return True
+
+    def restore(self, key: str, venv_path: Path) -> Optional[str]:
+        """
+        Populate a venv's site-packages from the cache.
+
+        The restored tree is assembled next to site-packages and swapped in,
+        so a failed restore leaves the venv as it was.
+
+        Args:
+            key: Key from key()
+            venv_path: Virtual environment to populate
+
+        Returns:
+            Description of the clone method used, or None on a miss
+        """
+        entry_path = self._entry_path(key)
+        data = self._load_entry(entry_path)
+        if data is None:
+            return None
+        site_packages = find_site_packages(venv_path, cfg_version(read_pyvenv_cfg(venv_path)))
+        if site_packages is None:
+            return None
+        if not all(self._object_path(digest).exists() for _, digest, _ in data["files"]):
+            logger.debug(f"Environment {key} has pruned objects, ignoring it")
+            return None
+
+        # Never hardlink: writes into the venv would change the stored objects
+        cloner = TreeCloner(["reflink", "copy"])
+        staging = site_packages.with_name(f"{site_packages.name}.envwizard-{os.getpid()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            made: Set[str] = set()
+            for rel, digest, _ in data["files"]:
+                target = staging / rel
+                if str(target.parent) not in made:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    made.add(str(target.parent))
+                cloner.clone_file(str(self._object_path(digest)), str(target))
+            for rel, link_target in data["links"]:
+                (staging / rel).parent.mkdir(parents=True, exist_ok=True)
+                os.symlink(link_target, staging / rel)
+            staging.mkdir(exist_ok=True)
+
+            bin_dir = venv_path / ("Scripts" if sys.platform == "win32" else "bin")
+            venv_bytes = os.fsencode(str(venv_path))
+            for name, digest, mode in data["scripts"]:
+                content = self._object_path(digest).read_bytes()
+                script = bin_dir / name
+                if script.exists():
+                    script.unlink()
+                script.write_bytes(content.replace(_VENV_PLACEHOLDER, venv_bytes))
+                script.chmod(mode)
+
+            old = site_packages.with_name(f"{site_packages.name}.envwizard-old-{os.getpid()}")
+            os.rename(site_packages, old)
+            os.rename(staging, site_packages)
+            shutil.rmtree(old, ignore_errors=True)
+        except OSError as e:
+            logger.debug(f"Failed to restore environment {key}: {e}")
+            shutil.rmtree(staging, ignore_errors=True)
+            return None
+
+        # The entry's mtime is its last use, for LRU eviction
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        logger.info(f"Restored environment {key} into {venv_path}")
+        return cloner.describe()
+
+    def _scan(self) -> List[Tuple[Path, Dict[str, Any], float]]:
+        """Entry files with their data and last use, least recently used first."""
+        result: List[Tuple[Path, Dict[str, Any], float]] = []
+        try:
+            paths = list(self.entries_dir.glob("*.json"))
+        except OSError:
+            return result
+        for path in paths:
+            data = self._load_entry(path)
+            try:
+                last_used = path.stat().st_mtime
+            except OSError:
+                continue
+            if data is not None:
+                result.append((path, data, last_used))
+        return sorted(result, key=lambda item: item[2])
+
+    def entries(self) -> List[EnvCacheEntry]:
+        """Cached environments, least recently used first."""
+        return [
+            EnvCacheEntry(
+                key=path.stem,
+                size=data.get("size", 0),
+                files=len(data.get("files", [])),
+                requirements=len(data.get("requirements", [])),
+                created=data.get("created", last_used),
+                last_used=last_used,
+            )
+            for path, data, last_used in self._scan()
+        ]
+
+    def _object_sizes(self) -> Dict[str, Tuple[int, float]]:
+        """Size and change time of every stored object, by hash."""
+        objects: Dict[str, Tuple[int, float]] = {}
+        try:
+            prefixes = list(os.scandir(self.objects_dir))
+        except OSError:
+            return objects
+        for prefix in prefixes:
+            if not prefix.is_dir():
+                continue
+            with os.scandir(prefix.path) as it:
+                for entry in it:
+                    if entry.name.endswith(".tmp"):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    objects[prefix.name + entry.name] = (st.st_size, st.st_ctime)
+        return objects
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarize the store.
+
+        Returns:
+            Entry and object counts, the size on disk (each object counted
+            once) and the size limit
+        """
+        objects = self._object_sizes()
+        return {
+            "entries": len(self.entries()),
+            "objects": len(objects),
+            "size": sum(size for size, _ in objects.values()),
+            "max_size": self.max_bytes,
+            "path": str(self.root),
+        }
+
+    def prune(self, max_bytes: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Evict least recently used entries until the store fits its limit.
+
+        Objects no longer referenced by any entry are deleted.
+
+        Args:
+            max_bytes: Size limit (default: the cache's limit; 0 empties the cache)
+
+        Returns:
+            Tuple of (entries removed, bytes freed)
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        objects = self._object_sizes()
+
+        refcounts: Dict[str, int] = {}
+        entries: List[Tuple[Path, Set[str]]] = []
+        for path, data, _ in self._scan():
+            digests = {digest for _, digest, _ in data.get("files", [])}
+            digests.update(digest for _, digest, _ in data.get("scripts", []))
+            for digest in digests:
+                refcounts[digest] = refcounts.get(digest, 0) + 1
+            entries.append((path, digests))
+
+        used = sum(objects[d][0] for d in refcounts if d in objects)
+        removed = 0
+        for path, digests in entries:
+            if used <= limit:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            removed += 1
+            for digest in digests:
+                refcounts[digest] -= 1
+                if refcounts[digest] == 0:
+                    del refcounts[digest]
+                    used -= objects.get(digest, (0, 0.0))[0]
+
+        freed = 0
+        now = time.time()
+        for digest, (size, ctime) in objects.items():
+            if digest in refcounts or now - ctime < _GC_GRACE_SECONDS and limit > 0:
+                continue
+            try:
+                self._object_path(digest).unlink()
+                freed += size
+            except OSError:
+                pass
+        if removed or freed:
+            logger.info(f"Pruned {removed} environments, freed {freed} bytes")
+        return removed, freed
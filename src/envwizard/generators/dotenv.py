@@ -4,14 +4,20 @@ import os
 from pathlib import Path
 from typing import List, Optional, Tuple
 from envwizard.detectors.framework import FrameworkDetector
+from envwizard.detectors.manifest import ProjectManifest
 
 
 class DotEnvGenerator:
     """Generate .env and .env.example files."""
 
-    def __init__(self, project_path: Optional[Path] = None) -> None:
+    def __init__(
+        self, project_path: Optional[Path] = None, manifest: Optional[ProjectManifest] = None
+    ) -> None:
         """Initialize dotenv generator."""
         self.project_path = project_path or Path.cwd()
+        # Only used to read dependency files; .env and .gitignore are checked
+        # on disk because this class writes them
+        self.manifest = manifest
 
     def _validate_output_filename(self, filename: str) -> bool:
         """
@@ -79,7 +85,7 @@ class DotEnvGenerator:
         env_vars = FrameworkDetector.get_all_env_vars(frameworks)
 
         # Check for database
-        db_type = FrameworkDetector.detect_database(self.project_path)
+        db_type = FrameworkDetector.detect_database(self.project_path, self.manifest)
         if db_type:
             env_vars.extend(FrameworkDetector.get_database_env_vars(db_type))
 
@@ -0,0 +1,349 @@
+"""Per-package timing of dependency installs, kept across runs."""
+
+import json
+import os
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from envwizard.detectors.framework_index import canonicalize_name
+from envwizard.locations import user_cache_dir
+from envwizard.logger import get_logger
+
+logger = get_logger(__name__)
+
+HISTORY_FILENAME = "install-history.jsonl"
+
+# Runs kept in the history file; older ones are dropped when it is rewritten
+MAX_RUNS = 500
+
+# A package regressed if its latest time exceeds the median of its earlier
+# runs by this factor and by at least MIN_REGRESSION_SECONDS
+REGRESSION_FACTOR = 1.5
+MIN_REGRESSION_SECONDS = 1.0
+
+# Lines of pip's (non-interactive) output that mark the start of a package
+_COLLECT_RE = re.compile(r"^(?:Collecting|Processing)\s+(\S+)")
+_BUILD_RE = re.compile(
+    r"^(?:Building (?:wheel|editable) for|Running setup\.py install for)\s+([^\s:]+)"
+)
+_CREATED_RE = re.compile(r"^Created wheel for ([^\s:]+): filename=(\S+)")
+_ARCHIVE_RE = re.compile(r"\.(?:whl|tar\.gz|zip)$")
+_DIST_VERSION_RE = re.compile(r"-(\d[^-]*)$")
+
+
+def _requirement_name(target: str) -> Optional[str]:
+    """Distribution name of a Collecting/Processing target (requirement or file)."""
+    target = target.split("@", 1)[0]  # "name @ url"
+    if "://" in target:
+        return None  # a bare URL
+    path = target.replace("\\", "/").rstrip("/")
+    base = path.rsplit("/", 1)[-1]
+    if base != path or _ARCHIVE_RE.search(base):
+        # A local directory or archive (name-version[-tags].ext)
+        base = _ARCHIVE_RE.sub("", base).split("-", 1)[0]
+    match = re.match(r"[A-Za-z0-9][A-Za-z0-9._-]*", base)
+    return canonicalize_name(match.group(0).rstrip("._-")) if match else None
+
+
+class PackageTiming(NamedTuple):
+    """How long pip spent on one package during an install run."""
+
+    name: str
+    version: Optional[str]
+    # From "Collecting" to the next package: resolving, downloading and
+    # preparing metadata
+    download_seconds: float
+    # Building a wheel from an sdist (0 for wheels)
+    build_seconds: float
+    source_build: bool
+
+    @property
+    def total_seconds(self) -> float:
+        return self.download_seconds + self.build_seconds
+
+
+class InstallTimer:
+    """
+    Time the packages of a pip run from its streamed output.
+
+    Feed it every output line (it forwards them to ``on_output``); pip's
+    non-interactive output announces each package ("Collecting", "Building
+    wheel for ... started/finished", "Installing collected packages"), and
+    the time between those lines is attributed to the package. pip installs
+    all packages in one step at the end, so installation is timed per run.
+    """
+
+    def __init__(
+        self,
+        on_output: Optional[Callable[[str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the timer.
+
+        Args:
+            on_output: Called with each line after it is timed
+            clock: Time source (seconds)
+        """
+        self.on_output = on_output
+        self.clock = clock
+        self.started = clock()
+        self._download: Dict[str, float] = {}
+        self._build: Dict[str, float] = {}
+        self._versions: Dict[str, str] = {}
+        self._collecting: Optional[str] = None
+        self._building: Optional[str] = None
+        self._mark = self.started
+        self._install_started: Optional[float] = None
+        self._install_seconds = 0.0
+        self._created: Optional[Tuple[str, str]] = None
+        self._wheels: Dict[str, Path] = {}
+
+    def _close(self, now: float) -> None:
+        """Attribute the time since the last mark to the package being worked on."""
+        if self._building is not None:
+            self._build[self._building] = self._build.get(self._building, 0.0) + now - self._mark
+            self._building = None
+        elif self._collecting is not None:
+            name = self._collecting
+            self._download[name] = self._download.get(name, 0.0) + now - self._mark
+            self._collecting = None
+        self._mark = now
+
+    def feed(self, line: str) -> None:
+        """Time one line of pip output."""
+        now = self.clock()
+        stripped = line.strip()
+
+        match = _COLLECT_RE.match(stripped)
+        if match:
+            self._close(now)
+            self._collecting = _requirement_name(match.group(1))
+            if self._collecting is not None:
+                self._download.setdefault(self._collecting, 0.0)
+        elif stripped.startswith(("Requirement already satisfied", "Building wheels for")):
+            self._close(now)
+        elif stripped.startswith(("Created wheel for", "Created editable for")) or (
+            _BUILD_RE.match(stripped) and ": finished" in stripped
+        ):
+            if self._building is not None:
+                self._close(now)
+            match = _CREATED_RE.match(stripped)
+            if match:
+                self._created = (canonicalize_name(match.group(1)), match.group(2))
+        elif stripped.startswith("Stored in directory:"):
+            if self._created is not None:
+                name, filename = self._created
+                directory = stripped.split(":", 1)[1].strip()
+                self._wheels[name] = Path(directory) / filename
+                self._created = None
+        elif _BUILD_RE.match(stripped):
+            name = canonicalize_name(_BUILD_RE.match(stripped).group(1))  # type: ignore[union-attr]
+            if name != self._building:
+                self._close(now)
+                self._building = name
+                self._build.setdefault(name, 0.0)
+        elif stripped.startswith("Installing collected packages"):
+            self._close(now)
+            self._install_started = now
+        elif stripped.startswith("Successfully installed"):
+            if self._install_started is not None:
+                self._install_seconds += now - self._install_started
+                self._install_started = None
+            for dist in stripped.split()[2:]:
+                match = _DIST_VERSION_RE.search(dist)
+                if match:
+                    self._versions[canonicalize_name(dist[: match.start()])] = match.group(1)
+            self._mark = now
+
+        if self.on_output is not None:
+            self.on_output(line)
+
+    def merge(self, other: "InstallTimer") -> None:
+        """
+        Add the timings of a pip run that went on alongside this one.
+
+        Used for concurrent install workers, each timed on its own; their
+        install times are summed rather than overlapped.
+        """
+        other._close(other.clock())
+        for name, seconds in other._download.items():
+            self._download[name] = self._download.get(name, 0.0) + seconds
+        for name, seconds in other._build.items():
+            self._build[name] = self._build.get(name, 0.0) + seconds
+        self._versions.update(other._versions)
+        self._wheels.update(other._wheels)
+        self._install_seconds += other._install_seconds
+        if other._install_started is not None:
+            self._install_seconds += other.clock() - other._install_started
+
+    def built_wheels(self) -> Dict[str, Path]:
+        """Wheels pip built from sdists and kept in its cache, by canonical name."""
+        return dict(self._wheels)
+
+    def packages(self) -> List[PackageTiming]:
+        """Timings of the packages seen so far, in the order pip collected them."""
+        self._close(self.clock())
+        names = list(self._download) + [n for n in self._build if n not in self._download]
+        return [
+            PackageTiming(
+                name=name,
+                version=self._versions.get(name),
+                download_seconds=round(self._download.get(name, 0.0), 3),
+                build_seconds=round(self._build.get(name, 0.0), 3),
+                source_build=name in self._build,
+            )
+            for name in names
+        ]
+
+    def record(self, returncode: int, **context: Any) -> Dict[str, Any]:
+        """
+        Build the history record of the run.
+
+        Args:
+            returncode: pip's exit status
+            **context: Extra fields, e.g. project and python
+
+        Returns:
+            JSON-serializable record
+        """
+        packages = self.packages()
+        now = self.clock()
+        if self._install_started is not None:
+            self._install_seconds += now - self._install_started
+            self._install_started = None
+        return {
+            "time": time.time(),
+            **context,
+            "returncode": returncode,
+            "total_seconds": round(now - self.started, 3),
+            "install_seconds": round(self._install_seconds, 3),
+            "packages": [p._asdict() for p in packages],
+        }
+
+
+class PackageReport(NamedTuple):
+    """A package's timings across the recorded runs."""
+
+    name: str
+    version: Optional[str]
+    runs: int
+    median_seconds: float
+    last_seconds: float
+    source_builds: int
+    median_build_seconds: float
+    # Median of the runs before the last one (None with a single run)
+    previous_median_seconds: Optional[float]
+
+    @property
+    def regressed(self) -> bool:
+        previous = self.previous_median_seconds
+        if previous is None:
+            return False
+        return (
+            self.last_seconds > previous * REGRESSION_FACTOR
+            and self.last_seconds - previous >= MIN_REGRESSION_SECONDS
+        )
+
+
+class InstallHistory:
+    """
+    Append-only log of install runs in the user cache directory.
+
+    Each line of ``install-history.jsonl`` is one run as produced by
+    InstallTimer.record. The file is trimmed to the last MAX_RUNS runs.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+        """
+        Initialize the history.
+
+        Args:
+            cache_dir: User cache directory (default: user_cache_dir())
+        """
+        self.path = (cache_dir or user_cache_dir()) / HISTORY_FILENAME
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Add a run to the history (errors are logged, never raised)."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, sort_keys=True) + "\n")
+            if self.path.stat().st_size > MAX_RUNS * 2048:
+                self._trim()
+        except OSError as e:
+            logger.debug(f"Could not record install timings in {self.path}: {e}")
+
+    def _trim(self) -> None:
+        lines = self.path.read_text(encoding="utf-8").splitlines(keepends=True)
+        if len(lines) <= MAX_RUNS:
+            return
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}")
+        tmp.write_text("".join(lines[-MAX_RUNS:]), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def runs(self, project: Optional[Path] = None) -> List[Dict[str, Any]]:
+        """
+        Recorded runs, oldest first.
+
+        Args:
+            project: Only runs for this project directory
+        """
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except OSError:
+            return []
+        runs = []
+        for line in text.splitlines():
+            try:
+                run = json.loads(line)
+            except ValueError:
+                continue  # a partially written line
+            if not isinstance(run, dict):
+                continue
+            if project is not None and run.get("project") != str(project):
+                continue
+            runs.append(run)
+        return runs
+
+    def package_reports(self, project: Optional[Path] = None) -> List[PackageReport]:
+        """
+        Summarize each package's timings over the recorded runs.
+
+        Args:
+            project: Only runs for this project directory
+
+        Returns:
+            One report per package, slowest (by median) first
+        """
+        timings: Dict[str, List[Dict[str, Any]]] = {}
+        for run in self.runs(project):
+            for package in run.get("packages") or []:
+                if isinstance(package, dict) and package.get("name"):
+                    timings.setdefault(package["name"], []).append(package)
+
+        reports = []
+        for name, entries in timings.items():
+            totals = [
+                float(e.get("download_seconds", 0)) + float(e.get("build_seconds", 0))
+                for e in entries
+            ]
+            builds = [float(e.get("build_seconds", 0)) for e in entries if e.get("source_build")]
+            reports.append(
+                PackageReport(
+                    name=name,
+                    version=entries[-1].get("version"),
+                    runs=len(entries),
+                    median_seconds=statistics.median(totals),
+                    last_seconds=totals[-1],
+                    source_builds=len(builds),
+                    median_build_seconds=statistics.median(builds) if builds else 0.0,
+                    previous_median_seconds=(
+                        statistics.median(totals[:-1]) if len(totals) > 1 else None
+                    ),
+                )
+            )
+        return sorted(reports, key=lambda r: r.median_seconds, reverse=True)
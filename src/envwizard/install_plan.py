@@ -0,0 +1,444 @@
+"""Plan dependency installs against what a venv already contains."""
+
+import os
+import platform
+import re
+import shlex
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from envwizard.detectors.lockfile import LockedSet, read_lockfile
+from envwizard.detectors.manifest import (
+    Requirement,
+    parse_manifest,
+    parse_requirement,
+    poetry_requirement,
+)
+from envwizard.logger import get_logger
+from envwizard.venv_metadata import (
+    cfg_version,
+    find_site_packages,
+    installed_distributions,
+    read_pyvenv_cfg,
+)
+from envwizard.versions import specifier_contains
+
+logger = get_logger(__name__)
+
+# One token of a PEP 508 environment marker
+_MARKER_TOKEN_RE = re.compile(
+    r"""\s*(\(|\)|'[^']*'|"[^"]*"|===|==|!=|<=|>=|~=|<|>|not\s+in\b|in\b|and\b|or\b|[A-Za-z_]\w*)"""
+)
+
+# Marker variables compared as versions rather than strings
+_VERSION_MARKERS = {"python_version", "python_full_version", "implementation_version"}
+
+_SWAPPED_OPERATORS = {"<": ">", ">": "<", "<=": ">=", ">=": "<=", "==": "==", "!=": "!="}
+
+# pip options whose value is a path, resolved relative to the requirements file
+_PATH_OPTIONS = {"-c", "--constraint", "-f", "--find-links"}
+
+# Requirement file content the planner does not model; such files are
+# handed to `pip install -r` unchanged
+_UNPLANNABLE_RE = re.compile(r"--hash|--require-hashes|\\\s*$", re.MULTILINE)
+
+
+def marker_environment(python_version: Optional[str]) -> Dict[str, str]:
+    """
+    Values of the PEP 508 marker variables for a venv on this machine.
+
+    Args:
+        python_version: Full version of the venv's interpreter (from pyvenv.cfg)
+    """
+    environment = {
+        "os_name": os.name,
+        "sys_platform": sys.platform,
+        "platform_system": platform.system(),
+        "platform_machine": platform.machine(),
+        "platform_python_implementation": platform.python_implementation(),
+        "implementation_name": sys.implementation.name,
+    }
+    if python_version:
+        environment["python_full_version"] = python_version
+        environment["python_version"] = ".".join(python_version.split(".")[:2])
+    return environment
+
+
+def _compare_marker(
+    left: str, operator: str, right: str, environment: Dict[str, str]
+) -> Optional[bool]:
+    """Evaluate one marker comparison; operands are variable names or quoted strings."""
+    values = []
+    for operand in (left, right):
+        if operand[0] in "'\"":
+            values.append(operand[1:-1])
+        elif operand in environment:
+            values.append(environment[operand])
+        else:
+            return None  # e.g. "extra", or a variable of another interpreter
+
+    operator = " ".join(operator.split())
+    if operator == "in":
+        return values[0] in values[1]
+    if operator == "not in":
+        return values[0] not in values[1]
+    if left in _VERSION_MARKERS:
+        return specifier_contains(f"{operator}{values[1]}", values[0])
+    if right in _VERSION_MARKERS:
+        if operator not in _SWAPPED_OPERATORS:
+            return None
+        return specifier_contains(f"{_SWAPPED_OPERATORS[operator]}{values[0]}", values[1])
+    if operator in ("==", "==="):
+        return values[0] == values[1]
+    if operator == "!=":
+        return values[0] != values[1]
+    return None
+
+
+def evaluate_marker(marker: str, environment: Dict[str, str]) -> Optional[bool]:
+    """
+    Evaluate a PEP 508 environment marker such as 'sys_platform == "win32"'.
+
+    Args:
+        marker: The marker expression
+        environment: Variable values (see marker_environment())
+
+    Returns:
+        Whether the marker holds, or None if it cannot be decided (unknown
+        variables such as "extra", unsupported comparisons, bad syntax)
+    """
+    tokens = []
+    position = 0
+    marker = marker.strip()
+    while position < len(marker):
+        match = _MARKER_TOKEN_RE.match(marker, position)
+        if not match:
+            return None
+        tokens.append(match.group(1))
+        position = match.end()
+    tokens.append("")
+
+    index = 0
+
+    def expression() -> Optional[bool]:
+        nonlocal index
+        result = conjunction()
+        while tokens[index] == "or":
+            index += 1
+            right = conjunction()
+            result = True if result or right else None if None in (result, right) else False
+        return result
+
+    def conjunction() -> Optional[bool]:
+        nonlocal index
+        result = comparison()
+        while tokens[index] == "and":
+            index += 1
+            right = comparison()
+            if result is False or right is False:
+                result = False
+            elif result is None or right is None:
+                result = None
+        return result
+
+    def comparison() -> Optional[bool]:
+        nonlocal index
+        if tokens[index] == "(":
+            index += 1
+            result = expression()
+            if tokens[index] != ")":
+                raise ValueError(marker)
+            index += 1
+            return result
+        left, operator, right = tokens[index : index + 3]
+        if not left or not right or left in "()" or right in "()":
+            raise ValueError(marker)
+        index += 3
+        return _compare_marker(left, operator, right, environment)
+
+    try:
+        result = expression()
+    except (ValueError, IndexError):
+        return None
+    return result if tokens[index] == "" else None
+
+
+class InstallPlan(NamedTuple):
+    """What a pip invocation has to do to satisfy a dependency file."""
+
+    # pip arguments for what is not satisfied: requirement strings, bare
+    # URLs and "--editable=PATH" (editable installs are always redone)
+    pending: List[str]
+    # Requirement strings the venv already satisfies
+    satisfied: List[str]
+    # pip options from the requirements file(s), e.g. ["--index-url", "..."]
+    options: List[str]
+    # Set for lockfiles: pending is then exact and complete, and is
+    # installed with --no-deps
+    locked: bool = False
+    # Hashes of each pending requirement, when the lock has them for all
+    hashes: Optional[Dict[str, Tuple[str, ...]]] = None
+    # For locked plans: the pending requirements each pending requirement
+    # depends on, where the lock records dependencies
+    dependencies: Optional[Dict[str, Tuple[str, ...]]] = None
+
+    @property
+    def up_to_date(self) -> bool:
+        return not self.pending
+
+
+def is_satisfied(requirement: Requirement, installed: Dict[str, str]) -> bool:
+    """
+    Check whether an installed distribution satisfies a requirement.
+
+    Requirements with extras, markers or direct URLs are never considered
+    satisfied; pip decides about those.
+    """
+    version = installed.get(requirement.key)
+    if version is None:
+        return False
+    rest = requirement.spec[len(requirement.name) :].strip()
+    if not rest:
+        return True
+    if rest.startswith(("[", ";", "@")) or ";" in rest:
+        return False
+    if rest.startswith("(") and rest.endswith(")"):
+        rest = rest[1:-1]
+    return specifier_contains(rest, version) is True
+
+
+def _absolute_option(tokens: List[str], base: Path) -> List[str]:
+    """Resolve the path argument of a path-taking pip option against base."""
+    option, _, value = tokens[0].partition("=")
+    if option not in _PATH_OPTIONS:
+        return tokens
+    if value:
+        tokens = [option, value] + tokens[1:]
+    if len(tokens) > 1 and "://" not in tokens[1]:
+        candidate = base / tokens[1]
+        if candidate.exists():
+            tokens = [tokens[0], str(candidate.resolve())] + tokens[2:]
+    return tokens
+
+
+class _RequirementsFile(NamedTuple):
+    requirements: List[Requirement]
+    # pip options such as --index-url, with paths made absolute
+    options: List[str]
+    # Installs that are always passed to pip (editables, bare URLs)
+    direct: List[str]
+
+
+def read_requirements(dep_file: Path) -> Optional[_RequirementsFile]:
+    """
+    Read the requirements and pip options of a dependency file.
+
+    Requirements files are followed through -r includes and their other
+    options are kept, with relative paths resolved. For pyproject.toml and
+    Pipfile the runtime dependencies are used, with Poetry constraints
+    translated to PEP 440.
+
+    Returns:
+        The requirements, or None if the file uses features the planner
+        does not model (hashes, line continuations, Poetry dependencies that
+        are not on an index) or is not a supported format
+    """
+    if dep_file.name in ("pyproject.toml", "Pipfile"):
+        try:
+            parsed = parse_manifest(dep_file.name, dep_file.read_bytes(), dep_file.name)
+        except OSError:
+            return None
+        poetry = (parsed.data.get("tool") or {}).get("poetry") or {}
+        for name, value in (poetry.get("dependencies") or {}).items():
+            if name.lower() != "python" and poetry_requirement(name, value) is None:
+                # Git, path and URL sources are left to installing the project
+                return None
+        return _RequirementsFile([r for r in parsed.requirements if r.group is None], [], [])
+    if dep_file.suffix != ".txt":
+        return None
+
+    result = _RequirementsFile([], [], [])
+    seen: Set[Path] = set()
+
+    def read(path: Path) -> bool:
+        path = path.resolve()
+        if path in seen:
+            return True
+        seen.add(path)
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return False
+        if _UNPLANNABLE_RE.search(text):
+            return False
+        for line in text.splitlines():
+            line = line.split(" #", 1)[0].strip()
+            if not line or line.startswith("#"):
+                continue
+            if not line.startswith("-"):
+                requirement = parse_requirement(line, path.name)
+                if requirement is None:
+                    result.direct.append(line)
+                else:
+                    result.requirements.append(requirement)
+                continue
+            try:
+                tokens = shlex.split(line)
+            except ValueError:
+                return False
+            option, _, value = tokens[0].partition("=")
+            value = value or (tokens[1] if len(tokens) > 1 else "")
+            if option in ("-r", "--requirement"):
+                if not value or not read(path.parent / value):
+                    return False
+            elif option in ("-e", "--editable"):
+                if "://" not in value:
+                    value = str((path.parent / value).resolve())
+                result.direct.append(f"--editable={value}")
+            else:
+                result.options.extend(_absolute_option(tokens, path.parent))
+        return True
+
+    return result if read(dep_file) else None
+
+
+def _plan_locked(
+    locked: LockedSet, installed: Dict[str, str], environment: Dict[str, str]
+) -> InstallPlan:
+    """Plan an exact install set: markers are evaluated and versions must match exactly."""
+    pending: List[str] = []
+    satisfied: List[str] = []
+    hashes: Dict[str, Tuple[str, ...]] = {}
+    pending_specs: Dict[str, str] = {}
+    for requirement in locked.requirements:
+        applies = evaluate_marker(requirement.markers, environment) if requirement.markers else True
+        if applies is False:
+            continue
+        version = installed.get(requirement.key)
+        if version is not None and specifier_contains(f"=={requirement.version}", version):
+            satisfied.append(requirement.pin)
+            continue
+        # Undecidable markers are left to pip
+        spec = requirement.pin if applies else requirement.spec
+        pending.append(spec)
+        hashes[spec] = requirement.hashes
+        pending_specs[requirement.key] = spec
+
+    dependencies = {}
+    for requirement in locked.requirements:
+        pending_spec = pending_specs.get(requirement.key)
+        if pending_spec is not None:
+            dependencies[pending_spec] = tuple(
+                pending_specs[name] for name in requirement.dependencies if name in pending_specs
+            )
+    return InstallPlan(
+        pending,
+        satisfied,
+        list(locked.options),
+        locked=True,
+        hashes=hashes if locked.hashed else None,
+        dependencies=dependencies,
+    )
+
+
+def install_stages(plan: InstallPlan, jobs: int) -> List[List[List[str]]]:
+    """
+    Split the pending requirements of a locked plan into stages of concurrent batches.
+
+    A stage holds the requirements whose dependencies were all installed by
+    earlier stages, so the requirements of a stage do not depend on each
+    other. They are dealt into at most `jobs` batches. Requirements in a
+    dependency cycle share the last stage.
+
+    Args:
+        plan: Locked install plan
+        jobs: Maximum number of batches per stage
+
+    Returns:
+        The stages in install order; each is a list of batches of requirements
+    """
+    graph = plan.dependencies or {}
+    remaining = list(plan.pending)
+    done: Set[str] = set()
+    stages = []
+    while remaining:
+        ready = [spec for spec in remaining if all(d in done for d in graph.get(spec, ()))]
+        ready = ready or remaining
+        done.update(ready)
+        remaining = [spec for spec in remaining if spec not in done]
+        count = max(1, min(jobs, len(ready)))
+        stages.append([ready[i::count] for i in range(count)])
+    return stages
+
+
+def plan_locked_install(venv_path: Path, locked: LockedSet) -> Optional[InstallPlan]:
+    """
+    Work out which distributions of an exact install set a venv still needs.
+
+    Args:
+        venv_path: Virtual environment
+        locked: The set, e.g. from a lockfile or a cached resolution
+
+    Returns:
+        A locked plan, or None if the venv's site-packages is not found
+    """
+    python_version = cfg_version(read_pyvenv_cfg(venv_path))
+    site_packages = find_site_packages(venv_path, python_version)
+    if site_packages is None:
+        return None
+    return _plan_locked(
+        locked, installed_distributions(site_packages), marker_environment(python_version)
+    )
+
+
+def plan_install(venv_path: Path, dep_file: Path) -> Optional[InstallPlan]:
+    """
+    Work out which requirements of a dependency file a venv still needs.
+
+    Installed distributions are read from the venv's site-packages
+    metadata, so neither pip nor the venv's interpreter is started.
+    Lockfiles and fully pinned requirements files give a locked plan (see
+    read_lockfile()).
+
+    Args:
+        venv_path: Virtual environment
+        dep_file: Requirements file, pyproject.toml, Pipfile or a lockfile
+
+    Returns:
+        The plan, or None if the file cannot be planned and should be
+        installed as a whole
+    """
+    python_version = cfg_version(read_pyvenv_cfg(venv_path))
+    site_packages = find_site_packages(venv_path, python_version)
+    if site_packages is None:
+        return None
+
+    locked = read_lockfile(dep_file)
+    if locked is not None:
+        plan = _plan_locked(
+            locked, installed_distributions(site_packages), marker_environment(python_version)
+        )
+        logger.debug(
+            f"Locked install plan for {dep_file.name}: {len(plan.pending)} pending, "
+            f"{len(plan.satisfied)} satisfied"
+        )
+        return plan
+
+    requirements_file = read_requirements(dep_file)
+    if requirements_file is None:
+        return None
+
+    installed = installed_distributions(site_packages)
+    pending: List[str] = []
+    satisfied: List[str] = []
+    for requirement in requirements_file.requirements:
+        target = satisfied if is_satisfied(requirement, installed) else pending
+        if requirement.spec not in target:
+            target.append(requirement.spec)
+    pending.extend(requirements_file.direct)
+
+    logger.debug(
+        f"Install plan for {dep_file.name}: {len(pending)} pending, {len(satisfied)} satisfied"
+    )
+    return InstallPlan(pending, satisfied, requirements_file.options)
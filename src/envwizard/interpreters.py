@@ -0,0 +1,379 @@
+"""Discovery of the Python interpreters installed on this machine."""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from envwizard.logger import get_logger
+from envwizard.venv_metadata import cfg_version, read_pyvenv_cfg
+from envwizard.versions import poetry_constraint, specifier_contains
+
+logger = get_logger(__name__)
+
+# Bump when the cache layout or the probing rules change
+CACHE_VERSION = 2
+
+# python, python3, python3.11, python.exe; not python3-config or pythonw
+_EXECUTABLE_RE = re.compile(r"^python(\d+(?:\.\d+)?)?(?:\.exe)?$", re.IGNORECASE)
+
+_VERSION_RE = re.compile(r"^(\d+)\.(\d+)(?:\.(\d+))?")
+
+# One clause of a version requirement: "3.11", ">=3.8", "==3.11.*", "^3.10", "~=3.9"
+_CLAUSE_RE = re.compile(r"^(~=|===|==|!=|<=|>=|<|>|\^|~)?\s*(\d+(?:\.\d+)*)(\.\*)?$")
+
+Version = Tuple[int, ...]
+
+
+class Interpreter(NamedTuple):
+    """A Python interpreter found on this machine."""
+
+    path: str
+    version: Version
+
+    @property
+    def version_string(self) -> str:
+        """Version as "X.Y.Z"."""
+        return ".".join(str(part) for part in self.version)
+
+
+def parse_version(text: str) -> Optional[Version]:
+    """Parse the leading "X.Y[.Z]" of a version string."""
+    match = _VERSION_RE.match(text.strip())
+    if not match:
+        return None
+    return tuple(int(part) for part in match.groups() if part is not None)
+
+
+def parse_python_requirement(spec: str) -> Optional[str]:
+    """
+    Parse a Python version requirement into a PEP 440 specifier.
+
+    Accepts bare versions ("3.11" means any 3.11.x), PEP 440 specifiers as
+    found in requires-python (">=3.8,<3.13", "~=3.10", "==3.11.*") and
+    Poetry's caret and tilde forms ("^3.10", "~3.10").
+
+    Args:
+        spec: Requirement string
+
+    Returns:
+        The equivalent specifier, e.g. "==3.11.*" for "3.11", or None if
+        the string is not a version requirement
+    """
+    clauses = []
+    for part in spec.split(","):
+        match = _CLAUSE_RE.match(part.strip())
+        if not match:
+            return None
+        operator, version, wildcard = match.groups()
+        if wildcard and operator not in ("==", "!="):
+            return None
+        if operator in ("^", "~"):
+            clauses.append(poetry_constraint(operator + version) or "")
+        elif not operator:
+            clauses.append(f"=={version}.*")
+        else:
+            clauses.append(f"{operator}{version}{wildcard or ''}")
+    specifier = ",".join(clauses)
+    # Rejects what the grammar above lets through, such as "~=3"
+    if not specifier or specifier_contains(specifier, "0") is None:
+        return None
+    return specifier
+
+
+def version_matches(version: Version, spec: str) -> bool:
+    """Check whether a version satisfies a requirement (see parse_python_requirement)."""
+    specifier = parse_python_requirement(spec)
+    if specifier is None:
+        return False
+    return specifier_contains(specifier, ".".join(str(part) for part in version)) is True
+
+
+def _version_from_pyvenv_cfg(executable: Path) -> Optional[Version]:
+    """Read the version of a virtualenv's interpreter from its pyvenv.cfg."""
+    for venv_path in (executable.parent, executable.parent.parent):
+        version = parse_version(cfg_version(read_pyvenv_cfg(venv_path)) or "")
+        if version and len(version) == 3:
+            return version
+    return None
+
+
+def _version_from_install_dir(executable: Path) -> Optional[Version]:
+    """Take the version from an install prefix such as ~/.pyenv/versions/3.11.7/bin."""
+    name = executable.parent.parent.name
+    if re.match(r"^\d+\.\d+\.\d+$", name):
+        return parse_version(name)
+    return None
+
+
+def _version_from_running(executable: Path) -> Optional[Version]:
+    """Ask the interpreter for its version (the slow path)."""
+    try:
+        result = subprocess.run(
+            [str(executable), "-c", "import sys; print('%d.%d.%d' % sys.version_info[:3])"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return parse_version(result.stdout) if result.returncode == 0 else None
+
+
+def probe_version(executable: Path) -> Optional[Version]:
+    """
+    Determine an interpreter's version, running it only as a last resort.
+
+    Args:
+        executable: Path to the interpreter
+
+    Returns:
+        (major, minor, micro), or None if it is not a working interpreter
+    """
+    version = _version_from_pyvenv_cfg(executable)
+    if version:
+        return version
+
+    real = Path(os.path.realpath(executable))
+    version = _version_from_install_dir(real)
+    if version:
+        return version
+
+    return _version_from_running(executable)
+
+
+def _stat_key(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def default_search_dirs() -> List[str]:
+    """
+    Directories that may contain Python interpreters, most preferred first.
+
+    PATH comes first, then pyenv and asdf installs (read directly instead of
+    through their shims), then common installation prefixes.
+    """
+    home = Path.home()
+    pyenv_root = Path(os.environ.get("PYENV_ROOT") or home / ".pyenv")
+    asdf_root = Path(os.environ.get("ASDF_DATA_DIR") or home / ".asdf")
+    shim_dirs = {str(pyenv_root / "shims"), str(asdf_root / "shims")}
+
+    dirs = [d for d in os.environ.get("PATH", "").split(os.pathsep) if d and d not in shim_dirs]
+
+    for versions in (pyenv_root / "versions", asdf_root / "installs" / "python"):
+        try:
+            installs = sorted(os.listdir(versions), reverse=True)
+        except OSError:
+            continue
+        dirs.extend(str(versions / name / "bin") for name in installs)
+
+    if sys.platform == "win32":
+        programs = Path(os.environ.get("LOCALAPPDATA") or home / "AppData" / "Local")
+        try:
+            installs = sorted(os.listdir(programs / "Programs" / "Python"), reverse=True)
+        except OSError:
+            installs = []
+        dirs.extend(str(programs / "Programs" / "Python" / name) for name in installs)
+    else:
+        dirs.extend(["/usr/local/bin", "/usr/bin", "/opt/homebrew/bin", "/opt/local/bin"])
+
+    seen = set()
+    unique = []
+    for d in dirs:
+        key = os.path.normcase(os.path.abspath(d))
+        if key not in seen:
+            seen.add(key)
+            unique.append(d)
+    return unique
+
+
+class InterpreterRegistry:
+    """
+    Cached list of the Python interpreters on this machine.
+
+    Directory listings are reused while the directory's mtime is unchanged,
+    and interpreter versions while the executable's stat signature is
+    unchanged, so after the first run discovery is a few stat calls.
+    Directories are listed and unknown interpreters probed in parallel.
+    """
+
+    FILENAME = "interpreters.json"
+
+    def __init__(
+        self, cache_dir: Optional[Path] = None, search_dirs: Optional[Sequence[str]] = None
+    ) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            cache_dir: Directory for the persistent cache (not persisted if None)
+            search_dirs: Directories to search (default: default_search_dirs())
+        """
+        self.cache_dir = cache_dir
+        self.search_dirs = list(search_dirs) if search_dirs is not None else None
+        self._interpreters: Optional[List[Interpreter]] = None
+
+    @property
+    def path(self) -> Optional[Path]:
+        """Location of the cache file."""
+        return self.cache_dir / self.FILENAME if self.cache_dir else None
+
+    def _load_cache(self) -> Dict[str, Any]:
+        empty: Dict[str, Any] = {"version": CACHE_VERSION, "dirs": {}, "interpreters": {}}
+        if self.path is None:
+            return empty
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return empty
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return empty
+        return data
+
+    def _save_cache(self, data: Dict[str, Any]) -> None:
+        if self.path is None:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data, sort_keys=True))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug(f"Failed to write interpreter cache: {e}")
+
+    @staticmethod
+    def _list_dir(directory: str, cached: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Interpreter names in a directory, reusing the cached listing if unchanged."""
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+        if cached and cached.get("mtime_ns") == mtime_ns:
+            return cached
+        try:
+            names = sorted(name for name in os.listdir(directory) if _EXECUTABLE_RE.match(name))
+        except OSError:
+            return None
+        return {"mtime_ns": mtime_ns, "names": names}
+
+    def discover(self, refresh: bool = False) -> List[Interpreter]:
+        """
+        Find the interpreters on this machine.
+
+        Args:
+            refresh: Ignore the in-memory result and check the disk again
+
+        Returns:
+            Interpreters in order of preference, the running one first
+        """
+        if self._interpreters is not None and not refresh:
+            return self._interpreters
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        cache = self._load_cache()
+        dirs = self.search_dirs if self.search_dirs is not None else default_search_dirs()
+        old_dirs: Dict[str, Any] = cache["dirs"]
+        old_interpreters: Dict[str, Any] = cache["interpreters"]
+
+        with ThreadPoolExecutor(max_workers=min(8, len(dirs) or 1)) as pool:
+            listings = list(pool.map(lambda d: self._list_dir(d, old_dirs.get(d)), dirs))
+
+        # The running interpreter needs no probing and is preferred on ties
+        current = os.path.realpath(sys.executable)
+        found: List[Interpreter] = [Interpreter(sys.executable, tuple(sys.version_info[:3]))]
+        seen = {current}
+        new_dirs: Dict[str, Any] = {}
+        new_interpreters: Dict[str, Any] = {}
+        to_probe: List[Tuple[int, str, str, List[int]]] = []
+
+        for directory, listing in zip(dirs, listings):
+            if listing is None:
+                continue
+            new_dirs[directory] = listing
+            for name in listing["names"]:
+                path = os.path.join(directory, name)
+                real = os.path.realpath(path)
+                if real in seen:
+                    continue
+                stat_key = _stat_key(real)
+                if stat_key is None or not os.access(real, os.X_OK):
+                    continue
+                seen.add(real)
+                cached = old_interpreters.get(real)
+                if cached and cached.get("stat") == stat_key:
+                    new_interpreters[real] = cached
+                    if cached.get("version"):
+                        found.append(Interpreter(path, tuple(cached["version"])))
+                    continue
+                to_probe.append((len(found), path, real, stat_key))
+                found.append(Interpreter(path, ()))
+
+        if to_probe:
+            with ThreadPoolExecutor(max_workers=min(8, len(to_probe))) as pool:
+                versions = list(pool.map(lambda item: probe_version(Path(item[1])), to_probe))
+            for (position, path, real, stat_key), version in zip(to_probe, versions):
+                new_interpreters[real] = {"stat": stat_key, "version": list(version or ())}
+                found[position] = Interpreter(path, tuple(version or ()))
+
+        if new_dirs != old_dirs or new_interpreters != old_interpreters:
+            self._save_cache(
+                {"version": CACHE_VERSION, "dirs": new_dirs, "interpreters": new_interpreters}
+            )
+
+        self._interpreters = [interp for interp in found if interp.version]
+        return self._interpreters
+
+    def version_of(self, executable: str) -> Optional[Version]:
+        """
+        Version of one interpreter, probed once per stat signature.
+
+        Args:
+            executable: Path to the interpreter
+
+        Returns:
+            (major, minor, micro), or None if it is not a working interpreter
+        """
+        if executable == sys.executable:
+            return tuple(sys.version_info[:3])
+        real = os.path.realpath(executable)
+        stat_key = _stat_key(real)
+        if stat_key is None:
+            return None
+        cache = self._load_cache()
+        cached = cache["interpreters"].get(real)
+        if cached and cached.get("stat") == stat_key:
+            return tuple(cached["version"]) or None
+        version = probe_version(Path(executable))
+        cache["interpreters"][real] = {"stat": stat_key, "version": list(version or ())}
+        self._save_cache(cache)
+        return version
+
+    def find(self, requirement: str) -> Optional[Interpreter]:
+        """
+        Pick the interpreter that best satisfies a version requirement.
+
+        The running interpreter wins if it matches; otherwise the newest
+        matching version is chosen, preferring earlier search directories.
+
+        Args:
+            requirement: Bare version or requires-python style specifier
+
+        Returns:
+            Matching interpreter, or None
+        """
+        if parse_python_requirement(requirement) is None:
+            return None
+        matches = [i for i in self.discover() if version_matches(i.version, requirement)]
+        if not matches:
+            return None
+        if matches[0].path == sys.executable:
+            return matches[0]
+        return max(matches, key=lambda interp: interp.version)
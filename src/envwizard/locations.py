@@ -0,0 +1,29 @@
+"""Locations of envwizard's per-user data."""
+
+import os
+import sys
+from pathlib import Path
+
+# Overrides the per-user cache directory (useful for CI caches and tests)
+CACHE_DIR_ENV = "ENVWIZARD_CACHE_DIR"
+
+
+def user_cache_dir() -> Path:
+    """
+    Directory for caches shared by all projects of the current user.
+
+    Defaults to %LOCALAPPDATA%\\envwizard\\Cache on Windows,
+    ~/Library/Caches/envwizard on macOS and $XDG_CACHE_HOME/envwizard
+    (~/.cache/envwizard) elsewhere. ENVWIZARD_CACHE_DIR takes precedence.
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+        return Path(base) / "envwizard" / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "envwizard"
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "envwizard"
@@ -0,0 +1,196 @@
+"""A pip shared by virtual environments, unpacked once into the user cache."""
+
+import os
+import re
+import shutil
+import sys
+import zipfile
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from envwizard.interpreters import Version, parse_version, version_matches
+from envwizard.locations import user_cache_dir
+from envwizard.logger import get_logger
+from envwizard.venv_metadata import cfg_version, find_site_packages, read_pyvenv_cfg
+
+logger = get_logger(__name__)
+
+# Written into a venv's site-packages; points at the shared pip directory
+PTH_FILENAME = "_envwizard_pip.pth"
+
+_WHEEL_RE = re.compile(r"^pip-(\d+(?:\.\d+)*)-py3-none-any\.whl$")
+
+_LAUNCHER = """#!{python}
+import sys
+from pip._internal.cli.main import main
+if __name__ == "__main__":
+    sys.exit(main())
+"""
+
+
+def _bundled_wheels() -> List[Path]:
+    """pip wheels bundled with the running interpreter's ensurepip."""
+    try:
+        import ensurepip
+    except ImportError:
+        return []
+    bundled = Path(ensurepip.__file__).parent / "_bundled"
+    try:
+        return [bundled / name for name in os.listdir(bundled) if _WHEEL_RE.match(name)]
+    except OSError:
+        return []
+
+
+def _requires_python(wheel: Path) -> Optional[str]:
+    """The Requires-Python field of a wheel's METADATA."""
+    try:
+        with zipfile.ZipFile(wheel) as archive:
+            for name in archive.namelist():
+                if name.endswith(".dist-info/METADATA"):
+                    for line in archive.read(name).decode("utf-8", "replace").splitlines():
+                        if not line:
+                            break
+                        if line.lower().startswith("requires-python:"):
+                            return line.split(":", 1)[1].strip()
+    except (OSError, zipfile.BadZipFile):
+        pass
+    return None
+
+
+def _write_new(path: Path, content: str) -> None:
+    """Write a file as a new inode, never through a hardlink (see venv_templates)."""
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    path.write_text(content)
+
+
+class SharedPip:
+    """
+    One pinned pip, unpacked into the user cache and shared by many venvs.
+
+    Venvs are created without pip (skipping ensurepip, which unpacks pip into
+    every new environment) and get a ``.pth`` file that puts the shared copy
+    on their ``sys.path``, plus ``pip`` launchers on POSIX. The artifact is
+    the newest pip wheel found in the cache directory or bundled with the
+    running interpreter; each version is unpacked once into ``pip-<version>``
+    and never modified, so venvs linked to it need no ``pip install --upgrade
+    pip``. Dropping a newer ``pip-*.whl`` into the cache directory upgrades
+    venvs created afterwards.
+    """
+
+    DIRNAME = "pip"
+
+    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+        """
+        Initialize the shared pip.
+
+        Args:
+            cache_dir: User cache directory (default: user_cache_dir())
+        """
+        self.root = (cache_dir or user_cache_dir()) / self.DIRNAME
+
+    def wheels(self) -> List[Tuple[Version, Path]]:
+        """Available pip wheels, newest first."""
+        candidates = list(_bundled_wheels())
+        try:
+            candidates += [self.root / n for n in os.listdir(self.root) if _WHEEL_RE.match(n)]
+        except OSError:
+            pass
+        found = []
+        for wheel in candidates:
+            match = _WHEEL_RE.match(wheel.name)
+            version = parse_version(match.group(1)) if match else None
+            if version:
+                found.append((version, wheel))
+        return sorted(found, key=lambda item: item[0], reverse=True)
+
+    def ensure(self, python_version: Optional[Version] = None) -> Optional[Path]:
+        """
+        Get the shared pip directory, unpacking the wheel on first use.
+
+        Args:
+            python_version: Version of the interpreter that will run pip;
+                wheels whose Requires-Python excludes it are passed over
+
+        Returns:
+            Directory to put on sys.path, or None if no usable wheel exists
+        """
+        for version, wheel in self.wheels():
+            if python_version:
+                requires = _requires_python(wheel)
+                if requires and not version_matches(python_version, requires):
+                    continue
+            target = self.root / f"pip-{'.'.join(map(str, version))}"
+            if (target / "pip" / "__init__.py").exists():
+                return target
+            try:
+                self._unpack(wheel, target)
+                return target
+            except (OSError, zipfile.BadZipFile) as e:
+                logger.debug(f"Failed to unpack {wheel}: {e}")
+        return None
+
+    def _unpack(self, wheel: Path, target: Path) -> None:
+        """Extract a wheel next to target, then move it into place atomically."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{os.getpid()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        with zipfile.ZipFile(wheel) as archive:
+            archive.extractall(tmp)
+        try:
+            os.replace(tmp, target)
+        except OSError:
+            # Another process unpacked the same version first
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not (target / "pip" / "__init__.py").exists():
+                raise
+        logger.info(f"Unpacked shared pip into {target}")
+
+    def link(self, venv_path: Path) -> bool:
+        """
+        Make the shared pip importable in a venv created without pip.
+
+        Args:
+            venv_path: Virtual environment directory
+
+        Returns:
+            True if pip is now available in the venv
+        """
+        version = cfg_version(read_pyvenv_cfg(venv_path))
+        site_packages = find_site_packages(venv_path, version)
+        if site_packages is None:
+            return False
+        pip_dir = self.ensure(parse_version(version) if version else None)
+        if pip_dir is None:
+            return False
+
+        _write_new(site_packages / PTH_FILENAME, f"{pip_dir}\n")
+        if sys.platform != "win32":
+            python = venv_path / "bin" / "python"
+            launchers = ["pip", "pip3"]
+            if version:
+                launchers.append("pip" + ".".join(version.split(".")[:2]))
+            for name in launchers:
+                launcher = venv_path / "bin" / name
+                _write_new(launcher, _LAUNCHER.format(python=python))
+                launcher.chmod(0o755)
+        return True
+
+    @staticmethod
+    def linked_dir(venv_path: Path) -> Optional[Path]:
+        """
+        The shared pip directory a venv is linked to.
+
+        Returns:
+            The directory named by the venv's .pth file, or None if the venv
+            has its own pip
+        """
+        site_packages = find_site_packages(venv_path, cfg_version(read_pyvenv_cfg(venv_path)))
+        if site_packages is None:
+            return None
+        try:
+            return Path((site_packages / PTH_FILENAME).read_text().strip())
+        except OSError:
+            return None
@@ -0,0 +1,258 @@
+"""pip resolutions of dependency sets, kept per interpreter and platform in the user cache."""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from envwizard.detectors.framework_index import canonicalize_name
+from envwizard.detectors.lockfile import LockedRequirement, LockedSet
+from envwizard.install_plan import evaluate_marker
+from envwizard.locations import user_cache_dir
+from envwizard.logger import get_logger
+from envwizard.state import fingerprint
+
+logger = get_logger(__name__)
+
+# Bumped when the entry layout changes; older entries are ignored
+ENTRY_VERSION = 1
+
+_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*")
+
+
+class Resolution(NamedTuple):
+    """A cached resolution: the exact versions pip chose for a dependency set."""
+
+    key: str
+    # When pip resolved the set (seconds since the epoch)
+    created: float
+    pins: LockedSet
+    # Whether it was read from the cache rather than just resolved
+    cached: bool = False
+
+
+def _requirement_name(spec: str) -> Optional[str]:
+    """PEP 503 normalized name of a requirement string."""
+    match = _NAME_RE.match(spec.strip())
+    return canonicalize_name(match.group(0)) if match else None
+
+
+def _item_name(item: Dict[str, Any]) -> str:
+    """PEP 503 normalized name of a distribution in a pip report."""
+    return canonicalize_name((item.get("metadata") or {}).get("name") or "")
+
+
+def _normalize(spec: str) -> str:
+    """A requirement with its name PEP 503 normalized and whitespace removed."""
+    spec = re.sub(r"\s+", "", spec)
+    match = _NAME_RE.match(spec)
+    if not match:
+        return spec
+    return canonicalize_name(match.group(0)) + spec[match.end() :]
+
+
+def resolved_pins(report: Dict[str, Any]) -> Optional[Tuple[LockedRequirement, ...]]:
+    """
+    The versions a `pip install --dry-run --ignore-installed --report` resolved.
+
+    Returns:
+        One pin per distribution, or None if the report is not usable: some
+        distribution comes from a URL, a local path, VCS or is editable and
+        cannot be installed again by name and version
+    """
+    pins = []
+    for item in report.get("install") or []:
+        metadata = item.get("metadata") or {}
+        info = item.get("download_info") or {}
+        name, version = metadata.get("name"), metadata.get("version")
+        if item.get("is_direct") or "archive_info" not in info or not name or not version:
+            return None
+        # Requires-Dist, including extras and other interpreters: only the
+        # names in the set matter, for the order of installs
+        dependencies = []
+        for spec in metadata.get("requires_dist") or []:
+            match = _NAME_RE.match(spec.strip())
+            if match:
+                dependencies.append(canonicalize_name(match.group(0)))
+        pins.append(LockedRequirement(name, version, dependencies=tuple(dependencies)))
+    return tuple(pins)
+
+
+def report_is_complete(
+    report: Dict[str, Any], requirements: Iterable[str], environment: Dict[str, str]
+) -> bool:
+    """
+    Whether the report of a real `pip install --report` is a whole resolution.
+
+    pip reports only what it installs, so packages the venv already had
+    are missing from it. The report is complete when every requirement and
+    every dependency of a reported package that applies to the environment
+    (with the extras requested of it) is reported too. Markers that cannot
+    be evaluated count as incomplete.
+
+    Args:
+        report: Parsed report JSON
+        requirements: Requirement strings that were installed
+        environment: Marker environment of the interpreter (marker_environment())
+    """
+    installed = report.get("install") or []
+    names = {_item_name(item) for item in installed}
+    needed: List[Tuple[str, Tuple[str, ...]]] = [(spec, ()) for spec in requirements]
+    for item in installed:
+        extras = tuple(canonicalize_name(extra) for extra in item.get("requested_extras") or ())
+        requires_dist = (item.get("metadata") or {}).get("requires_dist") or []
+        needed += [(spec, extras) for spec in requires_dist]
+
+    for spec, extras in needed:
+        requirement, _, marker = spec.partition(";")
+        name = _requirement_name(requirement)
+        if name is None:
+            return False
+        if marker.strip():
+            applies = [
+                evaluate_marker(marker, dict(environment, extra=extra)) for extra in extras or ("",)
+            ]
+            if None in applies:
+                return False
+            if not any(applies):
+                continue
+        if name not in names:
+            return False
+    return True
+
+
+class ResolutionCache:
+    """
+    pip's resolutions of dependency sets, reused instead of resolving again.
+
+    An entry records the JSON of ``pip install --dry-run --ignore-installed
+    --report`` for a dependency set, or the report of an install that
+    resolved the whole set, keyed by the normalized requirements,
+    the pip options and the marker environment of the interpreter (Python
+    version, implementation and platform). Any change to those inputs gives
+    a different key, so stale entries are never used; they are simply no
+    longer looked up. A cached resolution is installed as an exact set with
+    ``--no-deps``, like a lockfile.
+    """
+
+    DIRNAME = "resolutions"
+
+    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+        """
+        Initialize the resolution cache.
+
+        Args:
+            cache_dir: User cache directory (default: user_cache_dir())
+        """
+        self.root = (cache_dir or user_cache_dir()) / self.DIRNAME
+
+    def key(
+        self, requirements: Sequence[str], options: Sequence[str], environment: Dict[str, str]
+    ) -> str:
+        """
+        Cache key of a dependency set resolved for an interpreter.
+
+        Args:
+            requirements: Requirement strings of the dependency file
+            options: pip options of the dependency file (index URLs, ...)
+            environment: Marker environment of the interpreter (marker_environment())
+        """
+        return fingerprint(
+            ENTRY_VERSION,
+            sorted({_normalize(spec) for spec in requirements}),
+            list(options),
+            environment,
+        )
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Resolution]:
+        """The resolution stored under a key, or None."""
+        try:
+            data = json.loads(self._entry_path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != ENTRY_VERSION:
+            return None
+        pins = resolved_pins(data.get("report") or {})
+        if pins is None:
+            return None
+        options = tuple(data.get("options") or ())
+        return Resolution(key, data.get("created", 0.0), LockedSet(pins, options), cached=True)
+
+    def store(
+        self,
+        key: str,
+        report_file: Path,
+        requirements: Sequence[str],
+        options: Sequence[str],
+        environment: Optional[Dict[str, str]] = None,
+    ) -> Optional[Resolution]:
+        """
+        Record the report of a resolution.
+
+        Args:
+            key: Key from key()
+            report_file: JSON written by `pip install --dry-run --report`,
+                or by a real install when environment is given
+            requirements: Requirement strings that were resolved
+            options: pip options of the resolution
+            environment: For the report of a real install, the marker
+                environment; the report is only stored if it is complete
+                (see report_is_complete())
+
+        Returns:
+            The stored resolution, or None if the report cannot be reused
+        """
+        try:
+            report = json.loads(report_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Unreadable pip report {report_file}: {e}")
+            return None
+        if environment is not None and isinstance(report.get("install"), list):
+            # The install may have upgraded pip too, which is not part of the set
+            requested = {_requirement_name(spec) for spec in requirements}
+            report["install"] = [
+                item
+                for item in report["install"]
+                if "pip" in requested or _item_name(item) != "pip"
+            ]
+        pins = resolved_pins(report)
+        if pins is None:
+            logger.debug("Resolution has direct URL or local requirements, not cached")
+            return None
+        if environment is not None and not report_is_complete(report, requirements, environment):
+            logger.debug("Install kept packages the venv already had, resolution not cached")
+            return None
+
+        created = time.time()
+        entry = {
+            "version": ENTRY_VERSION,
+            "created": created,
+            "requirements": sorted(requirements),
+            "options": list(options),
+            "report": report,
+        }
+        path = self._entry_path(key)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(entry), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug(f"Could not cache resolution {key}: {e}")
+            tmp.unlink(missing_ok=True)
+            return None
+        logger.info(f"Cached resolution of {len(pins)} packages")
+        return Resolution(key, created, LockedSet(pins, tuple(options)))
+
+    def remove(self, key: str) -> bool:
+        """Drop a resolution so that the next install resolves again."""
+        try:
+            self._entry_path(key).unlink()
+        except OSError:
+            return False
+        return True
@@ -0,0 +1,120 @@
+"""Per-project ledger of completed setup phases."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from envwizard.logger import get_logger
+
+logger = get_logger(__name__)
+
+STATE_FILENAME = "state.json"
+
+# Bump when fingerprints are computed differently
+STATE_VERSION = 1
+
+
+def fingerprint(*parts: Any) -> str:
+    """Hash JSON-serializable values into a short stable fingerprint."""
+    payload = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def file_digest(path: Path) -> Optional[str]:
+    """Digest of a file's content, or None if it cannot be read."""
+    try:
+        return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+    except OSError:
+        return None
+
+
+def stat_signature(path: Path) -> Optional[Dict[str, int]]:
+    """Identity of a file that changes whenever it is replaced or modified."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return {"ino": st.st_ino, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+class StateLedger:
+    """
+    Record of the setup phases envwizard completed for a project.
+
+    Each phase is stored with a fingerprint of its inputs. On the next run a
+    phase whose fingerprint is unchanged can be skipped; a phase whose inputs
+    changed is redone and recorded again. The ledger lives in
+    ``.envwizard/state.json`` and is written atomically.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Initialize the ledger (the file is read on first use).
+
+        Args:
+            path: Location of the state file
+        """
+        self.path = path
+        self._phases: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._phases is None:
+            self._phases = {}
+            try:
+                data = json.loads(self.path.read_text())
+                if isinstance(data, dict) and data.get("version") == STATE_VERSION:
+                    self._phases = dict(data.get("phases") or {})
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.debug(f"Ignoring unreadable state file {self.path}: {e}")
+        return self._phases
+
+    def get(self, phase: str) -> Optional[Dict[str, Any]]:
+        """Get the recorded entry of a phase."""
+        return self._load().get(phase)
+
+    def is_current(self, phase: str, fingerprint: Optional[str]) -> bool:
+        """Check whether a phase was completed with the same inputs."""
+        entry = self.get(phase)
+        return (
+            fingerprint is not None
+            and entry is not None
+            and entry.get("fingerprint") == fingerprint
+        )
+
+    def record(self, phase: str, fingerprint: str, **details: Any) -> None:
+        """Record a completed phase; written out by save()."""
+        self._load()[phase] = {"fingerprint": fingerprint, **details}
+
+    def forget(self, phase: str) -> None:
+        """Drop a phase so that it is redone next time."""
+        self._load().pop(phase, None)
+
+    def clear(self) -> None:
+        """Drop every phase."""
+        self._phases = {}
+
+    def save(self) -> bool:
+        """
+        Write the ledger to disk.
+
+        Returns:
+            True if the file was written
+        """
+        data = {"version": STATE_VERSION, "phases": self._load()}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Machine-specific state; keep it out of version control
+            ignore_file = self.path.parent / ".gitignore"
+            if not ignore_file.exists():
+                ignore_file.write_text("# Created by envwizard\n*\n")
+            tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True, default=str))
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            logger.debug(f"Failed to write state file {self.path}: {e}")
+            return False
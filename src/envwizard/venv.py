@@ -5,14 +5,57 @@ import platform
 import re
 import subprocess
 import sys
+import tempfile
+import threading
 import venv
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
-
+from typing import Callable, List, Optional, Tuple
+
+from envwizard.bytecode import CompileResult, compile_bytecode, source_roots
+from envwizard.detectors.lockfile import LOCKFILES
+from envwizard.detectors.manifest import parse_requirement
+from envwizard.install_history import InstallHistory, InstallTimer
+from envwizard.install_plan import (
+    InstallPlan,
+    install_stages,
+    marker_environment,
+    plan_install,
+    plan_locked_install,
+)
+from envwizard.interpreters import (
+    InterpreterRegistry,
+    Version,
+    parse_python_requirement,
+    parse_version,
+)
+from envwizard.locations import user_cache_dir
 from envwizard.logger import get_logger
+from envwizard.pip_cache import SharedPip
+from envwizard.resolution_cache import Resolution, ResolutionCache
+from envwizard.venv_metadata import (
+    cfg_version,
+    find_site_packages,
+    installed_distributions,
+    read_pyvenv_cfg,
+    read_venv_metadata,
+)
+from envwizard.venv_templates import TemplateStore
+from envwizard.wheel_cache import REPORT_MIN_PIP, WheelCache
+from envwizard.wheelhouse import wheelhouse_options
 
 logger = get_logger(__name__)
 
+# Lines of pip output kept for error messages
+OUTPUT_TAIL_LINES = 40
+
+# Concurrent pip workers for exact install sets (lockfiles, cached resolutions)
+DEFAULT_INSTALL_JOBS = min(4, os.cpu_count() or 1)
+
+# Exact sets smaller than this are installed by a single pip run
+PARALLEL_MIN_PACKAGES = 8
+
 
 def _validate_package_name(package: str) -> bool:
     """
@@ -38,6 +81,51 @@ def _validate_python_version(version: str) -> bool:
     return bool(re.match(pattern, version.strip()))
 
 
+def run_streamed(
+    command: List[str],
+    on_output: Optional[Callable[[str], None]] = None,
+    tail_lines: int = OUTPUT_TAIL_LINES,
+) -> Tuple[int, List[str]]:
+    """
+    Run a command, handing each line of its output to a callback as it arrives.
+
+    stdout and stderr are merged and only the last lines are kept, so memory
+    use does not grow with the length of the output.
+
+    Args:
+        command: Command to run (no shell)
+        on_output: Called with each non-empty output line
+        tail_lines: Number of trailing lines to keep
+
+    Returns:
+        Tuple of (return code, last output lines)
+    """
+    tail: deque = deque(maxlen=tail_lines)
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+    )
+    with process:
+        for line in process.stdout:  # type: ignore[union-attr]
+            line = line.rstrip()
+            if not line:
+                continue
+            tail.append(line)
+            if on_output is not None:
+                on_output(line)
+    return process.returncode, list(tail)
+
+
+def _temp_path(prefix: str, suffix: str) -> Path:
+    """Create an empty temporary file for pip to read or write."""
+    fd, name = tempfile.mkstemp(prefix=prefix, suffix=suffix)
+    os.close(fd)
+    return Path(name)
+
+
 class VirtualEnvManager:
     """Manage virtual environment creation and activation."""
 
@@ -45,22 +133,82 @@ class VirtualEnvManager:
         """Initialize virtual environment manager."""
         self.project_path = project_path or Path.cwd()
         self.system = platform.system()
+        self._interpreters: Optional[InterpreterRegistry] = None
+        self._shared_pip: Optional[SharedPip] = None
+        self._templates: Optional[TemplateStore] = None
+        self._install_history: Optional[InstallHistory] = None
+        self._wheel_cache: Optional[WheelCache] = None
+        self._resolution_cache: Optional[ResolutionCache] = None
+
+    @property
+    def interpreters(self) -> InterpreterRegistry:
+        """Registry of installed interpreters, shared through the user cache."""
+        if self._interpreters is None:
+            self._interpreters = InterpreterRegistry(user_cache_dir())
+        return self._interpreters
+
+    @property
+    def shared_pip(self) -> SharedPip:
+        """pip shared by venvs created with shared_pip=True."""
+        if self._shared_pip is None:
+            self._shared_pip = SharedPip(user_cache_dir())
+        return self._shared_pip
+
+    @property
+    def templates(self) -> TemplateStore:
+        """Bare venvs that new venvs are cloned from."""
+        if self._templates is None:
+            self._templates = TemplateStore(user_cache_dir(), self.interpreters)
+        return self._templates
+
+    @property
+    def install_history(self) -> InstallHistory:
+        """Per-package timings of past installs."""
+        if self._install_history is None:
+            self._install_history = InstallHistory(user_cache_dir())
+        return self._install_history
+
+    @property
+    def wheel_cache(self) -> WheelCache:
+        """Wheels built from sdists, shared through the user cache."""
+        if self._wheel_cache is None:
+            self._wheel_cache = WheelCache(user_cache_dir())
+        return self._wheel_cache
+
+    @property
+    def resolution_cache(self) -> ResolutionCache:
+        """pip resolutions of dependency sets, shared through the user cache."""
+        if self._resolution_cache is None:
+            self._resolution_cache = ResolutionCache(user_cache_dir())
+        return self._resolution_cache
 
     def create_venv(
-        self, venv_name: str = "venv", python_version: Optional[str] = None
+        self,
+        venv_name: str = "venv",
+        python_version: Optional[str] = None,
+        shared_pip: bool = False,
+        use_template: bool = False,
     ) -> Tuple[bool, str, Path]:
         """
         Create a virtual environment.
 
         Args:
             venv_name: Name of the virtual environment directory
-            python_version: Specific Python version to use (optional)
+            python_version: Python version ("3.11") or requires-python specifier
+                (">=3.9,<3.13") to use (optional)
+            shared_pip: Create the venv without pip and link the pip shared
+                through the user cache instead of running ensurepip
+            use_template: Clone the venv from a per-interpreter template in
+                the user cache, building the template on first use
 
         Returns:
             Tuple of (success, message, venv_path)
         """
         # Validate Python version to prevent command injection
-        if python_version and not _validate_python_version(python_version):
+        if python_version and not (
+            _validate_python_version(python_version)
+            or parse_python_requirement(python_version) is not None
+        ):
             logger.warning(f"Invalid Python version format rejected: {python_version}")
             return False, f"Invalid Python version format: {python_version}. Expected format: X.Y or X.Y.Z (e.g., 3.9, 3.11.2)", Path()
 
@@ -73,29 +221,79 @@ class VirtualEnvManager:
         logger.info(f"Creating virtual environment: {venv_path}")
         try:
             # If specific Python version requested, try to use it
+            python_executable = None
             if python_version:
                 python_executable = self._find_python_executable(python_version)
-                if python_executable:
-                    subprocess.run(
-                        [python_executable, "-m", "venv", str(venv_path)],
-                        check=True,
-                        capture_output=True,
-                    )
-                else:
+                if python_executable is None:
                     return (
                         False,
-                        f"Python {python_version} not found. Using system default.",
+                        f"No installed Python matches {python_version}",
                         venv_path,
                     )
-            else:
-                # Use standard library venv
-                venv.create(venv_path, with_pip=True, clear=False)
 
-            return True, f"Virtual environment created at {venv_path}", venv_path
+            method = None
+            if use_template and self.templates.enabled:
+                method = self._clone_template(venv_path, python_executable, shared_pip)
+            if method is None:
+                self._build_venv(venv_path, python_executable, shared_pip)
+                return True, f"Virtual environment created at {venv_path}", venv_path
+
+            return (
+                True,
+                f"Virtual environment created at {venv_path} (cloned from template via {method})",
+                venv_path,
+            )
 
         except Exception as e:
             return False, f"Failed to create virtual environment: {str(e)}", venv_path
 
+    def _build_venv(
+        self, venv_path: Path, python_executable: Optional[str], shared_pip: bool
+    ) -> None:
+        """Create a venv from scratch (raises on failure)."""
+        if python_executable and python_executable != sys.executable:
+            command = [python_executable, "-m", "venv", str(venv_path)]
+            if shared_pip:
+                command.insert(3, "--without-pip")
+            subprocess.run(command, check=True, capture_output=True)
+        else:
+            # The running interpreter qualifies: use standard library venv
+            venv.create(venv_path, with_pip=not shared_pip, clear=False)
+
+        if shared_pip and not self.shared_pip.link(venv_path):
+            logger.info("No shared pip available for this interpreter, running ensurepip")
+            python = str(self.get_python_executable(venv_path))
+            subprocess.run(
+                [python, "-m", "ensurepip", "--default-pip"],
+                check=True,
+                capture_output=True,
+            )
+
+    def _clone_template(
+        self, venv_path: Path, python_executable: Optional[str], shared_pip: bool
+    ) -> Optional[str]:
+        """
+        Create a venv by cloning the interpreter's template.
+
+        Returns:
+            The clone method used, or None if no template could be used
+        """
+        key = self.templates.key(
+            python_executable or sys.executable, "shared-pip" if shared_pip else "pip"
+        )
+        if key is None:
+            return None
+        template = self.templates.ensure(
+            key, lambda path: self._build_venv(path, python_executable, shared_pip)
+        )
+        if template is None:
+            return None
+        try:
+            return self.templates.clone(template, venv_path)
+        except OSError as e:
+            logger.debug(f"Failed to clone venv template {template}: {e}")
+            return None
+
     def get_activation_command(self, venv_path: Path) -> str:
         """Get the command to activate the virtual environment."""
         if self.system == "Windows":
@@ -121,51 +319,462 @@ class VirtualEnvManager:
             return venv_path / "bin" / "pip"
 
     def install_dependencies(
-        self, venv_path: Path, requirements_file: Optional[Path] = None
+        self,
+        venv_path: Path,
+        requirements_file: Optional[Path] = None,
+        on_output: Optional[Callable[[str], None]] = None,
+        jobs: Optional[int] = None,
+        precompile: Optional[str] = None,
+        wheelhouse: Optional[Path] = None,
     ) -> Tuple[bool, str]:
         """
         Install dependencies in the virtual environment.
 
+        Requirements the venv already satisfies (checked against its
+        installed metadata) are skipped; if all are, pip is not run at all.
+        Otherwise pip is upgraded and the missing requirements installed in
+        a single pip run, whose per-package timings are added to the install
+        history. Wheels that run builds from sdists are kept in the wheel
+        cache, which later installs use through --find-links.
+
+        Lockfiles (poetry.lock, Pipfile.lock) and fully pinned requirements
+        files are installed as the exact set they pin, with --no-deps so
+        that pip does not resolve; locks with hashes are hash-checked.
+        Other dependency files are installed from the resolution cache the
+        same way when it has their resolution for this interpreter and
+        platform (see resolve_dependencies()); otherwise pip resolves while
+        installing and the report of that install is cached, when it holds
+        the whole resolution. Large exact sets are
+        split by their dependency graph into stages of independent batches
+        (see install_stages()), each batch installed by its own pip worker,
+        and the venv is checked afterwards for every pinned version.
+
         Args:
             venv_path: Path to virtual environment
-            requirements_file: Path to requirements file (optional)
+            requirements_file: Requirements file, manifest or lockfile (optional)
+            on_output: Called with each line of pip's output as it arrives
+            jobs: Concurrent pip workers for exact sets (default: DEFAULT_INSTALL_JOBS)
+            precompile: Install with --no-compile and then byte-compile the
+                venv and the project's sources with this invalidation mode
+                (see compile_venv()); None lets pip compile as it installs
+            wheelhouse: Install only from this directory of wheels, without
+                any index (see build_wheelhouse()); pip is not upgraded
 
         Returns:
-            Tuple of (success, message)
+            Tuple of (success, message); on failure the message ends with
+            the last lines of pip's output
         """
-        pip_exe = self.get_pip_executable(venv_path)
+        pip = self._pip_command(venv_path)
 
-        if not pip_exe.exists():
+        if pip is None:
             return False, "pip not found in virtual environment"
 
+        if not requirements_file or not requirements_file.exists():
+            return True, "No requirements file found, skipping dependency installation"
+
+        if jobs is None:
+            jobs = DEFAULT_INSTALL_JOBS
+
+        plan = plan_install(venv_path, requirements_file)
+        manifest_name = LOCKFILES.get(requirements_file.name)
+        if plan is None and manifest_name and (requirements_file.parent / manifest_name).exists():
+            # A lock with VCS, path or URL sources: install from the manifest
+            requirements_file = requirements_file.parent / manifest_name
+            plan = plan_install(venv_path, requirements_file)
+        if plan is not None and plan.up_to_date:
+            return True, f"Requirements already satisfied ({len(plan.satisfied)} packages)"
+        offline = wheelhouse_options(wheelhouse) if wheelhouse is not None else []
+        if plan is not None and offline:
+            # Part of the plan's options, so resolving is offline too
+            plan = plan._replace(options=plan.options + offline)
+
+        timer = InstallTimer(on_output)
+        resolution = None
+        # Set when the install's own report is to be cached as the resolution
+        resolution_key = None
+        if plan is not None and not plan.locked:
+            resolution_key, message = self._resolution_key(venv_path, plan)
+            if resolution_key is not None:
+                resolution = self.resolution_cache.get(resolution_key)
+                if resolution is None:
+                    message = "No cached resolution, pip resolves while installing"
+                else:
+                    resolution_key = None
+                    count = len(resolution.pins.requirements)
+                    message = f"Using the cached resolution of {count} packages"
+            logger.debug(message)
+            resolved_plan = None
+            if resolution is not None:
+                resolved_plan = plan_locked_install(venv_path, resolution.pins)
+            if resolved_plan is None:
+                resolution = None
+            elif resolved_plan.up_to_date:
+                count = len(resolved_plan.satisfied)
+                return True, f"Requirements already satisfied ({count} packages)"
+            else:
+                plan = resolved_plan
+
+        # A shared pip is pinned and already current; offline, pip is
+        # rarely in the wheelhouse
+        upgrade_pip = SharedPip.linked_dir(venv_path) is None and wheelhouse is None
+        # Stages run one after another; the commands of a stage concurrently
+        stages: List[List[List[str]]] = []
+        report_files: List[Path] = []
+        temp_files: List[Path] = []
+        parallel = False
+        # Compiled afterwards across all cores instead
+        no_compile = ["--no-compile"] if precompile is not None else []
+        if plan is None:
+            # Not plannable (hashes, setup.py, ...): pip reads the file itself,
+            # and hash-checking mode does not allow adding pip to the same run
+            if requirements_file.suffix == ".txt":
+                target = ["-r", str(requirements_file)]
+            elif requirements_file.name in ("setup.py", "pyproject.toml"):
+                target = ["-e", str(requirements_file.parent)]
+            else:
+                return False, f"Cannot install dependencies from {requirements_file.name}"
+            if upgrade_pip:
+                stages.append([pip + ["install", "--upgrade", "pip"]])
+            stages.append([pip + ["install"] + no_compile + offline + target])
+        else:
+            extra = ["--upgrade", "pip"] if upgrade_pip else []
+            batch_stages = [[plan.pending]]
+            if (
+                plan.locked
+                and jobs > 1
+                and len(plan.pending) >= PARALLEL_MIN_PACKAGES
+                and not any(spec.partition("==")[0].lower() == "pip" for spec in plan.pending)
+            ):
+                batch_stages = install_stages(plan, jobs)
+                parallel = len(batch_stages) > 1 or len(batch_stages[0]) > 1
+            if extra and (plan.hashes is not None or parallel):
+                # Hash checking covers the whole run, pip included, and
+                # workers must not replace the pip the others are running
+                stages.append([pip + ["install"] + extra])
+                extra = []
+            if plan.locked:
+                # The lock is the complete install set, so pip need not resolve
+                extra.append("--no-deps")
+            extra += no_compile
+            find_links = self.wheel_cache.find_links()
+            if find_links is not None:
+                extra += ["--find-links", str(find_links)]
+            pip_version = self._pip_version(venv_path)
+            # The report names the sdists pip built, with their hashes
+            report = pip_version is not None and pip_version >= REPORT_MIN_PIP
+
+            for batches in batch_stages:
+                stage = []
+                for batch in batches:
+                    targets = batch
+                    if plan.hashes is not None:
+                        # Hashes can only be given in a requirements file
+                        locked_file = _temp_path("envwizard-locked-", ".txt")
+                        temp_files.append(locked_file)
+                        locked_file.write_text(
+                            "".join(
+                                " ".join([spec] + [f"--hash={h}" for h in plan.hashes[spec]]) + "\n"
+                                for spec in batch
+                            )
+                        )
+                        targets = ["-r", str(locked_file)]
+                    options = list(extra)
+                    if report:
+                        report_file = _temp_path("envwizard-report-", ".json")
+                        temp_files.append(report_file)
+                        report_files.append(report_file)
+                        options += ["--report", str(report_file)]
+                    stage.append(pip + ["install"] + options + plan.options + targets)
+                stages.append(stage)
+
         try:
-            # Upgrade pip first
-            subprocess.run(
-                [str(pip_exe), "install", "--upgrade", "pip"],
-                check=True,
-                capture_output=True,
-                text=True,
+            for stage in stages:
+                if len(stage) == 1:
+                    returncode, tail = run_streamed(stage[0], timer.feed)
+                else:
+                    returncode, tail = self._run_workers(stage, timer)
+                if returncode != 0:
+                    break
+            if returncode == 0 and parallel:
+                # The workers share one site-packages: check that every pin landed
+                if resolution is not None:
+                    check = plan_locked_install(venv_path, resolution.pins)
+                else:
+                    check = plan_install(venv_path, requirements_file)
+                missing = [spec for spec in (check.pending if check else []) if ";" not in spec]
+                if missing:
+                    returncode = 1
+                    tail = [f"Not installed by the parallel install: {', '.join(missing)}"]
+            if returncode == 0 and plan is not None:
+                for report_file in report_files:
+                    self.wheel_cache.add_builds(
+                        report_file, timer.built_wheels(), pip, plan.options
+                    )
+                if resolution_key is not None and len(report_files) == 1:
+                    # pip resolved as it installed: later installs reuse it
+                    self.resolution_cache.store(
+                        resolution_key,
+                        report_files[0],
+                        plan.pending + plan.satisfied,
+                        plan.options,
+                        marker_environment(cfg_version(read_pyvenv_cfg(venv_path))),
+                    )
+        except Exception as e:
+            return False, f"Error during installation: {str(e)}"
+        finally:
+            for path in temp_files:
+                path.unlink(missing_ok=True)
+
+        compiled = None
+        if returncode == 0 and precompile is not None:
+            compiled = self.compile_venv(venv_path, precompile)
+        timings = {"compile_seconds": round(compiled.seconds, 3)} if compiled else {}
+        self.install_history.append(
+            timer.record(
+                returncode,
+                project=str(self.project_path),
+                requirements=requirements_file.name,
+                python=cfg_version(read_pyvenv_cfg(venv_path)),
+                **timings,
+            )
+        )
+        if returncode != 0:
+            if resolution is not None and resolution.cached:
+                # e.g. a pinned release was yanked: resolve again next time
+                self.resolution_cache.remove(resolution.key)
+            output = "\n".join(tail)
+            return False, f"Failed to install dependencies: {output}"
+
+        if plan is not None and resolution is not None:
+            message = (
+                f"Dependencies installed from a cached resolution ({len(plan.pending)} installed, "
+                f"{len(plan.satisfied)} already satisfied)"
+            )
+        elif plan is not None and plan.locked:
+            message = (
+                f"Locked dependencies installed from {requirements_file.name} without resolving "
+                f"({len(plan.pending)} installed, {len(plan.satisfied)} already satisfied)"
+            )
+        elif plan is not None and plan.satisfied:
+            message = (
+                f"Dependencies installed successfully ({len(plan.pending)} installed, "
+                f"{len(plan.satisfied)} already satisfied)"
             )
+        else:
+            message = "Dependencies installed successfully"
+        if compiled is not None:
+            message += f"; byte-compiled in {compiled.seconds:.1f}s ({precompile})"
+        return True, message
 
-            if requirements_file and requirements_file.exists():
-                # Install from requirements file
-                result = subprocess.run(
-                    [str(pip_exe), "install", "-r", str(requirements_file)],
-                    capture_output=True,
-                    text=True,
-                )
+    def compile_venv(self, venv_path: Path, invalidation_mode: str = "timestamp") -> CompileResult:
+        """
+        Byte-compile a venv's site-packages and the project's own sources.
 
-                if result.returncode == 0:
-                    return True, "Dependencies installed successfully"
-                else:
-                    return False, f"Failed to install dependencies: {result.stderr}"
-            else:
-                return True, "No requirements file found, skipping dependency installation"
+        Compiling runs in the venv's interpreter with one worker process per
+        CPU, so that first imports do not have to write bytecode.
 
-        except subprocess.CalledProcessError as e:
-            return False, f"Failed to install dependencies: {str(e)}"
+        Args:
+            venv_path: Virtual environment
+            invalidation_mode: "timestamp", "checked-hash" or "unchecked-hash"
+
+        Returns:
+            The result, with the elapsed time
+        """
+        site_packages = find_site_packages(venv_path, cfg_version(read_pyvenv_cfg(venv_path)))
+        return compile_bytecode(
+            str(self.get_python_executable(venv_path)),
+            [site_packages] if site_packages is not None else [],
+            source_roots(self.project_path),
+            invalidation_mode,
+        )
+
+    def _run_workers(self, commands: List[List[str]], timer: InstallTimer) -> Tuple[int, List[str]]:
+        """
+        Run pip commands concurrently, each timed on its own.
+
+        Returns:
+            The exit status and output tail of the first failed command, or
+            of the last command if all succeeded
+        """
+        lock = threading.Lock()
+
+        def show(line: str) -> None:
+            with lock:
+                if timer.on_output is not None:
+                    timer.on_output(line)
+
+        timers = [InstallTimer(show) for _ in commands]
+        with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+            results = list(executor.map(run_streamed, commands, [t.feed for t in timers]))
+        for worker in timers:
+            timer.merge(worker)
+        for returncode, tail in results:
+            if returncode != 0:
+                return returncode, tail
+        return results[-1]
+
+    def resolve_dependencies(
+        self,
+        venv_path: Path,
+        requirements_file: Path,
+        refresh: bool = False,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[Optional[Resolution], str]:
+        """
+        Resolve a dependency file to exact versions for a venv's interpreter.
+
+        The resolution comes from the resolution cache when the normalized
+        requirements, pip options, interpreter and platform match an earlier
+        one; otherwise pip resolves it with `pip install --dry-run
+        --ignore-installed --report` and the report is cached.
+
+        Args:
+            venv_path: Virtual environment whose interpreter and pip are used
+            requirements_file: Requirements file or manifest
+            refresh: Resolve again even if a cached resolution exists
+            on_output: Called with each line of pip's output as it arrives
+
+        Returns:
+            Tuple of (resolution, message); the resolution is None if the
+            file cannot be resolved ahead of installing it (lockfiles,
+            editables, URLs, pip before 22.2) or resolving failed
+        """
+        pip = self._pip_command(venv_path)
+        if pip is None:
+            return None, "pip not found in virtual environment"
+        plan = plan_install(venv_path, requirements_file)
+        if plan is None:
+            return None, f"Cannot resolve {requirements_file.name} ahead of installing it"
+        if plan.locked:
+            return None, f"{requirements_file.name} already pins an exact set of packages"
+        return self._resolve(venv_path, pip, plan, refresh, on_output)
+
+    def _resolution_key(self, venv_path: Path, plan: InstallPlan) -> Tuple[Optional[str], str]:
+        """
+        Resolution cache key of an unlocked plan.
+
+        Returns:
+            Tuple of (key, message); the key is None, with the reason, if
+            the plan's requirements cannot be resolved ahead
+        """
+        requirements = plan.pending + plan.satisfied
+        if any(parse_requirement(spec, "") is None or "@" in spec for spec in requirements):
+            return None, "Direct URL, path and editable requirements are not resolved ahead"
+        pip_version = self._pip_version(venv_path)
+        if pip_version is None or pip_version < REPORT_MIN_PIP:
+            return None, "Resolving ahead needs pip 22.2 or newer"
+        environment = marker_environment(cfg_version(read_pyvenv_cfg(venv_path)))
+        key = self.resolution_cache.key(requirements, plan.options, environment)
+        return key, "Resolvable ahead"
+
+    def _resolve(
+        self,
+        venv_path: Path,
+        pip: List[str],
+        plan: InstallPlan,
+        refresh: bool = False,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[Optional[Resolution], str]:
+        """Resolve the requirements of an unlocked plan, from the cache when possible."""
+        key, message = self._resolution_key(venv_path, plan)
+        if key is None:
+            return None, message
+        requirements = plan.pending + plan.satisfied
+        if refresh:
+            self.resolution_cache.remove(key)
+        else:
+            cached = self.resolution_cache.get(key)
+            if cached is not None:
+                count = len(cached.pins.requirements)
+                return cached, f"Using the cached resolution of {count} packages"
+
+        report_file = _temp_path("envwizard-resolution-", ".json")
+        command = pip + ["install", "--dry-run", "--ignore-installed", "--report", str(report_file)]
+        find_links = self.wheel_cache.find_links()
+        if find_links is not None:
+            command += ["--find-links", str(find_links)]
+        try:
+            returncode, tail = run_streamed(command + plan.options + requirements, on_output)
+            if returncode != 0:
+                output = "\n".join(tail)
+                return None, f"Failed to resolve dependencies: {output}"
+            resolution = self.resolution_cache.store(key, report_file, requirements, plan.options)
+        except OSError as e:
+            return None, f"Error during resolution: {str(e)}"
+        finally:
+            report_file.unlink(missing_ok=True)
+        if resolution is None:
+            return None, "pip's resolution cannot be reused by version"
+        return resolution, f"Resolved {len(resolution.pins.requirements)} packages"
+
+    def build_wheelhouse(
+        self,
+        venv_path: Path,
+        requirements_file: Path,
+        directory: Path,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[bool, str]:
+        """
+        Collect wheels for the whole dependency set of a file into a directory.
+
+        Lockfiles and resolvable dependency files (see resolve_dependencies())
+        are collected as their exact set with `pip wheel --no-deps`, so the
+        wheelhouse holds one wheel per pinned package, sdists built. Other
+        files are left to pip's resolver. `install_dependencies(...,
+        wheelhouse=directory)` then installs without any index.
+
+        Args:
+            venv_path: Virtual environment whose interpreter and pip are used
+            requirements_file: Requirements file, manifest or lockfile
+            directory: Wheelhouse directory, created if missing
+            on_output: Called with each line of pip's output as it arrives
+
+        Returns:
+            Tuple of (success, message); on failure the message ends with
+            the last lines of pip's output
+        """
+        pip = self._pip_command(venv_path)
+        if pip is None:
+            return False, "pip not found in virtual environment"
+        if not requirements_file.exists():
+            return False, f"{requirements_file.name} not found"
+
+        plan = plan_install(venv_path, requirements_file)
+        manifest_name = LOCKFILES.get(requirements_file.name)
+        if plan is None and manifest_name and (requirements_file.parent / manifest_name).exists():
+            requirements_file = requirements_file.parent / manifest_name
+            plan = plan_install(venv_path, requirements_file)
+        if plan is not None and not plan.locked:
+            resolution, message = self._resolve(venv_path, pip, plan, on_output=on_output)
+            logger.debug(message)
+            plan = None
+            if resolution is not None:
+                plan = plan_locked_install(venv_path, resolution.pins)
+
+        command = pip + ["wheel", "--wheel-dir", str(directory)]
+        find_links = self.wheel_cache.find_links()
+        if find_links is not None:
+            command += ["--find-links", str(find_links)]
+        if plan is not None:
+            # Installed packages count too: the wheelhouse is for other venvs
+            command += ["--no-deps"] + plan.options + plan.pending + plan.satisfied
+        elif requirements_file.suffix == ".txt":
+            command += ["-r", str(requirements_file)]
+        elif requirements_file.name in ("setup.py", "pyproject.toml"):
+            command += [str(requirements_file.parent)]
+        else:
+            return False, f"Cannot collect wheels for {requirements_file.name}"
+
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            returncode, tail = run_streamed(command, on_output)
         except Exception as e:
-            return False, f"Error during installation: {str(e)}"
+            return False, f"Error while collecting wheels: {str(e)}"
+        if returncode != 0:
+            output = "\n".join(tail)
+            return False, f"Failed to collect wheels: {output}"
+        count = sum(1 for name in os.listdir(directory) if name.endswith(".whl"))
+        return True, f"Collected {count} wheels in {directory}"
 
     def install_package(self, venv_path: Path, package: str) -> Tuple[bool, str]:
         """Install a single package in the virtual environment."""
@@ -176,14 +785,14 @@ class VirtualEnvManager:
 
         logger.info(f"Installing package: {package}")
 
-        pip_exe = self.get_pip_executable(venv_path)
+        pip = self._pip_command(venv_path)
 
-        if not pip_exe.exists():
+        if pip is None:
             return False, "pip not found in virtual environment"
 
         try:
             result = subprocess.run(
-                [str(pip_exe), "install", package],
+                pip + ["install", package],
                 capture_output=True,
                 text=True,
                 check=True,
@@ -192,31 +801,37 @@ class VirtualEnvManager:
         except subprocess.CalledProcessError as e:
             return False, f"Failed to install {package}: {e.stderr}"
 
+    def _pip_version(self, venv_path: Path) -> Optional[Version]:
+        """Version of the pip a venv runs, read from its metadata."""
+        shared_dir = SharedPip.linked_dir(venv_path)
+        if shared_dir is not None:
+            return parse_version(shared_dir.name[len("pip-") :])
+        site_packages = find_site_packages(venv_path, cfg_version(read_pyvenv_cfg(venv_path)))
+        if site_packages is None:
+            return None
+        version = installed_distributions(site_packages).get("pip")
+        return parse_version(version) if version else None
+
+    def _pip_command(self, venv_path: Path) -> Optional[List[str]]:
+        """Command that runs pip in a venv, or None if the venv has no pip."""
+        shared_dir = SharedPip.linked_dir(venv_path)
+        if shared_dir is not None:
+            # Re-link if the cached copy was removed since
+            if not shared_dir.is_dir() and not self.shared_pip.link(venv_path):
+                return None
+        elif not self.get_pip_executable(venv_path).exists():
+            return None
+        # Through the interpreter, so that pip can upgrade itself on Windows too
+        return [str(self.get_python_executable(venv_path)), "-m", "pip"]
+
     def _find_python_executable(self, version: str) -> Optional[str]:
-        """Find Python executable for a specific version."""
-        # Common patterns to try
-        patterns = [
-            f"python{version}",
-            f"python{version.split('.')[0]}.{version.split('.')[1]}",
-            f"python{version.split('.')[0]}",
-            "python3",
-            "python",
-        ]
-
-        for pattern in patterns:
-            try:
-                result = subprocess.run(
-                    [pattern, "--version"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                )
-                if result.returncode == 0:
-                    return pattern
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                continue
+        """
+        Find a Python executable satisfying a version or requires-python specifier.
 
-        return None
+        Only interpreters whose version actually matches are returned.
+        """
+        interpreter = self.interpreters.find(version)
+        return interpreter.path if interpreter else None
 
     def _is_powershell(self) -> bool:
         """Check if running in PowerShell."""
@@ -224,8 +839,17 @@ class VirtualEnvManager:
             "PSModulePath"
         ) is not None
 
-    def get_venv_info(self, venv_path: Path) -> dict:
-        """Get information about an existing virtual environment."""
+    def get_venv_info(self, venv_path: Path, measure_size: bool = False) -> dict:
+        """
+        Get information about an existing virtual environment.
+
+        Everything is read from pyvenv.cfg and site-packages; the venv's
+        interpreter is never started.
+
+        Args:
+            venv_path: Virtual environment directory
+            measure_size: Also report the size of site-packages in bytes
+        """
         if not venv_path.exists():
             return {"exists": False}
 
@@ -237,18 +861,20 @@ class VirtualEnvManager:
             "activation_command": self.get_activation_command(venv_path),
         }
 
-        # Try to get Python version
-        if python_exe.exists():
-            try:
-                result = subprocess.run(
-                    [str(python_exe), "--version"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                )
-                if result.returncode == 0:
-                    info["python_version"] = result.stdout.strip()
-            except Exception:
-                pass
+        metadata = read_venv_metadata(venv_path, measure_size=measure_size)
+        if metadata is not None:
+            if metadata.version:
+                # Same format as `python --version`
+                info["python_version"] = f"Python {metadata.version}"
+            info.update(
+                version=metadata.version,
+                home=metadata.home,
+                include_system_site_packages=metadata.include_system_site_packages,
+                site_packages=metadata.site_packages,
+                package_count=metadata.package_count,
+                interpreter_alive=metadata.interpreter_alive,
+            )
+            if measure_size:
+                info["size_bytes"] = metadata.size_bytes
 
         return info
@@ -0,0 +1,226 @@
+"""Virtual environment metadata read from disk, without running Python."""
+
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from envwizard.detectors.framework_index import canonicalize_name
+
+# "3.11.7", "3.11.7.final.0" (virtualenv) -> "3.11.7"
+_VERSION_RE = re.compile(r"^\d+\.\d+(?:\.\d+)?")
+
+
+class VenvMetadata(NamedTuple):
+    """What a virtual environment's files say about it."""
+
+    path: str
+    # Python version from pyvenv.cfg, e.g. "3.11.7"
+    version: Optional[str]
+    # Directory of the base interpreter
+    home: Optional[str]
+    include_system_site_packages: bool
+    python_executable: str
+    site_packages: Optional[str]
+    # Installed distributions (.dist-info and .egg-info entries)
+    package_count: int
+    # Whether the venv interpreter and its base installation still exist
+    interpreter_alive: bool
+    # Total size of site-packages in bytes (only when requested)
+    size_bytes: Optional[int] = None
+
+
+def read_pyvenv_cfg(venv_path: Path) -> Dict[str, str]:
+    """
+    Parse a venv's pyvenv.cfg.
+
+    Args:
+        venv_path: Virtual environment directory
+
+    Returns:
+        Keys (lower-cased) and values; empty if the file is missing
+    """
+    values: Dict[str, str] = {}
+    try:
+        content = (venv_path / "pyvenv.cfg").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return values
+    for line in content.splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            values[key.strip().lower()] = value.strip()
+    return values
+
+
+def cfg_version(cfg: Dict[str, str]) -> Optional[str]:
+    """The Python version recorded in parsed pyvenv.cfg values."""
+    for key in ("version", "version_info"):
+        match = _VERSION_RE.match(cfg.get(key, ""))
+        if match:
+            return match.group(0)
+    return None
+
+
+def venv_python(venv_path: Path) -> Path:
+    """Path of a venv's interpreter on this platform."""
+    if sys.platform == "win32":
+        return venv_path / "Scripts" / "python.exe"
+    return venv_path / "bin" / "python"
+
+
+def find_site_packages(venv_path: Path, version: Optional[str] = None) -> Optional[Path]:
+    """
+    Locate a venv's site-packages directory.
+
+    Args:
+        venv_path: Virtual environment directory
+        version: Python version, to go straight to lib/pythonX.Y
+
+    Returns:
+        The directory, or None if there is none
+    """
+    if sys.platform == "win32":
+        candidate = venv_path / "Lib" / "site-packages"
+        return candidate if candidate.is_dir() else None
+
+    if version:
+        major_minor = ".".join(version.split(".")[:2])
+        candidate = venv_path / "lib" / f"python{major_minor}" / "site-packages"
+        if candidate.is_dir():
+            return candidate
+
+    # Unknown version or a free-threaded build (lib/python3.13t)
+    try:
+        with os.scandir(venv_path / "lib") as it:
+            for entry in sorted(it, key=lambda e: e.name):
+                candidate = Path(entry.path) / "site-packages"
+                if entry.name.startswith("python") and candidate.is_dir():
+                    return candidate
+    except OSError:
+        pass
+    return None
+
+
+def _count_packages(site_packages: Path) -> int:
+    count = 0
+    try:
+        with os.scandir(site_packages) as it:
+            for entry in it:
+                if entry.name.endswith((".dist-info", ".egg-info")):
+                    count += 1
+    except OSError:
+        pass
+    return count
+
+
+def _metadata_fields(path: str, fields: Tuple[str, ...]) -> Dict[str, str]:
+    """Read header fields of a METADATA/PKG-INFO file (stops at the body)."""
+    found: Dict[str, str] = {}
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.strip():
+                    break
+                key, sep, value = line.partition(":")
+                if sep and key.lower() in fields and key.lower() not in found:
+                    found[key.lower()] = value.strip()
+                    if len(found) == len(fields):
+                        break
+    except OSError:
+        pass
+    return found
+
+
+def installed_distributions(site_packages: Path) -> Dict[str, str]:
+    """
+    Installed distributions of a site-packages directory.
+
+    Reads Name and Version from each ``*.dist-info/METADATA`` (and
+    ``*.egg-info/PKG-INFO``) header; nothing is imported or run.
+
+    Args:
+        site_packages: site-packages directory
+
+    Returns:
+        Version by PEP 503 normalized name
+    """
+    distributions: Dict[str, str] = {}
+    try:
+        with os.scandir(site_packages) as it:
+            entries = [e for e in it if e.name.endswith((".dist-info", ".egg-info"))]
+    except OSError:
+        return distributions
+    for entry in entries:
+        if entry.name.endswith(".dist-info"):
+            metadata = os.path.join(entry.path, "METADATA")
+        elif entry.is_dir():
+            metadata = os.path.join(entry.path, "PKG-INFO")
+        else:
+            # Old-style single-file egg-info
+            metadata = entry.path
+        fields = _metadata_fields(metadata, ("name", "version"))
+        if "name" in fields and "version" in fields:
+            name = canonicalize_name(fields["name"])
+            distributions[name] = fields["version"]
+    return distributions
+
+
+def _tree_size(root: Path) -> int:
+    total = 0
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def read_venv_metadata(venv_path: Path, measure_size: bool = False) -> Optional[VenvMetadata]:
+    """
+    Describe a virtual environment from its files alone.
+
+    Reads pyvenv.cfg and lists site-packages; no interpreter is started, so
+    this is cheap enough to run over many environments.
+
+    Args:
+        venv_path: Virtual environment directory
+        measure_size: Also add up the size of site-packages (walks every file)
+
+    Returns:
+        Metadata, or None if the directory is not a virtual environment
+    """
+    cfg = read_pyvenv_cfg(venv_path)
+    if not cfg:
+        return None
+
+    version = cfg_version(cfg)
+    home = cfg.get("home") or None
+    python = venv_python(venv_path)
+    site_packages = find_site_packages(venv_path, version)
+
+    # exists() follows symlinks, so a venv whose base Python was removed is dead
+    alive = python.exists() and (home is None or os.path.isdir(home))
+
+    return VenvMetadata(
+        path=str(venv_path),
+        version=version,
+        home=home,
+        include_system_site_packages=(
+            cfg.get("include-system-site-packages", "false").lower() == "true"
+        ),
+        python_executable=str(python),
+        site_packages=str(site_packages) if site_packages else None,
+        package_count=_count_packages(site_packages) if site_packages else 0,
+        interpreter_alive=alive,
+        size_bytes=_tree_size(site_packages) if measure_size and site_packages else None,
+    )
@@ -0,0 +1,271 @@
+"""Bare virtual environments built once per interpreter and cloned into projects."""
+
+import errno
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from envwizard.interpreters import InterpreterRegistry
+from envwizard.locations import user_cache_dir
+from envwizard.logger import get_logger
+from envwizard.state import fingerprint, stat_signature
+
+logger = get_logger(__name__)
+
+# ioctl request that shares a file's extents with another (Linux btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# Clone methods, fastest first
+CLONE_METHODS = ("reflink", "hardlink", "copy")
+
+# Name of the venv inside a template directory; venv bakes it into the prompt
+_TEMPLATE_NAME = "venv"
+_COMPLETE_MARKER = "complete"
+
+# A template directory without its marker older than this is an abandoned build
+_STALE_BUILD_SECONDS = 600
+
+# Errors meaning "this method does not work here", as opposed to a broken file
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EACCES,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.EMLINK,
+    getattr(errno, "EOPNOTSUPP", errno.EINVAL),
+    getattr(errno, "ENOTSUP", errno.EINVAL),
+}
+
+
+def _reflink(src: str, dst: str) -> None:
+    """Copy-on-write clone of a file (Linux only)."""
+    import fcntl
+
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        try:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        except OSError:
+            target.close()
+            os.unlink(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def _hardlink(src: str, dst: str) -> None:
+    os.link(src, dst)
+
+
+def _copy(src: str, dst: str) -> None:
+    shutil.copy2(src, dst)
+
+
+_CLONERS = {"reflink": _reflink, "hardlink": _hardlink, "copy": _copy}
+
+
+class TreeCloner:
+    """
+    Clone a directory tree, falling back from reflinks to hardlinks to copies.
+
+    The first method that works is used for the rest of the tree; methods
+    that failed are remembered so the result can say why a slower one was
+    used.
+    """
+
+    def __init__(self, methods: Optional[List[str]] = None) -> None:
+        """
+        Initialize the cloner.
+
+        Args:
+            methods: Methods to try in order (default: CLONE_METHODS); reflink
+                is only tried on Linux
+        """
+        self.methods = [
+            m for m in (methods or CLONE_METHODS) if m != "reflink" or sys.platform == "linux"
+        ]
+        self.unsupported: List[str] = []
+
+    @property
+    def method(self) -> str:
+        """The method currently in use."""
+        return self.methods[0]
+
+    def clone_file(self, src: str, dst: str) -> None:
+        """Clone one file with the fastest method that works."""
+        while True:
+            try:
+                _CLONERS[self.method](src, dst)
+                return
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS or len(self.methods) == 1:
+                    raise
+                logger.debug(f"{self.method} failed for {src} ({e}), falling back")
+                self.unsupported.append(self.methods.pop(0))
+
+    def describe(self) -> str:
+        """How the tree was cloned, e.g. "hardlink; reflink unsupported"."""
+        if not self.unsupported:
+            return self.method
+        return f"{self.method}; {', '.join(self.unsupported)} unsupported"
+
+
+class TemplateStore:
+    """
+    Bare venvs (interpreter plus pip) kept in the user cache, one per interpreter.
+
+    A template is built once with the regular venv machinery, in the
+    location it is kept at. New venvs are clones: files are reflinked,
+    hardlinked or copied, while pyvenv.cfg and the scripts in bin/ that
+    mention the template's path (activation scripts, pip launchers) are
+    rewritten for the new location. Clones never write into the template:
+    pip replaces files rather than modifying them, so hardlinked files stay
+    intact. Not used on Windows, whose script launchers embed their paths in
+    executables.
+    """
+
+    DIRNAME = "venv-templates"
+
+    def __init__(
+        self, cache_dir: Optional[Path] = None, interpreters: Optional[InterpreterRegistry] = None
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            cache_dir: User cache directory (default: user_cache_dir())
+            interpreters: Registry whose cached versions identify interpreters
+                (default: one kept in cache_dir)
+        """
+        cache_dir = cache_dir or user_cache_dir()
+        self.root = cache_dir / self.DIRNAME
+        self.interpreters = interpreters or InterpreterRegistry(cache_dir)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether templates work on this platform."""
+        return sys.platform != "win32"
+
+    def key(self, python_executable: str, variant: str = "") -> Optional[str]:
+        """
+        Template key of an interpreter.
+
+        Args:
+            python_executable: Base interpreter
+            variant: Distinguishes templates built differently (e.g. shared pip)
+
+        Returns:
+            Key, or None if the interpreter cannot be identified
+        """
+        real = os.path.realpath(python_executable)
+        signature = stat_signature(Path(real))
+        if signature is None:
+            return None
+        version = self.interpreters.version_of(python_executable)
+        if version is None:
+            return None
+        return fingerprint(real, version, signature, variant)
+
+    def ensure(self, key: str, build: Callable[[Path], None]) -> Optional[Path]:
+        """
+        Get a template, building it on first use.
+
+        Args:
+            key: Template key from key()
+            build: Creates a venv at the given path
+
+        Returns:
+            Template venv directory, or None if it is being built elsewhere
+            or could not be built
+        """
+        template_dir = self.root / key
+        venv_path = template_dir / _TEMPLATE_NAME
+        if (template_dir / _COMPLETE_MARKER).exists():
+            return venv_path
+
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            os.mkdir(template_dir)
+        except FileExistsError:
+            try:
+                age = time.time() - template_dir.stat().st_mtime
+            except OSError:
+                return None
+            if age < _STALE_BUILD_SECONDS:
+                # Another process is building it
+                return None
+            shutil.rmtree(template_dir, ignore_errors=True)
+            return self.ensure(key, build)
+        except OSError as e:
+            logger.debug(f"Cannot create venv template directory: {e}")
+            return None
+
+        try:
+            build(venv_path)
+            (template_dir / _COMPLETE_MARKER).write_text("")
+        except Exception as e:
+            logger.debug(f"Failed to build venv template {key}: {e}")
+            shutil.rmtree(template_dir, ignore_errors=True)
+            return None
+        logger.info(f"Built venv template {template_dir}")
+        return venv_path
+
+    def clone(self, template: Path, venv_path: Path) -> str:
+        """
+        Clone a template into a new venv.
+
+        Args:
+            template: Template venv from ensure()
+            venv_path: Directory of the new venv (must not exist)
+
+        Returns:
+            Description of the clone method used
+        """
+        cloner = TreeCloner()
+        old = os.fsencode(str(template))
+        new = os.fsencode(str(venv_path))
+        old_prompt = f"({_TEMPLATE_NAME}) ".encode()
+        new_prompt = f"({venv_path.name}) ".encode()
+
+        def rewrite(src: str, dst: str, is_activate: bool) -> bool:
+            """Write a path-adjusted copy of a text file; False if it needs none."""
+            with open(src, "rb") as f:
+                content = f.read()
+            if old not in content and not (is_activate and old_prompt in content):
+                return False
+            content = content.replace(old, new)
+            if is_activate:
+                content = content.replace(old_prompt, new_prompt)
+            with open(dst, "wb") as f:
+                f.write(content)
+            shutil.copymode(src, dst)
+            return True
+
+        try:
+            stack: List[Tuple[str, str, bool]] = [(str(template), str(venv_path), True)]
+            while stack:
+                src_dir, dst_dir, scripts = stack.pop()
+                os.mkdir(dst_dir)
+                with os.scandir(src_dir) as it:
+                    for entry in it:
+                        dst = os.path.join(dst_dir, entry.name)
+                        if entry.is_symlink():
+                            os.symlink(os.readlink(entry.path), dst)
+                        elif entry.is_dir():
+                            # Only the top level and bin/ hold files that name the venv
+                            stack.append((entry.path, dst, entry.name == "bin"))
+                        elif not (
+                            scripts
+                            and rewrite(entry.path, dst, entry.name.lower().startswith("activate"))
+                        ):
+                            cloner.clone_file(entry.path, dst)
+        except BaseException:
+            shutil.rmtree(venv_path, ignore_errors=True)
+            raise
+        return cloner.describe()
+
+    def clear(self) -> None:
+        """Remove every template."""
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,225 @@
+"""PEP 440 versions and specifiers, and Poetry version constraints."""
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+# PEP 440 version (same grammar as packaging.version)
+_VERSION_RE = re.compile(
+    r"""^\s*v?
+    (?:(?P<epoch>\d+)!)?
+    (?P<release>\d+(?:\.\d+)*)
+    (?:[-_.]?(?P<pre_l>alpha|a|beta|b|preview|pre|c|rc)[-_.]?(?P<pre_n>\d+)?)?
+    (?:-(?P<post_n1>\d+)|[-_.]?(?P<post_l>post|rev|r)[-_.]?(?P<post_n2>\d+)?)?
+    (?:[-_.]?(?P<dev_l>dev)[-_.]?(?P<dev_n>\d+)?)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    \s*$""",
+    re.VERBOSE | re.IGNORECASE,
+)
+
+_PRE_LABELS = {
+    "alpha": "a",
+    "a": "a",
+    "beta": "b",
+    "b": "b",
+    "c": "rc",
+    "pre": "rc",
+    "preview": "rc",
+    "rc": "rc",
+}
+
+# One clause of a version specifier
+_CLAUSE_RE = re.compile(r"^\s*(===|~=|==|!=|<=|>=|<|>)\s*(\S+?)\s*$")
+
+# Poetry constraints: "^1.2", "~1.2", ">=1.2,<2.0", ">=1.2 <2.0", "1.2.*"
+_POETRY_CLAUSE_SPLIT_RE = re.compile(r"\s*,\s*|\s+(?=[<>=!~^])")
+_POETRY_CLAUSE_RE = re.compile(r"^(\^|~=|~|===|==|!=|<=|>=|<|>|=)?\s*([0-9][0-9A-Za-z.*+!-]*)$")
+_RELEASE_RE = re.compile(r"^\d+(?:\.\d+)*")
+
+
+class PackageVersion(NamedTuple):
+    """A parsed PEP 440 version."""
+
+    epoch: int
+    release: Tuple[int, ...]
+    pre: Optional[Tuple[str, int]]
+    post: Optional[int]
+    dev: Optional[int]
+    local: Optional[str]
+
+    @property
+    def is_prerelease(self) -> bool:
+        return self.pre is not None or self.dev is not None
+
+    @property
+    def is_postrelease(self) -> bool:
+        return self.post is not None
+
+    @property
+    def key(self) -> Tuple:
+        """Sort key of the public version, as PEP 440 orders versions."""
+        release = list(self.release)
+        while len(release) > 1 and release[-1] == 0:
+            release.pop()
+        if self.pre is None and self.post is None and self.dev is not None:
+            pre: Tuple = (-1, "", 0)  # 1.0.dev0 sorts before 1.0a0
+        elif self.pre is None:
+            pre = (1, "", 0)
+        else:
+            pre = (0,) + self.pre
+        post = -1 if self.post is None else self.post
+        dev = (1, 0) if self.dev is None else (0, self.dev)
+        return (self.epoch, tuple(release), pre, post, dev)
+
+    @property
+    def base_key(self) -> Tuple:
+        """Sort key of the epoch and release only."""
+        return PackageVersion(self.epoch, self.release, None, None, None, None).key
+
+
+def parse_package_version(text: str) -> Optional[PackageVersion]:
+    """
+    Parse a PEP 440 version string.
+
+    Returns:
+        The version, or None if the string is not a valid version
+    """
+    match = _VERSION_RE.match(text)
+    if not match:
+        return None
+    pre = None
+    if match.group("pre_l"):
+        pre = (_PRE_LABELS[match.group("pre_l").lower()], int(match.group("pre_n") or 0))
+    post = None
+    if match.group("post_n1") or match.group("post_l"):
+        post = int(match.group("post_n1") or match.group("post_n2") or 0)
+    dev = int(match.group("dev_n") or 0) if match.group("dev_l") else None
+    return PackageVersion(
+        epoch=int(match.group("epoch") or 0),
+        release=tuple(int(part) for part in match.group("release").split(".")),
+        pre=pre,
+        post=post,
+        dev=dev,
+        local=match.group("local"),
+    )
+
+
+def _clause_contains(version: PackageVersion, text: str, operator: str, target: str) -> bool:
+    if operator == "===":
+        return text.strip().lower() == target.lower()
+
+    wildcard = target.endswith(".*")
+    if wildcard:
+        if operator not in ("==", "!="):
+            raise ValueError(target)
+        prefix = tuple(int(part) for part in target[:-2].split("."))
+        release = version.release + (0,) * max(0, len(prefix) - len(version.release))
+        matches = version.epoch == 0 and release[: len(prefix)] == prefix
+        return matches if operator == "==" else not matches
+
+    spec = parse_package_version(target)
+    if spec is None or spec.local:
+        # Local labels in specifiers are rare enough to leave to pip
+        raise ValueError(target)
+
+    if operator == "~=":
+        if len(spec.release) < 2:
+            raise ValueError(target)
+        wildcard_spec = ".".join(map(str, spec.release[:-1])) + ".*"
+        return version.key >= spec.key and _clause_contains(version, text, "==", wildcard_spec)
+    if operator in ("==", "!="):
+        matches = version.key == spec.key
+        return matches if operator == "==" else not matches
+    if operator == "<=":
+        return version.key <= spec.key
+    if operator == ">=":
+        return version.key >= spec.key
+    if operator == "<":
+        # <V excludes pre-releases of V itself unless V is one
+        if version.key >= spec.key:
+            return False
+        return spec.is_prerelease or not (
+            version.is_prerelease and version.base_key == spec.base_key
+        )
+    # ">": excludes post-releases and local versions of V itself
+    if version.key <= spec.key:
+        return False
+    if not spec.is_postrelease and version.is_postrelease and version.base_key == spec.base_key:
+        return False
+    return not (version.local and version.base_key == spec.base_key)
+
+
+def specifier_contains(specifier: str, version: str) -> Optional[bool]:
+    """
+    Check an installed version against a PEP 440 specifier such as ">=2.0,!=2.1.*".
+
+    Installed pre-releases count, as they do for pip.
+
+    Returns:
+        Whether the version matches, or None if either cannot be evaluated
+    """
+    parsed = parse_package_version(version)
+    if parsed is None:
+        return None
+    try:
+        for clause in filter(None, (c.strip() for c in specifier.split(","))):
+            match = _CLAUSE_RE.match(clause)
+            if not match:
+                return None
+            if not _clause_contains(parsed, version, *match.groups()):
+                return False
+    except ValueError:
+        return None
+    return True
+
+
+def _bump(release: List[int], index: int) -> str:
+    """Upper bound of a caret or tilde range: "2.28" bumped at 0 -> "3.0"."""
+    bumped = release[:index] + [release[index] + 1] + [0] * (len(release) - index - 1)
+    return ".".join(str(part) for part in bumped)
+
+
+def poetry_clauses(constraint: str) -> Optional[List[Tuple[str, str]]]:
+    """Operator and version of each PEP 440 clause of a Poetry constraint."""
+    if "|" in constraint:
+        return None
+    clauses = []
+    for clause in _POETRY_CLAUSE_SPLIT_RE.split(constraint.strip()):
+        if clause in ("", "*"):
+            continue
+        match = _POETRY_CLAUSE_RE.match(clause)
+        if not match:
+            return None
+        operator, version = match.group(1) or "==", match.group(2)
+        if operator in ("^", "~"):
+            release_match = _RELEASE_RE.match(version)
+            if not release_match or "*" in version:
+                return None
+            release = [int(part) for part in release_match.group(0).split(".")]
+            if operator == "^":
+                # The leftmost non-zero part may not change
+                nonzero = [i for i, part in enumerate(release) if part]
+                index = nonzero[0] if nonzero else len(release) - 1
+            else:
+                index = 1 if len(release) > 1 else 0
+            clauses.extend([(">=", version), ("<", _bump(release, index))])
+        else:
+            clauses.append(("==" if operator == "=" else operator, version))
+    return clauses
+
+
+def poetry_constraint(constraint: str) -> Optional[str]:
+    """
+    Translate a Poetry version constraint into a PEP 440 specifier.
+
+    Caret and tilde ranges become explicit bounds ("^2.28" -> ">=2.28,<3.0",
+    "~8.1" -> ">=8.1,<8.2"), bare versions become "==" and "*" becomes no
+    specifier at all.
+
+    Returns:
+        The specifier, possibly empty, or None if the constraint cannot be
+        expressed in PEP 440 (such as "||" unions)
+    """
+    clauses = poetry_clauses(constraint)
+    if clauses is None:
+        return None
+    return ",".join(operator + version for operator, version in clauses)
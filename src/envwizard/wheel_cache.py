@@ -0,0 +1,240 @@
+"""Wheels built from sdists, kept once per machine in the user cache."""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from envwizard.detectors.framework_index import canonicalize_name
+from envwizard.locations import user_cache_dir
+from envwizard.logger import get_logger
+
+logger = get_logger(__name__)
+
+# First pip with `pip install --report`
+REPORT_MIN_PIP = (22, 2)
+
+_SDIST_SUFFIXES = (".tar.gz", ".zip", ".tar.bz2", ".tgz")
+
+
+class SdistInstall(NamedTuple):
+    """A distribution that pip installed from a source archive."""
+
+    name: str
+    version: str
+    url: str
+    # sha256 of the source archive, if known
+    sha256: Optional[str]
+
+
+def wheel_tags(filename: str) -> Optional[Tuple[str, str, str]]:
+    """
+    The (python, abi, platform) tags of a wheel filename.
+
+    Returns:
+        The tags, or None if the name is not a wheel filename
+    """
+    if not filename.endswith(".whl"):
+        return None
+    parts = filename[:-4].split("-")
+    if len(parts) not in (5, 6):
+        return None
+    return parts[-3], parts[-2], parts[-1]
+
+
+def sdist_installs(report: Dict[str, Any]) -> List[SdistInstall]:
+    """
+    Distributions a `pip install --report` installed from source archives.
+
+    Wheels, local directories, editables and VCS checkouts are left out.
+    """
+    found = []
+    for item in report.get("install") or []:
+        info = item.get("download_info") or {}
+        url = info.get("url") or ""
+        archive = info.get("archive_info")
+        if archive is None or not urlparse(url).path.endswith(_SDIST_SUFFIXES):
+            continue
+        sha256 = (archive.get("hashes") or {}).get("sha256")
+        if sha256 is None and str(archive.get("hash", "")).startswith("sha256="):
+            sha256 = archive["hash"].split("=", 1)[1]
+        metadata = item.get("metadata") or {}
+        found.append(
+            SdistInstall(metadata.get("name", ""), metadata.get("version", ""), url, sha256)
+        )
+    return found
+
+
+def _file_sha256(path: Path) -> Optional[str]:
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class WheelCache:
+    """
+    Wheels built from sdists, shared by every venv of the user.
+
+    A wheel is stored under the sha256 of the sdist it was built from and
+    its ABI and platform tags (``builds/<sha256>/<abi>-<platform>/``) and
+    linked into a flat ``links`` directory that installs pass to pip with
+    ``--find-links``. pip prefers a wheel over an sdist of the same version,
+    so a package without a wheel for the platform is built once per machine
+    rather than once per venv.
+
+    Wheels come from pip's own build during the install when pip kept it in
+    its wheel cache; otherwise the sdist is built again with ``pip wheel``.
+    """
+
+    DIRNAME = "wheels"
+
+    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+        """
+        Initialize the wheel cache.
+
+        Args:
+            cache_dir: User cache directory (default: user_cache_dir())
+        """
+        self.root = (cache_dir or user_cache_dir()) / self.DIRNAME
+        self.links = self.root / "links"
+
+    def find_links(self) -> Optional[Path]:
+        """The directory to pass to pip's --find-links, or None if it holds no wheels."""
+        try:
+            with os.scandir(self.links) as entries:
+                if any(entry.name.endswith(".whl") for entry in entries):
+                    return self.links
+        except OSError:
+            pass
+        return None
+
+    def entry_dir(self, sha256: str, wheel_name: str) -> Optional[Path]:
+        """Directory of the wheel built from an sdist, keyed by hash, ABI and platform."""
+        tags = wheel_tags(wheel_name)
+        if tags is None:
+            return None
+        _, abi, platform = tags
+        return self.root / "builds" / sha256 / f"{abi}-{platform}"
+
+    def store(self, sha256: str, wheel: Path) -> Optional[Path]:
+        """
+        Add a wheel built from the sdist with the given hash.
+
+        Args:
+            sha256: Hash of the source archive
+            wheel: Built wheel (copied, left in place)
+
+        Returns:
+            The cached wheel, or None if it could not be stored
+        """
+        directory = self.entry_dir(sha256, wheel.name)
+        if directory is None:
+            return None
+        target = directory / wheel.name
+        try:
+            if not target.exists():
+                directory.mkdir(parents=True, exist_ok=True)
+                tmp = directory / f".{wheel.name}.{os.getpid()}"
+                shutil.copyfile(wheel, tmp)
+                os.replace(tmp, target)
+            self.links.mkdir(parents=True, exist_ok=True)
+            link = self.links / wheel.name
+            if not link.exists():
+                tmp = self.links / f".{wheel.name}.{os.getpid()}"
+                try:
+                    os.link(target, tmp)
+                except OSError:
+                    shutil.copyfile(target, tmp)
+                os.replace(tmp, link)
+        except OSError as e:
+            logger.debug(f"Could not cache {wheel.name}: {e}")
+            return None
+        logger.info(f"Cached wheel {wheel.name}")
+        return target
+
+    def build(self, pip: List[str], url: str, options: List[str]) -> Optional[Path]:
+        """
+        Build a wheel from a source archive with `pip wheel` into a temporary directory.
+
+        Args:
+            pip: Command that runs pip in the target venv
+            url: URL of the source archive
+            options: pip index options (e.g. ["--index-url", "..."])
+
+        Returns:
+            The wheel (the caller removes its directory), or None on failure
+        """
+        out = Path(tempfile.mkdtemp(prefix="envwizard-wheel-"))
+        command = pip + ["wheel", "--no-deps", "--wheel-dir", str(out)] + options + [url]
+        try:
+            result = subprocess.run(command, capture_output=True, text=True)
+        except OSError as e:
+            logger.debug(f"pip wheel failed for {url}: {e}")
+            result = None
+        wheels = sorted(out.glob("*.whl"))
+        if result is None or result.returncode != 0 or not wheels:
+            if result is not None:
+                logger.debug(f"pip wheel failed for {url}: {result.stderr[-2000:]}")
+            shutil.rmtree(out, ignore_errors=True)
+            return None
+        return wheels[0]
+
+    def add_builds(
+        self,
+        report_file: Path,
+        built_wheels: Dict[str, Path],
+        pip: List[str],
+        options: List[str],
+    ) -> int:
+        """
+        Cache the wheels of the sdists an install built.
+
+        Args:
+            report_file: JSON written by `pip install --report`
+            built_wheels: Wheels pip reported building, by canonical name
+            pip: Command that runs pip in the venv (to rebuild lost wheels)
+            options: pip index options of the install
+
+        Returns:
+            Number of wheels added
+        """
+        try:
+            report = json.loads(report_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Unreadable pip report {report_file}: {e}")
+            return 0
+
+        added = 0
+        for sdist in sdist_installs(report):
+            sha256 = sdist.sha256
+            if sha256 is None and sdist.url.startswith("file:"):
+                path = unquote(urlparse(sdist.url).path)
+                if sys.platform == "win32":
+                    path = path.lstrip("/")
+                sha256 = _file_sha256(Path(path))
+            if sha256 is None:
+                continue
+            wheel = built_wheels.get(canonicalize_name(sdist.name))
+            rebuilt = None
+            if wheel is None or not wheel.is_file():
+                rebuilt = wheel = self.build(pip, sdist.url, options)
+            if wheel is None:
+                continue
+            try:
+                if self.store(sha256, wheel) is not None:
+                    added += 1
+            finally:
+                if rebuilt is not None:
+                    shutil.rmtree(rebuilt.parent, ignore_errors=True)
+        return added
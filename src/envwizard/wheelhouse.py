@@ -0,0 +1,192 @@
+"""Local wheel directories for offline installs, and a minimal index serving one."""
+
+import hashlib
+import html
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlparse
+
+from envwizard.detectors.framework_index import canonicalize_name
+from envwizard.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SDIST_SUFFIXES = (".tar.gz", ".zip")
+
+
+def wheelhouse_options(directory: Path) -> List[str]:
+    """pip options that install from a wheelhouse only, without any index."""
+    return ["--no-index", "--find-links", str(directory)]
+
+
+def archive_project(filename: str) -> Optional[str]:
+    """
+    PEP 503 normalized project name of a wheel or sdist filename.
+
+    Returns:
+        The name, or None if the file is not a distribution archive
+    """
+    if filename.endswith(".whl"):
+        name = filename.split("-", 1)[0]
+    else:
+        suffix = next((s for s in _SDIST_SUFFIXES if filename.endswith(s)), None)
+        if suffix is None or "-" not in filename[: -len(suffix)]:
+            return None
+        name = filename[: -len(suffix)].rsplit("-", 1)[0]
+    return canonicalize_name(name) or None
+
+
+class WheelhouseIndex:
+    """
+    A PEP 503 simple index over a wheelhouse directory, served over HTTP.
+
+    ``/simple/`` lists the projects and ``/simple/<project>/`` their files,
+    with sha256 fragments that pip verifies; files are served from
+    ``/files/``. It is meant for build agents and tests that exercise the
+    ``--index-url`` install path without network access, not as a general
+    package server.
+    """
+
+    def __init__(self, directory: Path, host: str = "127.0.0.1", port: int = 0) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            directory: Wheelhouse to serve
+            host: Interface to listen on
+            port: Port to listen on (0: any free port)
+        """
+        self.directory = directory
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+        index = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                index._handle(self)
+
+            def log_message(self, format: str, *args: object) -> None:
+                logger.debug(f"wheelhouse index: {format % args}")
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """The index URL to pass to pip's --index-url."""
+        host, port = self.server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}/simple/"
+
+    def _archives(self) -> Dict[str, List[str]]:
+        """Distribution files of the wheelhouse by project."""
+        projects: Dict[str, List[str]] = {}
+        try:
+            names = sorted(os.listdir(self.directory))
+        except OSError:
+            return projects
+        for name in names:
+            project = archive_project(name)
+            if project is not None:
+                projects.setdefault(project, []).append(name)
+        return projects
+
+    def _sha256(self, path: Path) -> str:
+        st = path.stat()
+        key = (path.name, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            digest = self._hashes.get(key)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            with self._lock:
+                self._hashes[key] = digest
+        return digest
+
+    def _handle(self, request: BaseHTTPRequestHandler) -> None:
+        path = unquote(urlparse(request.path).path)
+        parts = [part for part in path.split("/") if part]
+        try:
+            if parts == ["simple"]:
+                links = [f'<a href="{quote(p)}/">{html.escape(p)}</a>' for p in self._archives()]
+                self._send_html(request, "Simple index", links)
+            elif len(parts) == 2 and parts[0] == "simple":
+                files = self._archives().get(canonicalize_name(parts[1]))
+                if not files:
+                    request.send_error(404)
+                    return
+                links = [
+                    f'<a href="/files/{quote(name)}#sha256={self._sha256(self.directory / name)}">'
+                    f"{html.escape(name)}</a>"
+                    for name in files
+                ]
+                self._send_html(request, f"Links for {parts[1]}", links)
+            elif (
+                len(parts) == 2
+                and parts[0] == "files"
+                and "\\" not in parts[1]
+                and archive_project(parts[1])
+            ):
+                file_path = self.directory / parts[1]
+                if not file_path.is_file():
+                    request.send_error(404)
+                    return
+                request.send_response(200)
+                request.send_header("Content-Type", "application/octet-stream")
+                request.send_header("Content-Length", str(file_path.stat().st_size))
+                request.end_headers()
+                with open(file_path, "rb") as f:
+                    while True:
+                        chunk = f.read(1 << 20)
+                        if not chunk:
+                            break
+                        request.wfile.write(chunk)
+            else:
+                request.send_error(404)
+        except OSError as e:
+            logger.debug(f"wheelhouse index: {request.path}: {e}")
+
+    @staticmethod
+    def _send_html(request: BaseHTTPRequestHandler, title: str, links: List[str]) -> None:
+        body = (
+            f"<!DOCTYPE html>\n<html><head><title>{html.escape(title)}</title></head><body>\n"
+            + "<br>\n".join(links)
+            + "\n</body></html>\n"
+        ).encode("utf-8")
+        request.send_response(200)
+        request.send_header("Content-Type", "text/html; charset=utf-8")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def start(self) -> "WheelhouseIndex":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted."""
+        self.server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+
+    def __enter__(self) -> "WheelhouseIndex":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
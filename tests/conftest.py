@@ -6,6 +6,14 @@ from pathlib import Path
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def user_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep per-user caches out of the real home directory."""
+    cache_dir = tmp_path_factory.mktemp("user_cache")
+    monkeypatch.setenv("ENVWIZARD_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
 @pytest.fixture
 def temp_project_dir(tmp_path):
     """Create a temporary project directory."""
@@ -8,6 +8,8 @@ filename patterns, preventing false positives.
 import pytest
 from pathlib import Path
 
+import envwizard.detectors.imports as imports_module
+from envwizard.core import EnvWizard
 from envwizard.detectors import ProjectDetector
 
 
@@ -389,3 +391,79 @@ async def root():
             "Should detect Flask from actual imports"
         assert "fastapi" in info["frameworks"], \
             "Should detect FastAPI from requirements.txt"
+
+
+class TestEarlyExitDetection:
+    """Tests for stopping the scan once the answer is known."""
+
+    def test_frameworks_of_interest_stop_after_first_hit(self, temp_project_dir, monkeypatch):
+        """Test that a targeted query stops reading files after the first match."""
+        for i in range(5):
+            (temp_project_dir / f"view_{i}.py").write_text("import django\n")
+
+        scanned = []
+        original = imports_module.scan_file_imports
+
+        def counting_scan(path, deep=False):
+            scanned.append(path)
+            return original(path, deep=deep)
+
+        monkeypatch.setattr(imports_module, "scan_file_imports", counting_scan)
+
+        detector = ProjectDetector(temp_project_dir)
+        info = detector.detect_project_type(frameworks={"django"})
+
+        assert info["frameworks"] == ["django"]
+        assert len(scanned) == 1
+
+    def test_cached_scan_stops_reading_after_first_hit(self, temp_project_dir, monkeypatch):
+        """Test that with a cold import cache a targeted query reads one file."""
+        for i in range(200):
+            (temp_project_dir / f"view_{i}.py").write_text(f"import django\nVIEW = {i}\n")
+
+        opened = []
+
+        def counting_open(path, *args, **kwargs):
+            opened.append(path)
+            return open(path, *args, **kwargs)
+
+        monkeypatch.setattr("envwizard.detectors.import_cache.open", counting_open, raising=False)
+
+        detector = EnvWizard(temp_project_dir).project_detector
+        info = detector.detect_project_type(frameworks={"django"})
+
+        assert info["frameworks"] == ["django"]
+        assert len(opened) == 1
+        assert detector.import_cache.stats()["misses"] == 1
+
+    def test_frameworks_of_interest_filter_results(self, temp_project_dir):
+        """Test that only requested frameworks are reported."""
+        (temp_project_dir / "app.py").write_text("import flask\nimport pandas\n")
+
+        detector = ProjectDetector(temp_project_dir)
+        info = detector.detect_project_type(frameworks={"flask", "celery"})
+
+        assert info["frameworks"] == ["flask"]
+
+    def test_answered_by_dependency_files(self, temp_project_dir, monkeypatch):
+        """Test that no Python file is read when requirements answer the query."""
+        (temp_project_dir / "requirements.txt").write_text("django>=4\n")
+        (temp_project_dir / "app.py").write_text("import flask\n")
+
+        def fail(*args):
+            raise AssertionError("project files should not be scanned")
+
+        detector = ProjectDetector(temp_project_dir)
+        monkeypatch.setattr(detector, "_detect_from_structure", fail)
+
+        assert detector.detect_project_type(frameworks=["django"])["frameworks"] == ["django"]
+
+    def test_all_frameworks_found_stops_scan(self, temp_project_dir):
+        """Test that a full query still returns everything when it stops early."""
+        everything = "\n".join(f"import {name}" for name in ProjectDetector.FRAMEWORK_IMPORTS)
+        (temp_project_dir / "a_all.py").write_text(everything + "\n")
+        (temp_project_dir / "b_more.py").write_text("import flask\n")
+
+        info = ProjectDetector(temp_project_dir).detect_project_type()
+
+        assert sorted(info["frameworks"]) == sorted(ProjectDetector.FRAMEWORK_IMPORTS)
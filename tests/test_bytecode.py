@@ -0,0 +1,98 @@
+"""Tests for byte-compiling venvs and project sources."""
+
+import sys
+
+import pytest
+
+from envwizard.bytecode import CompileResult, compile_bytecode, source_roots
+from envwizard.venv import VirtualEnvManager
+
+
+def make_project(root):
+    """A project with a package, a script, a venv and build output."""
+    (root / "app").mkdir(parents=True)
+    (root / "app" / "__init__.py").write_text("VALUE = 1\n")
+    (root / "app" / "build").mkdir()
+    (root / "app" / "build" / "generated.py").write_text("VALUE = 2\n")
+    (root / "manage.py").write_text("import app\n")
+    (root / "README.md").write_text("# demo\n")
+    (root / ".git").mkdir()
+    (root / "env-custom").mkdir()
+    (root / "env-custom" / "pyvenv.cfg").write_text("version = 3.11.7\n")
+    return root
+
+
+class TestSourceRoots:
+    """Tests for finding the project's own code."""
+
+    def test_source_roots(self, tmp_path):
+        """Test that venvs, hidden and non-Python entries are left out."""
+        project = make_project(tmp_path / "project")
+
+        assert source_roots(project) == [project / "app", project / "manage.py"]
+
+
+class TestCompileBytecode:
+    """Tests for compileall runs."""
+
+    def test_compiles_packages_and_sources(self, tmp_path):
+        """Test that site-packages is compiled whole and pruned project dirs are skipped."""
+        project = make_project(tmp_path / "project")
+        site_packages = tmp_path / "venv" / "lib" / "site-packages"
+        (site_packages / "pkg" / "build").mkdir(parents=True)
+        (site_packages / "pkg" / "build" / "__init__.py").write_text("VALUE = 3\n")
+        (site_packages / "py2.py").write_text("print 'legacy'\n")
+
+        result = compile_bytecode(
+            sys.executable, [site_packages], source_roots(project), "checked-hash"
+        )
+
+        assert result.success is True
+        assert result.errors == 1
+        (pyc,) = (site_packages / "pkg" / "build" / "__pycache__").glob("*.pyc")
+        # PEP 552 flags: hash-based, checked against the source
+        assert int.from_bytes(pyc.read_bytes()[4:8], "little") == 0b11
+        assert list((project / "app" / "__pycache__").glob("__init__.*.pyc"))
+        assert list((project / "__pycache__").glob("manage.*.pyc"))
+        assert not (project / "app" / "build" / "__pycache__").exists()
+
+    def test_unknown_invalidation_mode(self, tmp_path):
+        """Test that only py_compile's modes are accepted."""
+        with pytest.raises(ValueError):
+            compile_bytecode(sys.executable, [tmp_path], invalidation_mode="never")
+
+
+class TestPrecompiledInstall:
+    """Tests for install_dependencies with precompile."""
+
+    def test_pip_does_not_compile(self, temp_project_dir, monkeypatch):
+        """Test that pip runs with --no-compile and the venv is compiled after."""
+        manager = VirtualEnvManager(temp_project_dir)
+        _, _, venv_path = manager.create_venv("venv")
+        req_file = temp_project_dir / "requirements.txt"
+        req_file.write_text("six\n")
+        commands = []
+        compiled = []
+
+        def fake_run(command, on_output=None):
+            commands.append(command)
+            return 0, []
+
+        def fake_compile(python, packages, sources, invalidation_mode):
+            compiled.append((packages, invalidation_mode))
+            return CompileResult(True, 1.5, 0)
+
+        monkeypatch.setattr("envwizard.venv.run_streamed", fake_run)
+        monkeypatch.setattr("envwizard.venv.compile_bytecode", fake_compile)
+        success, message = manager.install_dependencies(
+            venv_path, req_file, precompile="unchecked-hash"
+        )
+
+        assert success is True
+        assert "--no-compile" in commands[-1]
+        assert message.endswith("byte-compiled in 1.5s (unchecked-hash)")
+        ((packages, mode),) = compiled
+        assert packages[0].name == "site-packages"
+        assert mode == "unchecked-hash"
+        (run,) = manager.install_history.runs(temp_project_dir)
+        assert run["compile_seconds"] == 1.5
@@ -132,6 +132,21 @@ class TestDetectCommand:
         result = runner.invoke(cli, ['detect', '--path', str(tmp_path)])
         assert result.exit_code == 0
 
+    def test_detect_with_jobs(self, tmp_path):
+        """Test detecting with parallel import scanning."""
+        runner = CliRunner()
+        (tmp_path / "app.py").write_text("import flask\n")
+
+        result = runner.invoke(cli, ['detect', '--path', str(tmp_path), '--jobs', '2'])
+        assert result.exit_code == 0
+        assert "flask" in result.output.lower()
+
+    def test_detect_rejects_negative_jobs(self, tmp_path):
+        """Test that a negative job count is rejected."""
+        runner = CliRunner()
+        result = runner.invoke(cli, ['detect', '--path', str(tmp_path), '--jobs', '-1'])
+        assert result.exit_code != 0
+
 
 class TestCreateVenvCommand:
     """Test create-venv command."""
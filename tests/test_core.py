@@ -133,3 +133,45 @@ class TestEnvWizard:
         success, message = wizard.install_dependencies_only(venv_path)
 
         assert success is True
+
+
+class TestProjectInfoReuse:
+    """Tests for reusing detection results across setup phases."""
+
+    def _count_detections(self, wizard, monkeypatch):
+        calls = []
+        detect = wizard.project_detector.detect_project_type
+
+        def counting_detect(*args, **kwargs):
+            calls.append(args)
+            return detect(*args, **kwargs)
+
+        monkeypatch.setattr(wizard.project_detector, "detect_project_type", counting_detect)
+        return calls
+
+    def test_setup_reuses_project_info(self, django_project, monkeypatch):
+        """Test that init-style usage scans the project once."""
+        wizard = EnvWizard(django_project)
+        calls = self._count_detections(wizard, monkeypatch)
+
+        info = wizard.get_project_info()
+        results = wizard.setup(venv_name="test_venv", install_deps=False, project_info=info)
+
+        assert results["project_info"] is info
+        assert results["dotenv_created"] is True
+        assert len(calls) == 1
+
+    def test_changed_project_is_detected_again(self, temp_project_dir, monkeypatch):
+        """Test that the cached result is dropped when a manifest changes."""
+        (temp_project_dir / "requirements.txt").write_text("flask\n")
+        wizard = EnvWizard(temp_project_dir, use_cache=False)
+        calls = self._count_detections(wizard, monkeypatch)
+
+        info = wizard.get_project_info()
+        assert wizard.get_project_info() is info
+
+        (temp_project_dir / "requirements.txt").write_text("flask\ndjango\n")
+        updated = wizard.get_project_info()
+
+        assert "django" in updated["frameworks"]
+        assert len(calls) == 2
@@ -54,6 +54,52 @@ class TestProjectDetector:
         assert info["has_pyproject"] is False
 
 
+class TestFrameworkIndex:
+    """Tests for the precompiled framework index."""
+
+    def test_canonicalized_package_names(self):
+        """Test that distribution names match regardless of case and separators."""
+        index = ProjectDetector.framework_index()
+
+        assert index.frameworks_for_package("Django") == {"django"}
+        assert index.frameworks_for_package("Flask_SQLAlchemy") == {"flask", "sqlalchemy"}
+        assert index.frameworks_for_package("djangorestframework") == {"django"}
+        assert index.frameworks_for_package("uvicorn") == frozenset()
+
+    def test_import_aliases(self):
+        """Test alias and prefixed import names."""
+        index = ProjectDetector.framework_index()
+
+        assert index.frameworks_for_imports({"rest_framework"}) == {"django"}
+        assert index.frameworks_for_imports({"starlette"}) == {"fastapi"}
+        assert index.frameworks_for_imports({"flask_login"}) == {"flask"}
+        assert index.frameworks_for_imports({"os", "sys"}) == set()
+
+    def test_requirement_specifiers(self, temp_project_dir):
+        """Test that names are extracted from extras and any version operator."""
+        (temp_project_dir / "requirements.txt").write_text(
+            "Django~=4.2\ncelery[redis]>=5\nflask-sqlalchemy\n"
+        )
+
+        detector = ProjectDetector(temp_project_dir)
+        frameworks = detector._parse_requirements(temp_project_dir / "requirements.txt")
+
+        assert frameworks == {"django", "celery", "flask", "sqlalchemy"}
+
+    def test_register_framework(self, temp_project_dir):
+        """Test that registered frameworks are picked up by a subclass index."""
+
+        class CustomDetector(ProjectDetector):
+            pass
+
+        CustomDetector.register_framework("litestar", packages=["litestar"], imports=["litestar"])
+        (temp_project_dir / "app.py").write_text("from litestar import Litestar\n")
+
+        assert CustomDetector(temp_project_dir).detect_project_type()["frameworks"] == ["litestar"]
+        assert "litestar" not in ProjectDetector.FRAMEWORK_IMPORTS
+        assert ProjectDetector.framework_index().frameworks_for_package("litestar") == frozenset()
+
+
 class TestFrameworkDetector:
     """Tests for FrameworkDetector."""
 
@@ -145,3 +191,27 @@ class TestDependencyDetector:
         result = detector.get_dependency_file()
 
         assert result is None
+
+    def test_dependency_set_is_normalized(self, temp_project_dir):
+        """Test that formatting and order do not change the dependency set."""
+        (temp_project_dir / "requirements.txt").write_text(
+            "Django >= 4.0  # web\nrequests[security]>=2\n-r base.txt\n"
+        )
+        (temp_project_dir / "base.txt").write_text(
+            "Typing_Extensions\n--index-url  https://example.org/simple\n"
+        )
+        (temp_project_dir / "other.txt").write_text(
+            "--index-url https://example.org/simple\n"
+            "requests[security] >=2\ntyping-extensions\ndjango>=4.0\n"
+        )
+
+        detector = DependencyDetector(temp_project_dir)
+        dependency_set = detector.get_dependency_set()
+
+        assert dependency_set == [
+            "--index-url https://example.org/simple",
+            "django>=4.0",
+            "requests[security]>=2",
+            "typing-extensions",
+        ]
+        assert detector.get_dependency_set(temp_project_dir / "other.txt") == dependency_set
@@ -0,0 +1,197 @@
+"""Tests for the environment cache."""
+
+import os
+import platform
+
+import pytest
+from click.testing import CliRunner
+
+from envwizard.cli.main import cli
+from envwizard.core import EnvWizard
+from envwizard.env_cache import EnvCache, format_size, parse_size
+
+pytestmark = pytest.mark.skipif(
+    platform.system() == "Windows", reason="The environment cache is not used on Windows"
+)
+
+
+def make_venv(path, packages=()):
+    """Create a venv layout with the given top-level modules installed."""
+    site_packages = path / "lib" / "python3.11" / "site-packages"
+    site_packages.mkdir(parents=True)
+    (path / "bin").mkdir()
+    (path / "bin" / "activate").write_text(f'VIRTUAL_ENV="{path}"\n')
+    (path / "pyvenv.cfg").write_text("home = /usr/bin\nversion = 3.11.7\n")
+    for name in packages:
+        (site_packages / f"{name}.py").write_text(f"NAME = {name!r}\n")
+        (site_packages / f"{name}-1.0.dist-info").mkdir()
+        (site_packages / f"{name}-1.0.dist-info" / "METADATA").write_text(f"Name: {name}\n")
+        script = path / "bin" / name
+        script.write_text(f"#!{path}/bin/python\nimport {name}\n")
+        script.chmod(0o755)
+    return site_packages
+
+
+class TestSizes:
+    """Tests for size parsing and formatting."""
+
+    def test_parse_size(self):
+        """Test plain byte counts and unit suffixes."""
+        assert parse_size("1024") == 1024
+        assert parse_size("500M") == 500 * 1024**2
+        assert parse_size("1.5gb") == int(1.5 * 1024**3)
+        with pytest.raises(ValueError):
+            parse_size("lots")
+
+    def test_format_size(self):
+        """Test human-readable sizes."""
+        assert format_size(512) == "512 B"
+        assert format_size(3 * 1024**2) == "3.0 MB"
+
+
+class TestEnvCache:
+    """Tests for storing and restoring site-packages."""
+
+    def test_key(self, tmp_path, user_cache_dir):
+        """Test that the key depends on the dependency set only through its content."""
+        make_venv(tmp_path / "venv")
+        env_cache = EnvCache(user_cache_dir)
+
+        key = env_cache.key(tmp_path / "venv", ["django>=4", "six"])
+        assert key == env_cache.key(tmp_path / "venv", ["six", "django>=4"])
+        assert key != env_cache.key(tmp_path / "venv", ["six"])
+        assert env_cache.key(tmp_path, ["six"]) is None
+
+    def test_round_trip(self, tmp_path, user_cache_dir):
+        """Test that a restored venv has the stored packages and its own scripts."""
+        env_cache = EnvCache(user_cache_dir)
+        source = tmp_path / "source"
+        make_venv(source, ["alpha", "beta"])
+        key = env_cache.key(source, ["alpha", "beta"])
+        assert env_cache.store(key, source, ["alpha", "beta"])
+
+        target = tmp_path / "target"
+        site_packages = make_venv(target, ["stale"])
+        assert env_cache.restore(key, target)
+
+        assert (site_packages / "alpha.py").read_text() == "NAME = 'alpha'\n"
+        assert (site_packages / "beta-1.0.dist-info" / "METADATA").exists()
+        assert not (site_packages / "stale.py").exists()
+        script = (target / "bin" / "alpha").read_text()
+        assert script.startswith(f"#!{target}/bin/python\n")
+        assert os.access(target / "bin" / "alpha", os.X_OK)
+        assert str(target) in (target / "bin" / "activate").read_text()
+
+    def test_restore_does_not_share_inodes(self, tmp_path, user_cache_dir):
+        """Test that restored files are not hardlinks to the stored objects."""
+        env_cache = EnvCache(user_cache_dir)
+        source = tmp_path / "source"
+        make_venv(source, ["alpha"])
+        key = env_cache.key(source, ["alpha"])
+        env_cache.store(key, source, ["alpha"])
+
+        target = tmp_path / "target"
+        site_packages = make_venv(target)
+        assert env_cache.restore(key, target)
+
+        stored = {obj.stat().st_ino for obj in env_cache.objects_dir.rglob("*") if obj.is_file()}
+        restored = [path for path in site_packages.rglob("*") if path.is_file()]
+        assert restored
+        assert all(path.stat().st_ino not in stored for path in restored)
+        (site_packages / "alpha.py").write_text("NAME = 'changed'\n")
+        assert env_cache.restore(key, target)
+        assert (site_packages / "alpha.py").read_text() == "NAME = 'alpha'\n"
+
+    def test_miss_and_pruned_objects(self, tmp_path, user_cache_dir):
+        """Test that a miss or an incomplete entry leaves the venv alone."""
+        env_cache = EnvCache(user_cache_dir)
+        source = tmp_path / "source"
+        make_venv(source, ["alpha"])
+        key = env_cache.key(source, ["alpha"])
+        env_cache.store(key, source, ["alpha"])
+
+        target = tmp_path / "target"
+        site_packages = make_venv(target, ["stale"])
+        assert env_cache.restore("0" * 32, target) is None
+
+        for obj in env_cache.objects_dir.rglob("*"):
+            if obj.is_file():
+                obj.unlink()
+                break
+        assert env_cache.restore(key, target) is None
+        assert (site_packages / "stale.py").exists()
+
+    def test_prune_evicts_least_recently_used(self, tmp_path, user_cache_dir):
+        """Test LRU eviction down to a size limit and removal of everything."""
+        env_cache = EnvCache(user_cache_dir)
+        keys = []
+        for name in ("old", "new"):
+            venv_path = tmp_path / name
+            make_venv(venv_path, [name])
+            key = env_cache.key(venv_path, [name])
+            env_cache.store(key, venv_path, [name])
+            keys.append(key)
+        os.utime(env_cache.entries_dir / f"{keys[0]}.json", (1, 1))
+
+        (newest,) = [e for e in env_cache.entries() if e.key == keys[1]]
+        removed, _ = env_cache.prune(env_cache.stats()["size"] - 1)
+        assert removed == 1
+        assert [e.key for e in env_cache.entries()] == [newest.key]
+
+        removed, freed = env_cache.prune(0)
+        assert removed == 1
+        assert freed > 0
+        assert env_cache.stats()["objects"] == 0
+
+
+class TestSetupWithEnvCache:
+    """Tests for EnvWizard.setup(use_env_cache=True)."""
+
+    def test_second_project_is_restored(self, tmp_path, monkeypatch):
+        """Test that the same dependency set is restored instead of installed."""
+        installs = []
+
+        def fake_install(self, venv_path, requirements_file=None, on_output=None, **options):
+            installs.append(venv_path)
+            site_packages = next(venv_path.glob("lib/python*/site-packages"))
+            (site_packages / "installed_marker.py").write_text("")
+            return True, "Dependencies installed successfully"
+
+        monkeypatch.setattr("envwizard.venv.VirtualEnvManager.install_dependencies", fake_install)
+
+        for name, requirements in (("one", "six\n"), ("two", "# same set\nSix\n")):
+            project = tmp_path / name
+            project.mkdir()
+            (project / "requirements.txt").write_text(requirements)
+            results = EnvWizard(project).setup(create_dotenv=False, use_env_cache=True)
+            assert results["deps_installed"] is True
+
+        assert len(installs) == 1
+        assert results["deps_restored"] is True
+        restored = tmp_path / "two" / "venv"
+        assert list(restored.glob("lib/python*/site-packages/installed_marker.py"))
+
+
+class TestCacheCommands:
+    """Tests for `envwizard cache`."""
+
+    def test_stats_and_prune(self, tmp_path, user_cache_dir):
+        """Test that stats lists entries and prune --all empties the cache."""
+        env_cache = EnvCache(user_cache_dir)
+        make_venv(tmp_path / "venv", ["alpha"])
+        env_cache.store(env_cache.key(tmp_path / "venv", ["alpha"]), tmp_path / "venv", ["alpha"])
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["cache", "stats"])
+        assert result.exit_code == 0
+        assert "Environments" in result.output
+
+        result = runner.invoke(cli, ["cache", "prune", "--all"])
+        assert result.exit_code == 0
+        assert "Removed 1 environments" in result.output
+        assert env_cache.entries() == []
+
+    def test_prune_rejects_bad_size(self):
+        """Test that an invalid --max-size is a usage error."""
+        result = CliRunner().invoke(cli, ["cache", "prune", "--max-size", "lots"])
+        assert result.exit_code == 2
@@ -0,0 +1,163 @@
+"""Tests for the persistent import cache."""
+
+import os
+
+from envwizard.core import EnvWizard
+from envwizard.detectors import ProjectDetector
+from envwizard.detectors.import_cache import ImportCache, content_digest
+
+
+class TestImportCache:
+    """Tests for ImportCache."""
+
+    def _entries(self, project_dir):
+        return sorted(os.scandir(project_dir), key=lambda e: e.name)
+
+    def test_second_scan_hits_by_stat(self, temp_project_dir, tmp_path):
+        """Test that an unchanged file is served from the cache."""
+        (temp_project_dir / "app.py").write_text("import flask\n")
+        cache_dir = tmp_path / "cache"
+
+        first = ImportCache(cache_dir)
+        assert list(first.scan(self._entries(temp_project_dir))) == [frozenset({"flask"})]
+        assert first.stats()["misses"] == 1
+
+        second = ImportCache(cache_dir)
+        assert list(second.scan(self._entries(temp_project_dir))) == [frozenset({"flask"})]
+        assert second.stats()["hits"] == 1
+        assert second.stats()["misses"] == 0
+
+    def test_identical_content_parsed_once(self, temp_project_dir, tmp_path):
+        """Test that vendored copies are resolved by content digest."""
+        (temp_project_dir / "a.py").write_text("import django\n")
+        (temp_project_dir / "b.py").write_text("import django\n")
+
+        cache = ImportCache(tmp_path / "cache")
+        results = list(cache.scan(self._entries(temp_project_dir)))
+
+        assert results == [frozenset({"django"})] * 2
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["content_hits"] == 1
+
+    def test_misses_are_read_once(self, temp_project_dir, tmp_path, monkeypatch):
+        """Test that misses are parsed from the content read for hashing."""
+        (temp_project_dir / "app.py").write_text("import flask\n")
+
+        def fail(path, deep=False):
+            raise AssertionError("the file should not be read again")
+
+        monkeypatch.setattr("envwizard.detectors.imports.scan_file_imports", fail)
+        cache = ImportCache(tmp_path / "cache")
+
+        assert list(cache.scan(self._entries(temp_project_dir))) == [frozenset({"flask"})]
+
+    def test_parallel_chunks_match_serial(self, temp_project_dir, tmp_path, monkeypatch):
+        """Test that misses parsed in worker chunks give the serial results."""
+        modules = ["flask", "django", "pandas"]
+        for i in range(12):
+            (temp_project_dir / f"mod_{i:02}.py").write_text(f"import {modules[i % 3]}\n")
+        monkeypatch.setattr("envwizard.detectors.import_cache.SCAN_CHUNK_FILES", 2)
+        monkeypatch.setattr("envwizard.detectors.imports.PARALLEL_MIN_FILES", 0)
+
+        serial = ImportCache(tmp_path / "serial").scan(self._entries(temp_project_dir))
+        cache = ImportCache(tmp_path / "parallel")
+        parallel = cache.scan(self._entries(temp_project_dir), jobs=2)
+
+        assert sorted(map(sorted, parallel)) == sorted(map(sorted, serial))
+        assert cache.stats()["misses"] + cache.stats()["content_hits"] == 12
+
+    def test_modified_file_is_reparsed(self, temp_project_dir, tmp_path):
+        """Test that a changed file is not served stale imports."""
+        source = temp_project_dir / "app.py"
+        source.write_text("import flask\n")
+        cache_dir = tmp_path / "cache"
+        list(ImportCache(cache_dir).scan(self._entries(temp_project_dir)))
+
+        source.write_text("import fastapi, sys\n")
+        cache = ImportCache(cache_dir)
+
+        assert list(cache.scan(self._entries(temp_project_dir))) == [frozenset({"fastapi", "sys"})]
+        assert cache.stats()["misses"] == 1
+
+    def test_entry_point_content_is_cached_apart(self, temp_project_dir, tmp_path):
+        """Test that an entry point does not reuse the header scan of identical content."""
+        source = "import os\n\ndef main():\n    import django\n"
+        (temp_project_dir / "cli.py").write_text(source)
+        (temp_project_dir / "manage.py").write_text(source)
+
+        cache = ImportCache(tmp_path / "cache")
+        results = dict(zip(["cli.py", "manage.py"], cache.scan(self._entries(temp_project_dir))))
+
+        assert results == {"cli.py": {"os"}, "manage.py": {"os", "django"}}
+        assert cache.stats()["misses"] == 2
+
+    def test_deleted_files_are_pruned(self, temp_project_dir, tmp_path):
+        """Test that a full scan forgets deleted files and their orphaned content."""
+        (temp_project_dir / "app.py").write_text("import flask\n")
+        (temp_project_dir / "old.py").write_text("import django\n")
+        cache_dir = tmp_path / "cache"
+        list(ImportCache(cache_dir).scan(self._entries(temp_project_dir)))
+
+        (temp_project_dir / "old.py").unlink()
+        (temp_project_dir / "app.py").write_text("import celery\n")
+        list(ImportCache(cache_dir).scan(self._entries(temp_project_dir)))
+
+        reopened = ImportCache(cache_dir)
+        assert reopened.stats()["entries"] == 1
+        assert reopened.get_content(content_digest(b"import django\n")) is None
+        assert reopened.get_content(content_digest(b"import flask\n")) is None
+        assert reopened._db.execute("SELECT COUNT(*) FROM contents").fetchone() == (1,)
+
+    def test_early_exit_does_not_prune(self, temp_project_dir, tmp_path):
+        """Test that files a stopped scan did not reach stay cached."""
+        (temp_project_dir / "a.py").write_text("import flask\n")
+        (temp_project_dir / "b.py").write_text("import django\n")
+        cache_dir = tmp_path / "cache"
+        list(ImportCache(cache_dir).scan(self._entries(temp_project_dir)))
+
+        scan = ImportCache(cache_dir).scan(self._entries(temp_project_dir))
+        next(scan)
+        scan.close()
+
+        assert ImportCache(cache_dir).stats()["entries"] == 2
+
+    def test_unwritable_cache_is_disabled(self, temp_project_dir):
+        """Test that a cache that cannot be created is simply disabled."""
+        blocker = temp_project_dir / "blocker"
+        blocker.write_text("")
+
+        cache = ImportCache(blocker / "cache")
+
+        assert cache.enabled is False
+
+
+class TestDetectorCache:
+    """Tests for the cache wired into detection."""
+
+    def test_detector_uses_cache(self, temp_project_dir, tmp_path):
+        """Test that repeated detection returns the same frameworks from the cache."""
+        (temp_project_dir / "app.py").write_text("from flask import Flask\n")
+        cache_dir = tmp_path / "cache"
+
+        first = ProjectDetector(temp_project_dir, cache_dir=cache_dir).detect_project_type()
+        detector = ProjectDetector(temp_project_dir, cache_dir=cache_dir)
+        second = detector.detect_project_type()
+
+        assert first["frameworks"] == second["frameworks"] == ["flask"]
+        assert detector.import_cache.stats()["hits"] == 1
+
+    def test_envwizard_cache_location(self, temp_project_dir):
+        """Test that EnvWizard keeps the cache under .envwizard/cache."""
+        (temp_project_dir / "app.py").write_text("import django\n")
+
+        EnvWizard(temp_project_dir).get_project_info()
+
+        assert (temp_project_dir / ".envwizard" / "cache" / "imports.sqlite").exists()
+
+    def test_envwizard_cache_disabled(self, temp_project_dir):
+        """Test that use_cache=False leaves the project untouched."""
+        (temp_project_dir / "app.py").write_text("import django\n")
+
+        EnvWizard(temp_project_dir, use_cache=False).get_project_info()
+
+        assert not (temp_project_dir / ".envwizard").exists()
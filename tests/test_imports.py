@@ -0,0 +1,172 @@
+"""Tests for import extraction and parallel scanning."""
+
+from envwizard.detectors import ProjectDetector
+from envwizard.detectors.imports import (
+    extract_header_imports,
+    extract_imports,
+    map_file_imports,
+    resolve_jobs,
+    scan_file_imports,
+)
+
+
+class TestScanFileImports:
+    """Tests for scan_file_imports."""
+
+    def test_top_level_names(self, temp_project_dir):
+        """Test that only top-level module names are returned."""
+        source = temp_project_dir / "mod.py"
+        source.write_text("import os.path\nfrom flask.views import View\nfrom . import sibling\n")
+
+        assert scan_file_imports(str(source)) == {"os", "flask"}
+
+    def test_invalid_files_yield_empty_set(self, temp_project_dir):
+        """Test that broken and missing files do not raise."""
+        broken = temp_project_dir / "broken.py"
+        broken.write_text("def broken(\n")
+
+        assert scan_file_imports(str(broken)) == frozenset()
+        assert scan_file_imports(str(temp_project_dir / "missing.py")) == frozenset()
+
+    def test_deeply_nested_files_yield_empty_set(self, temp_project_dir, monkeypatch):
+        """Test that source too nested for the parser does not fail detection."""
+        (temp_project_dir / "requirements.txt").write_text("django\n")
+        generated = temp_project_dir / "gen.py"
+        generated.write_text("try:\n    import os\nexcept ImportError:\n    pass\n")
+        with open(generated, "a") as f:
+            f.write("x = " + "+".join(["1"] * 200000) + "\n")
+        (temp_project_dir / "unary.py").write_text("import os\ny = " + "-" * 100000 + "1\n")
+        paths = [str(generated), str(temp_project_dir / "unary.py")]
+
+        assert extract_imports(generated.read_bytes()) == frozenset()
+        assert list(map_file_imports(paths, deep=True)) == [frozenset(), frozenset()]
+        monkeypatch.setattr("envwizard.detectors.imports.PARALLEL_MIN_FILES", 0)
+        assert list(map_file_imports(paths, jobs=2, deep=True)) == [frozenset(), frozenset()]
+        result = ProjectDetector(temp_project_dir).detect_project_type()
+        assert result["frameworks"] == ["django"]
+
+
+# Generated by Django's startproject
+STOCK_MANAGE_PY = b'''#!/usr/bin/env python
+"""Django's command-line utility for administrative tasks."""
+import os
+import sys
+
+
+def main():
+    """Run administrative tasks."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mysite.settings')
+    try:
+        from django.core.management import execute_from_command_line
+    except ImportError as exc:
+        raise ImportError(
+            "Couldn't import Django. Are you sure it's installed and "
+            "available on your PYTHONPATH environment variable? Did you "
+            "forget to activate a virtual environment?"
+        ) from exc
+    execute_from_command_line(sys.argv)
+
+
+if __name__ == '__main__':
+    main()
+'''
+
+
+class TestHeaderExtraction:
+    """Tests for the tokenize-based header scan."""
+
+    def test_header_matches_ast_for_import_blocks(self):
+        """Test that header imports equal the full parse for import-only headers."""
+        source = (
+            b'"""Module docstring mentioning import."""\n'
+            b"# from django import nothing\n"
+            b"from __future__ import annotations\n"
+            b"import os.path, sys as system\n"
+            b"from .local import helper\n"
+            b"from flask import (\n    Flask,\n    request,\n)\n"
+            b"import a; import b\n"
+            b"\n"
+            b"app = Flask(__name__)\n"
+        )
+
+        assert extract_header_imports(source) == extract_imports(source, deep=True)
+
+    def test_stops_at_first_statement(self):
+        """Test that imports after the header are only found in deep mode."""
+        source = b"import flask\n\ndef view():\n    import celery\n"
+
+        assert extract_imports(source) == {"flask"}
+        assert extract_imports(source, deep=True) == {"flask", "celery"}
+
+    def test_entry_points_are_parsed_in_full(self, temp_project_dir):
+        """Test that Django's stock manage.py is found in header mode."""
+        assert extract_imports(STOCK_MANAGE_PY, "other.py") == {"os", "sys"}
+        assert extract_imports(STOCK_MANAGE_PY, "mysite/manage.py") == {"os", "sys", "django"}
+
+        (temp_project_dir / "manage.py").write_bytes(STOCK_MANAGE_PY)
+        assert list(map_file_imports([str(temp_project_dir / "manage.py")])) == [
+            {"os", "sys", "django"}
+        ]
+
+    def test_compound_header_falls_back_to_parser(self):
+        """Test that try/if blocks in the header are resolved by a full parse."""
+        source = b"try:\n    import ujson as json\nexcept ImportError:\n    import json\n"
+
+        assert extract_header_imports(source) is None
+        assert extract_imports(source) == {"ujson", "json"}
+
+    def test_prefilter_skips_files_without_import(self):
+        """Test that files without the import keyword are never tokenized."""
+        assert extract_imports(b"x = (\n") == frozenset()
+
+    def test_deep_scan_option(self, temp_project_dir):
+        """Test that ProjectDetector finds function-level imports only when deep."""
+        (temp_project_dir / "worker.py").write_text("X = 1\n\ndef run():\n    import celery\n")
+
+        assert ProjectDetector(temp_project_dir).detect_project_type()["frameworks"] == []
+        deep = ProjectDetector(temp_project_dir, deep_scan=True).detect_project_type()
+        assert deep["frameworks"] == ["celery"]
+
+
+class TestParallelScan:
+    """Tests for the parallel import scan."""
+
+    def _make_files(self, project_dir, count):
+        modules = ["flask", "django", "pandas", "os", "celery"]
+        paths = []
+        for i in range(count):
+            path = project_dir / f"mod_{i}.py"
+            path.write_text(f"import {modules[i % len(modules)]}\n")
+            paths.append(str(path))
+        return paths
+
+    def test_parallel_matches_serial(self, temp_project_dir):
+        """Test that parallel results equal serial results, in order."""
+        paths = self._make_files(temp_project_dir, 20)
+
+        serial = list(map_file_imports(paths, jobs=1))
+        parallel = list(map_file_imports(paths, jobs=2, min_files=0))
+
+        assert parallel == serial
+
+    def test_small_inputs_stay_serial(self, temp_project_dir):
+        """Test that small inputs are scanned without a worker pool."""
+        paths = self._make_files(temp_project_dir, 3)
+
+        assert list(map_file_imports(paths, jobs=4)) == list(map_file_imports(paths, jobs=1))
+
+    def test_detector_jobs_match_serial(self, temp_project_dir, monkeypatch):
+        """Test that ProjectDetector gives the same frameworks with jobs enabled."""
+        self._make_files(temp_project_dir, 10)
+        monkeypatch.setattr("envwizard.detectors.imports.PARALLEL_MIN_FILES", 0)
+
+        serial = ProjectDetector(temp_project_dir, jobs=1).detect_project_type()
+        parallel = ProjectDetector(temp_project_dir, jobs=2).detect_project_type()
+
+        assert sorted(parallel["frameworks"]) == sorted(serial["frameworks"])
+
+    def test_resolve_jobs(self):
+        """Test that zero means one worker per CPU."""
+        assert resolve_jobs(3) == 3
+        assert resolve_jobs(0) >= 1
+        assert resolve_jobs(None) >= 1
@@ -0,0 +1,87 @@
+"""Tests for the shared project index."""
+
+import envwizard.detectors.index as index_module
+from envwizard.core import EnvWizard
+from envwizard.detectors import DependencyDetector, ProjectDetector, ProjectIndex
+
+
+class TestProjectIndex:
+    """Tests for ProjectIndex queries."""
+
+    def test_queries_use_snapshot(self, temp_project_dir):
+        """Test that lookups answer from the snapshot until refresh()."""
+        (temp_project_dir / "requirements.txt").write_text("flask\n")
+        index = ProjectIndex(temp_project_dir)
+
+        assert index.is_file("requirements.txt")
+        assert not index.exists("Pipfile")
+
+        (temp_project_dir / "Pipfile").write_text("[packages]\n")
+        assert not index.exists("Pipfile")
+
+        index.refresh()
+        assert index.exists("Pipfile")
+
+    def test_files_and_names(self, temp_project_dir):
+        """Test pattern and depth filtering."""
+        (temp_project_dir / "pkg").mkdir()
+        (temp_project_dir / "app.py").write_text("")
+        (temp_project_dir / "pkg" / "views.py").write_text("")
+        (temp_project_dir / "venv").mkdir()
+        (temp_project_dir / "venv" / "skipped.py").write_text("")
+        index = ProjectIndex(temp_project_dir)
+
+        assert [e.name for e in index.files(["*.py"], max_depth=0)] == ["app.py"]
+        assert {e.name for e in index.files(["*.py"])} == {"app.py", "views.py"}
+        assert index.is_dir("pkg")
+        assert index.names(max_depth=0) == {"app.py", "pkg"}
+
+    def test_walks_tree_once(self, temp_project_dir, monkeypatch):
+        """Test that repeated queries do not walk the tree again."""
+        (temp_project_dir / "setup.py").write_text("")
+        calls = []
+        walk = index_module.walk_project
+
+        def counting_walk(*args, **kwargs):
+            calls.append(args)
+            return walk(*args, **kwargs)
+
+        monkeypatch.setattr(index_module, "walk_project", counting_walk)
+        index = ProjectIndex(temp_project_dir)
+        for _ in range(3):
+            index.exists("setup.py")
+            list(index.files(["*.py"]))
+
+        assert len(calls) == 1
+
+
+class TestSharedIndex:
+    """Tests that components share one index."""
+
+    def test_detectors_share_one_walk(self, temp_project_dir, monkeypatch):
+        """Test that a full analysis walks the project a single time."""
+        (temp_project_dir / "requirements.txt").write_text("psycopg2\n")
+        (temp_project_dir / "app.py").write_text("import flask\n")
+        calls = []
+        walk = index_module.walk_project
+
+        def counting_walk(*args, **kwargs):
+            calls.append(args)
+            return walk(*args, **kwargs)
+
+        monkeypatch.setattr(index_module, "walk_project", counting_walk)
+        wizard = EnvWizard(temp_project_dir, use_cache=False)
+        info = wizard.get_project_info()
+        dep_info = wizard.dependency_detector.get_dependency_file()
+
+        assert "flask" in info["frameworks"]
+        assert dep_info[0] == "requirements.txt"
+        assert wizard.project_detector.index is wizard.index
+        assert len(calls) == 1
+
+    def test_standalone_detectors_build_their_own_index(self, temp_project_dir):
+        """Test that detectors still work without an explicit index."""
+        (temp_project_dir / "Pipfile").write_text("[packages]\ndjango = '*'\n")
+
+        assert ProjectDetector(temp_project_dir).detect_project_type()["has_pipfile"]
+        assert DependencyDetector(temp_project_dir).get_dependency_file()[0] == "Pipfile"
@@ -0,0 +1,168 @@
+"""Tests for install timing and history."""
+
+from click.testing import CliRunner
+
+from envwizard.cli.main import cli
+from envwizard.install_history import InstallHistory, InstallTimer
+from envwizard.venv import VirtualEnvManager
+
+# pip 23 output when piped, with the second each line arrives at
+PIP_OUTPUT = [
+    (0, "Processing /opt/wheels/files/six-1.17.0-py2.py3-none-any.whl"),
+    (1, "Collecting termcolor==1.1.0"),
+    (2, "  Downloading https://example.org/termcolor-1.1.0.tar.gz (3.9 kB)"),
+    (3, "  Preparing metadata (pyproject.toml): started"),
+    (4, "  Preparing metadata (pyproject.toml): finished with status 'done'"),
+    (5, "Requirement already satisfied: idna in ./venv/lib/python3.11/site-packages"),
+    (6, "Building wheels for collected packages: termcolor"),
+    (7, "  Building wheel for termcolor (pyproject.toml): started"),
+    (15, "  Building wheel for termcolor (pyproject.toml): finished with status 'done'"),
+    (16, "  Created wheel for termcolor: filename=termcolor-1.1.0-py3-none-any.whl size=4902"),
+    (17, "Successfully built termcolor"),
+    (18, "Installing collected packages: termcolor, six"),
+    (20, "Successfully installed six-1.17.0 termcolor-1.1.0"),
+]
+
+
+def timed(lines, returncode=0, **context):
+    """Feed pip output through a timer driven by a fake clock."""
+    now = [0.0]
+    seen = []
+    timer = InstallTimer(seen.append, clock=lambda: now[0])
+    for second, line in lines:
+        now[0] = second
+        timer.feed(line)
+    assert seen == [line for _, line in lines]
+    return timer.record(returncode, **context)
+
+
+class TestInstallTimer:
+    """Tests for timing packages from pip output."""
+
+    def test_package_timings(self):
+        """Test download, build and install attribution."""
+        record = timed(PIP_OUTPUT, project="/p")
+
+        assert record["project"] == "/p"
+        assert record["total_seconds"] == 20
+        assert record["install_seconds"] == 2
+        assert record["packages"] == [
+            {
+                "name": "six",
+                "version": "1.17.0",
+                "download_seconds": 1,
+                "build_seconds": 0,
+                "source_build": False,
+            },
+            {
+                "name": "termcolor",
+                "version": "1.1.0",
+                "download_seconds": 4,
+                "build_seconds": 8,
+                "source_build": True,
+            },
+        ]
+
+    def test_merge_concurrent_runs(self):
+        """Test that the timings of parallel workers add up in one record."""
+        now = [0.0]
+        timer = InstallTimer(clock=lambda: now[0])
+        workers = [InstallTimer(clock=lambda: now[0]) for _ in range(2)]
+        workers[0].feed("Collecting six==1.17.0")
+        workers[1].feed("Collecting idna==3.6")
+        now[0] = 2
+        workers[0].feed("Installing collected packages: six")
+        workers[1].feed("Installing collected packages: idna")
+        now[0] = 3
+        workers[0].feed("Successfully installed six-1.17.0")
+        workers[1].feed("Successfully installed idna-3.6")
+        for worker in workers:
+            timer.merge(worker)
+
+        record = timer.record(0)
+        assert record["install_seconds"] == 2
+        assert [(p["name"], p["version"], p["download_seconds"]) for p in record["packages"]] == [
+            ("six", "1.17.0", 2),
+            ("idna", "3.6", 2),
+        ]
+
+    def test_failed_run(self):
+        """Test that a run cut short still records what was collected."""
+        record = timed([(0, "Collecting nosuchpkg"), (3, "ERROR: No matching distribution")], 1)
+
+        assert record["returncode"] == 1
+        assert record["packages"][0]["name"] == "nosuchpkg"
+        assert record["packages"][0]["version"] is None
+        assert record["packages"][0]["download_seconds"] == 3
+
+
+class TestInstallHistory:
+    """Tests for the history file and its summaries."""
+
+    def test_runs_and_reports(self, user_cache_dir):
+        """Test slowest-first reports, source builds and regressions."""
+        history = InstallHistory(user_cache_dir)
+        for build_end in (15, 16, 40):
+            lines = [(t if t < 15 else t - 15 + build_end, line) for t, line in PIP_OUTPUT]
+            history.append(timed(lines, project="/p"))
+        history.append(timed(PIP_OUTPUT, project="/other"))
+        with open(history.path, "a") as f:
+            f.write('{"truncated": \n')
+
+        assert len(history.runs()) == 4
+        assert len(history.runs("/p")) == 3
+
+        termcolor, six = history.package_reports("/p")
+        assert termcolor.name == "termcolor"
+        assert termcolor.runs == 3
+        assert termcolor.source_builds == 3
+        assert termcolor.median_build_seconds == 9
+        assert termcolor.previous_median_seconds == 12.5
+        assert termcolor.regressed is True
+        assert six.source_builds == 0
+        assert six.regressed is False
+
+    def test_install_dependencies_records_run(self, temp_project_dir, monkeypatch):
+        """Test that installs are timed into the history."""
+        manager = VirtualEnvManager(temp_project_dir)
+        _, _, venv_path = manager.create_venv("venv")
+        req_file = temp_project_dir / "requirements.txt"
+        req_file.write_text("termcolor==1.1.0\nsix\n")
+
+        def fake_run(command, on_output=None):
+            for _, line in PIP_OUTPUT:
+                on_output(line)
+            return 0, []
+
+        monkeypatch.setattr("envwizard.venv.run_streamed", fake_run)
+        success, _ = manager.install_dependencies(venv_path, req_file)
+
+        assert success is True
+        (run,) = manager.install_history.runs(temp_project_dir)
+        assert run["requirements"] == "requirements.txt"
+        assert [p["name"] for p in run["packages"]] == ["six", "termcolor"]
+
+
+class TestReportCommand:
+    """Tests for `envwizard report installs`."""
+
+    def test_empty(self, user_cache_dir):
+        """Test the report without recorded installs."""
+        result = CliRunner().invoke(cli, ["report", "installs"])
+        assert result.exit_code == 0
+        assert "No installs recorded" in result.output
+
+    def test_tables(self, user_cache_dir):
+        """Test that slow packages, source builds and regressions are listed."""
+        history = InstallHistory(user_cache_dir)
+        history.append(timed(PIP_OUTPUT))
+        history.append(timed([(t * 3, line) for t, line in PIP_OUTPUT]))
+
+        result = CliRunner().invoke(cli, ["report", "installs", "--limit", "5"])
+
+        assert result.exit_code == 0
+        assert "2 install runs" in result.output
+        assert "Slowest Packages" in result.output
+        assert "Built From Source" in result.output
+        assert "Regressions" in result.output
+        assert "termcolor" in result.output
@@ -0,0 +1,428 @@
+"""Tests for delta install planning."""
+
+import pytest
+
+from envwizard.install_plan import (
+    InstallPlan,
+    evaluate_marker,
+    install_stages,
+    marker_environment,
+    plan_install,
+    specifier_contains,
+)
+from envwizard.venv import VirtualEnvManager
+from envwizard.venv_metadata import installed_distributions
+
+
+def make_venv(path, installed):
+    """Create a venv layout with the given {name: version} distributions."""
+    site_packages = path / "lib" / "python3.11" / "site-packages"
+    site_packages.mkdir(parents=True)
+    (path / "pyvenv.cfg").write_text("home = /usr/bin\nversion = 3.11.7\n")
+    (path / "bin").mkdir()
+    (path / "bin" / "pip").write_text("")
+    for name, version in installed.items():
+        add_distribution(site_packages, name, version)
+    return site_packages
+
+
+def add_distribution(site_packages, name, version):
+    """Write the metadata of an installed distribution."""
+    dist_info = site_packages / f"{name.replace('-', '_')}-{version}.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n\nName: not-a-header\n"
+    )
+
+
+class TestSpecifiers:
+    """Tests for PEP 440 specifier evaluation."""
+
+    @pytest.mark.parametrize(
+        "specifier,version,expected",
+        [
+            (">=2.0", "2.0", True),
+            (">=2.0,<3", "3.0", False),
+            ("==1.4.*", "1.4.2", True),
+            ("!=1.4.*", "1.4.2", False),
+            ("~=1.4.2", "1.4.9", True),
+            ("~=1.4.2", "1.5.0", False),
+            ("==1.0", "1.0.0", True),
+            ("==2.0", "2.0+local", True),
+            ("<2.0", "2.0rc1", False),
+            ("<2.0rc2", "2.0rc1", True),
+            (">1.0", "1.0.post1", False),
+            (">=1.0a1", "1.0.dev0", False),
+            ("===1.0", "1.0", True),
+        ],
+    )
+    def test_specifier_contains(self, specifier, version, expected):
+        """Test comparisons, wildcards, compatible releases and pre/post releases."""
+        assert specifier_contains(specifier, version) is expected
+
+    @pytest.mark.parametrize(
+        "specifier,version", [("==1.0+abc", "1.0"), ("about 1", "1.0"), (">=1", "unknown")]
+    )
+    def test_undecidable(self, specifier, version):
+        """Test that anything not understood is left to pip."""
+        assert specifier_contains(specifier, version) is None
+
+
+class TestMarkers:
+    """Tests for PEP 508 marker evaluation."""
+
+    @pytest.mark.parametrize(
+        "marker,expected",
+        [
+            ('python_version < "3.8"', False),
+            ('"3.12" > python_version', True),
+            ('python_full_version >= "3.11.7" and os_name == "posix"', True),
+            (
+                '(sys_platform == "win32" or python_version ~= "3.11") and "lin" in sys_platform',
+                True,
+            ),
+            ('extra == "socks" and sys_platform == "win32"', False),
+            ('extra == "socks" or sys_platform == "win32"', None),
+            ("python_version <", None),
+        ],
+    )
+    def test_evaluate_marker(self, marker, expected):
+        """Test comparisons, boolean operators and undecidable markers."""
+        environment = dict(marker_environment("3.11.7"), os_name="posix", sys_platform="linux")
+        assert evaluate_marker(marker, environment) is expected
+
+
+class TestInstallPlan:
+    """Tests for plan_install."""
+
+    def test_installed_distributions(self, tmp_path):
+        """Test that names are normalized and only the METADATA header is read."""
+        site_packages = make_venv(tmp_path, {"Typing_Extensions": "4.9.0"})
+        assert installed_distributions(site_packages) == {"typing-extensions": "4.9.0"}
+
+    def test_pending_and_satisfied(self, tmp_path):
+        """Test that only missing or out-of-spec requirements are pending."""
+        make_venv(tmp_path / "venv", {"django": "4.2.1", "six": "1.16.0", "idna": "2.0"})
+        req_file = tmp_path / "requirements.txt"
+        req_file.write_text(
+            "Django>=4.0,<5  # web\n"
+            "six\n"
+            "idna>=3\n"
+            "requests\n"
+            "urllib3[socks]>=1\n"
+            'tomli; python_version < "3.11"\n'
+        )
+
+        plan = plan_install(tmp_path / "venv", req_file)
+
+        assert plan.satisfied == ["Django>=4.0,<5", "six"]
+        assert plan.pending == [
+            "idna>=3",
+            "requests",
+            "urllib3[socks]>=1",
+            'tomli; python_version < "3.11"',
+        ]
+
+    def test_includes_and_options(self, tmp_path):
+        """Test -r includes and that option paths are made absolute."""
+        make_venv(tmp_path / "venv", {"six": "1.16.0"})
+        (tmp_path / "constraints.txt").write_text("six<2\n")
+        (tmp_path / "base.txt").write_text("six\n-c constraints.txt\n")
+        req_file = tmp_path / "requirements.txt"
+        req_file.write_text("-r base.txt\n--index-url https://example.org/simple\n-e ./pkg\n")
+        (tmp_path / "pkg").mkdir()
+
+        plan = plan_install(tmp_path / "venv", req_file)
+
+        assert plan.satisfied == ["six"]
+        assert plan.pending == [f"--editable={tmp_path / 'pkg'}"]
+        assert plan.options == [
+            "-c",
+            str(tmp_path / "constraints.txt"),
+            "--index-url",
+            "https://example.org/simple",
+        ]
+
+    def test_hashes_are_not_planned(self, tmp_path):
+        """Test that hash-checking files that are not locks are installed as a whole."""
+        make_venv(tmp_path / "venv", {})
+        (tmp_path / "base.txt").write_text("idna==3.6 --hash=sha256:def\n")
+        req_file = tmp_path / "requirements.txt"
+        req_file.write_text("-r base.txt\nsix==1.16.0 --hash=sha256:abc\n")
+
+        assert plan_install(tmp_path / "venv", req_file) is None
+
+    def test_pyproject_runtime_dependencies(self, tmp_path):
+        """Test that pyproject.toml is planned from its runtime dependencies."""
+        make_venv(tmp_path / "venv", {"click": "8.1.7"})
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text(
+            '[project]\nname = "demo"\ndependencies = ["click>=8", "rich"]\n'
+            '[project.optional-dependencies]\ndev = ["pytest"]\n'
+        )
+
+        plan = plan_install(tmp_path / "venv", pyproject)
+
+        assert plan.satisfied == ["click>=8"]
+        assert plan.pending == ["rich"]
+
+    def test_poetry_pyproject(self, tmp_path):
+        """Test that a Poetry project is planned with constraints pip accepts."""
+        make_venv(tmp_path / "venv", {"click": "8.1.7"})
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text(
+            "[tool.poetry]\n"
+            'name = "demo"\n'
+            'version = "0.1.0"\n'
+            'description = ""\n'
+            'authors = ["Demo <demo@example.org>"]\n'
+            "\n"
+            "[tool.poetry.dependencies]\n"
+            'python = "^3.9"\n'
+            'requests = {version = "^2.28", extras = ["socks"]}\n'
+            'click = "~8.1"\n'
+            'rich = "*"\n'
+            "\n"
+            "[tool.poetry.group.dev.dependencies]\n"
+            'pytest = "^7.0"\n'
+            "\n"
+            "[build-system]\n"
+            'requires = ["poetry-core"]\n'
+            'build-backend = "poetry.core.masonry.api"\n'
+        )
+
+        plan = plan_install(tmp_path / "venv", pyproject)
+
+        assert plan.satisfied == ["click>=8.1,<8.2"]
+        assert plan.pending == ["requests[socks]>=2.28,<3.0", "rich"]
+        requirements = pytest.importorskip("packaging.requirements")
+        for spec in plan.pending + plan.satisfied:
+            requirements.Requirement(spec)
+
+    def test_poetry_git_dependency_is_not_planned(self, tmp_path):
+        """Test that Poetry sources pip cannot install by name fall back to the project."""
+        make_venv(tmp_path / "venv", {})
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text(
+            '[tool.poetry]\nname = "demo"\nversion = "0.1.0"\n\n'
+            "[tool.poetry.dependencies]\n"
+            'python = "^3.9"\n'
+            'mylib = {git = "https://example.org/mylib.git", tag = "v1.0"}\n'
+        )
+
+        assert plan_install(tmp_path / "venv", pyproject) is None
+
+
+class TestLockedPlan:
+    """Tests for plans of exact install sets."""
+
+    def test_locked_plan(self, tmp_path):
+        """Test exact versions, skipped markers and hashes."""
+        make_venv(tmp_path / "venv", {"six": "1.16.0", "idna": "3.4"})
+        req_file = tmp_path / "requirements.txt"
+        req_file.write_text(
+            "six==1.16.0 --hash=sha256:aaa\n"
+            "idna==3.6 --hash=sha256:bbb\n"
+            'pywin32==306 ; sys_platform == "win32" and os_name == "nt" --hash=sha256:ccc\n'
+        )
+
+        plan = plan_install(tmp_path / "venv", req_file)
+
+        assert plan.locked is True
+        assert plan.satisfied == ["six==1.16.0"]
+        assert plan.pending == ["idna==3.6"]
+        assert plan.hashes == {"idna==3.6": ("sha256:bbb",)}
+
+
+class TestInstallStages:
+    """Tests for splitting exact sets by their dependency graph."""
+
+    def test_stages_follow_dependencies(self):
+        """Test that dependents come after their dependencies, batched by jobs."""
+        plan = InstallPlan(
+            ["app==1", "web==1", "a==1", "b==1", "c==1"],
+            [],
+            [],
+            locked=True,
+            dependencies={"app==1": ("web==1", "a==1"), "web==1": ("b==1", "c==1")},
+        )
+
+        assert install_stages(plan, 2) == [
+            [["a==1", "c==1"], ["b==1"]],
+            [["web==1"]],
+            [["app==1"]],
+        ]
+        assert install_stages(plan, 1)[0] == [["a==1", "b==1", "c==1"]]
+
+    def test_cycle_shares_last_stage(self):
+        """Test that a dependency cycle does not stop the split."""
+        plan = InstallPlan(
+            ["a==1", "b==1", "c==1"],
+            [],
+            [],
+            locked=True,
+            dependencies={"a==1": ("b==1",), "b==1": ("a==1",)},
+        )
+
+        assert install_stages(plan, 4) == [[["c==1"]], [["a==1"], ["b==1"]]]
+
+
+class TestDeltaInstall:
+    """Tests for install_dependencies with a plan."""
+
+    def test_satisfied_venv_spawns_nothing(self, tmp_path, monkeypatch):
+        """Test that a satisfied venv is reported without running pip."""
+        make_venv(tmp_path / "venv", {"six": "1.16.0"})
+        req_file = tmp_path / "requirements.txt"
+        req_file.write_text("six>=1.0\n")
+
+        def no_subprocess(*args, **kwargs):
+            raise AssertionError("pip was started")
+
+        monkeypatch.setattr("subprocess.run", no_subprocess)
+        monkeypatch.setattr("subprocess.Popen", no_subprocess)
+        success, message = VirtualEnvManager(tmp_path).install_dependencies(
+            tmp_path / "venv", req_file
+        )
+
+        assert success is True
+        assert "already satisfied" in message
+
+    def test_only_pending_requirements_reach_pip(self, tmp_path, monkeypatch):
+        """Test that one pip call installs just what is missing."""
+        make_venv(tmp_path / "venv", {"six": "1.16.0"})
+        req_file = tmp_path / "requirements.txt"
+        req_file.write_text("six>=1.0\nidna\n")
+
+        commands = []
+
+        def fake_run(command, on_output=None):
+            commands.append(command)
+            return 0, []
+
+        monkeypatch.setattr("envwizard.venv.run_streamed", fake_run)
+        success, message = VirtualEnvManager(tmp_path).install_dependencies(
+            tmp_path / "venv", req_file
+        )
+
+        assert success is True
+        python = str(tmp_path / "venv" / "bin" / "python")
+        assert commands == [[python, "-m", "pip", "install", "--upgrade", "pip", "idna"]]
+        assert "1 already satisfied" in message
+
+    def test_lock_is_installed_without_resolving(self, tmp_path, monkeypatch):
+        """Test that a hashed lock goes through a hash-checked --no-deps run."""
+        make_venv(tmp_path / "venv", {})
+        req_file = tmp_path / "requirements.txt"
+        req_file.write_text("idna==3.6 --hash=sha256:bbb\nsix==1.16.0 --hash=sha256:aaa\n")
+        commands = []
+        locked_lines = []
+
+        def fake_run(command, on_output=None):
+            commands.append(command[1:])
+            if "-r" in command:
+                with open(command[command.index("-r") + 1]) as f:
+                    locked_lines.extend(f.read().splitlines())
+            return 0, []
+
+        monkeypatch.setattr("envwizard.venv.run_streamed", fake_run)
+        success, message = VirtualEnvManager(tmp_path).install_dependencies(
+            tmp_path / "venv", req_file
+        )
+
+        assert success is True
+        assert "without resolving" in message
+        assert commands[0] == ["-m", "pip", "install", "--upgrade", "pip"]
+        assert commands[1][:4] == ["-m", "pip", "install", "--no-deps"]
+        assert commands[1][-2] == "-r"
+        assert locked_lines == ["idna==3.6 --hash=sha256:bbb", "six==1.16.0 --hash=sha256:aaa"]
+
+    def test_setup_py_is_installed_as_project(self, tmp_path, monkeypatch):
+        """Test that setup.py is not handed to pip install -r."""
+        make_venv(tmp_path / "venv", {})
+        (tmp_path / "setup.py").write_text("from setuptools import setup\nsetup()\n")
+        commands = []
+
+        def fake_run(command, on_output=None):
+            commands.append(command[1:])
+            return 0, []
+
+        monkeypatch.setattr("envwizard.venv.run_streamed", fake_run)
+        VirtualEnvManager(tmp_path).install_dependencies(tmp_path / "venv", tmp_path / "setup.py")
+
+        assert commands[-1] == ["-m", "pip", "install", "-e", str(tmp_path)]
+
+
+def poetry_lock(count):
+    """A poetry.lock of `count` leaf packages and one package depending on all of them."""
+    packages = [f'[[package]]\nname = "leaf{i}"\nversion = "1.0"\n' for i in range(count)]
+    dependencies = "".join(f'leaf{i} = "*"\n' for i in range(count))
+    packages.append(
+        f'[[package]]\nname = "app"\nversion = "2.0"\n\n[package.dependencies]\n{dependencies}'
+    )
+    return "\n".join(packages)
+
+
+class TestParallelInstall:
+    """Tests for installing exact sets with concurrent pip workers."""
+
+    def fake_pip(self, site_packages, commands, skip=()):
+        """A run_streamed stand-in that installs the pins it is given."""
+
+        def fake_run(command, on_output=None):
+            commands.append(command[1:])
+            for spec in command:
+                name, _, version = spec.partition("==")
+                if version and name not in skip:
+                    add_distribution(site_packages, name, version)
+            return 0, []
+
+        return fake_run
+
+    def test_workers_follow_the_graph(self, tmp_path, monkeypatch):
+        """Test that leaves go to concurrent workers before their dependent."""
+        site_packages = make_venv(tmp_path / "venv", {})
+        (tmp_path / "poetry.lock").write_text(poetry_lock(8))
+        commands = []
+        monkeypatch.setattr("envwizard.venv.run_streamed", self.fake_pip(site_packages, commands))
+
+        success, message = VirtualEnvManager(tmp_path).install_dependencies(
+            tmp_path / "venv", tmp_path / "poetry.lock", jobs=3
+        )
+
+        assert success is True, message
+        assert commands[0] == ["-m", "pip", "install", "--upgrade", "pip"]
+        leaves = commands[1:4]
+        assert all(command[:4] == ["-m", "pip", "install", "--no-deps"] for command in leaves)
+        assert sorted(spec for command in leaves for spec in command[4:]) == sorted(
+            f"leaf{i}==1.0" for i in range(8)
+        )
+        assert commands[4] == ["-m", "pip", "install", "--no-deps", "app==2.0"]
+
+    def test_small_sets_use_one_run(self, tmp_path, monkeypatch):
+        """Test that a few packages are not split across workers."""
+        site_packages = make_venv(tmp_path / "venv", {})
+        (tmp_path / "poetry.lock").write_text(poetry_lock(3))
+        commands = []
+        monkeypatch.setattr("envwizard.venv.run_streamed", self.fake_pip(site_packages, commands))
+
+        VirtualEnvManager(tmp_path).install_dependencies(
+            tmp_path / "venv", tmp_path / "poetry.lock", jobs=3
+        )
+
+        assert len(commands) == 1
+
+    def test_consistency_check(self, tmp_path, monkeypatch):
+        """Test that a pin missing after the workers fails the install."""
+        site_packages = make_venv(tmp_path / "venv", {})
+        (tmp_path / "poetry.lock").write_text(poetry_lock(8))
+        monkeypatch.setattr(
+            "envwizard.venv.run_streamed", self.fake_pip(site_packages, [], skip=("leaf5",))
+        )
+
+        success, message = VirtualEnvManager(tmp_path).install_dependencies(
+            tmp_path / "venv", tmp_path / "poetry.lock", jobs=3
+        )
+
+        assert success is False
+        assert message.endswith("Not installed by the parallel install: leaf5==1.0")
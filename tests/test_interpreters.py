@@ -0,0 +1,141 @@
+"""Tests for interpreter discovery."""
+
+import os
+import sys
+
+import pytest
+
+from envwizard.interpreters import (
+    InterpreterRegistry,
+    parse_python_requirement,
+    probe_version,
+    version_matches,
+)
+from envwizard.venv import VirtualEnvManager
+
+
+def _fake_interpreter(directory, name, version):
+    """Create an executable that looks like a venv interpreter of a given version."""
+    bin_dir = directory / "bin"
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    (directory / "pyvenv.cfg").write_text(f"home = /usr/bin\nversion = {version}\n")
+    exe = bin_dir / name
+    exe.write_text("#!/bin/sh\nexit 1\n")
+    exe.chmod(0o755)
+    return exe
+
+
+class TestVersionMatching:
+    """Tests for requires-python matching."""
+
+    @pytest.mark.parametrize(
+        "spec, version, expected",
+        [
+            ("3.11", (3, 11, 7), True),
+            ("3.11", (3, 12, 0), False),
+            (">=3.8", (3, 11, 7), True),
+            (">=3.8,<3.11", (3, 11, 0), False),
+            ("~=3.10", (3, 12, 1), True),
+            ("~=3.10.2", (3, 11, 0), False),
+            ("==3.11.*", (3, 11, 2), True),
+            ("!=3.11.*", (3, 11, 2), False),
+            ("^3.10", (3, 13, 0), True),
+            ("^3.10", (4, 0, 0), False),
+            ("~3.10", (3, 10, 9), True),
+            ("~3.10", (3, 11, 0), False),
+        ],
+    )
+    def test_specifiers(self, spec, version, expected):
+        """Test PEP 440 and Poetry style specifiers."""
+        assert version_matches(version, spec) is expected
+
+    @pytest.mark.parametrize("spec", ["3.9; rm -rf /", "python3.9", ">=3.8 || <2", "3.9.x", ""])
+    def test_rejects_non_specifiers(self, spec):
+        """Test that anything but a version requirement is refused."""
+        assert parse_python_requirement(spec) is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX executables")
+class TestInterpreterRegistry:
+    """Tests for InterpreterRegistry discovery and caching."""
+
+    def test_version_from_pyvenv_cfg_without_running(self, tmp_path):
+        """Test that venv interpreters are identified from pyvenv.cfg."""
+        exe = _fake_interpreter(tmp_path / "env", "python3", "3.10.4")
+
+        assert probe_version(exe) == (3, 10, 4)
+
+    def test_find_matches_versions_only(self, tmp_path, user_cache_dir):
+        """Test that a mismatching python3 is not accepted."""
+        _fake_interpreter(tmp_path / "a", "python3", "3.7.9")
+        _fake_interpreter(tmp_path / "b", "python3.10", "3.10.4")
+        dirs = [str(tmp_path / "a" / "bin"), str(tmp_path / "b" / "bin")]
+        registry = InterpreterRegistry(user_cache_dir, search_dirs=dirs)
+
+        found = registry.find("~=3.10.0")
+
+        assert found is not None
+        assert found.path.endswith("python3.10")
+        assert registry.find("3.7").version == (3, 7, 9)
+        assert registry.find("==2.7.*") is None
+
+    def test_cache_avoids_probing(self, tmp_path, user_cache_dir, monkeypatch):
+        """Test that unchanged interpreters are not probed again."""
+        import envwizard.interpreters as interpreters_module
+
+        exe = _fake_interpreter(tmp_path / "a", "python3.9", "3.9.18")
+        dirs = [str(exe.parent)]
+        probes = []
+        probe = interpreters_module.probe_version
+
+        def counting_probe(path):
+            probes.append(path)
+            return probe(path)
+
+        monkeypatch.setattr(interpreters_module, "probe_version", counting_probe)
+        InterpreterRegistry(user_cache_dir, search_dirs=dirs).discover()
+        InterpreterRegistry(user_cache_dir, search_dirs=dirs).discover()
+        assert len(probes) == 1
+
+        (tmp_path / "a" / "pyvenv.cfg").write_text("version = 3.9.19\n")
+        os.utime(exe, ns=(0, 0))
+        registry = InterpreterRegistry(user_cache_dir, search_dirs=dirs)
+        assert registry.find("3.9").version == (3, 9, 19)
+        assert len(probes) == 2
+
+    def test_version_of_runs_interpreter_once(self, tmp_path, user_cache_dir):
+        """Test that an interpreter without metadata is run once, then cached by stat."""
+        exe = tmp_path / "bin" / "python3.8"
+        exe.parent.mkdir()
+        runs = tmp_path / "runs"
+        exe.write_text(f"#!/bin/sh\necho run >> {runs}\necho 3.8.18\n")
+        exe.chmod(0o755)
+
+        assert InterpreterRegistry(user_cache_dir).version_of(str(exe)) == (3, 8, 18)
+        assert InterpreterRegistry(user_cache_dir).version_of(str(exe)) == (3, 8, 18)
+        assert runs.read_text().count("run") == 1
+
+        exe.write_text(f"#!/bin/sh\necho run >> {runs}\necho 3.8.19\n")
+        os.utime(exe, ns=(0, 0))
+        assert InterpreterRegistry(user_cache_dir).version_of(str(exe)) == (3, 8, 19)
+        assert runs.read_text().count("run") == 2
+
+    def test_running_interpreter_preferred(self, user_cache_dir):
+        """Test that the current interpreter wins when it satisfies the request."""
+        registry = InterpreterRegistry(user_cache_dir, search_dirs=[])
+        current = "{}.{}".format(*sys.version_info[:2])
+
+        assert registry.find(current).path == sys.executable
+        assert registry.find(f">={current}").path == sys.executable
+
+
+class TestCreateVenvWithSpecifier:
+    """Tests for create_venv with requires-python specifiers."""
+
+    def test_unmatched_requirement_fails(self, temp_project_dir):
+        """Test that no interpreter is picked when none matches."""
+        manager = VirtualEnvManager(temp_project_dir)
+        success, message, _ = manager.create_venv("test_venv", python_version="<2")
+
+        assert success is False
+        assert "No installed Python matches" in message
@@ -0,0 +1,184 @@
+"""Tests for reading lockfiles and pinned requirements files."""
+
+import json
+
+import pytest
+
+from envwizard.detectors.dependency import DependencyDetector
+from envwizard.detectors.lockfile import (
+    parse_pinned_requirements,
+    parse_pipfile_lock,
+    parse_poetry_lock,
+    read_lockfile,
+)
+
+POETRY_LOCK = b"""
+[[package]]
+name = "requests"
+version = "2.31.0"
+optional = false
+python-versions = ">=3.7"
+files = [
+    {file = "requests-2.31.0-py3-none-any.whl", hash = "sha256:aaa"},
+    {file = "requests-2.31.0.tar.gz", hash = "sha256:bbb"},
+]
+
+[package.dependencies]
+idna = ">=2.5,<4"
+colorama = {version = "*", markers = "platform_system == \\"Windows\\""}
+PySocks = {version = ">=1.5.6", optional = true}
+
+[[package]]
+name = "idna"
+version = "3.6"
+optional = false
+files = [{file = "idna-3.6-py3-none-any.whl", hash = "sha256:ccc"}]
+
+[[package]]
+name = "colorama"
+version = "0.4.6"
+optional = false
+files = [{file = "colorama-0.4.6-py2.py3-none-any.whl", hash = "sha256:ddd"}]
+
+[[package]]
+name = "pysocks"
+version = "1.7.1"
+optional = true
+files = []
+
+[[package]]
+name = "internal-lib"
+version = "1.0"
+optional = false
+files = [{file = "internal_lib-1.0.tar.gz", hash = "sha256:eee"}]
+
+[package.source]
+type = "legacy"
+url = "https://pypi.example.org/simple"
+reference = "internal"
+
+[metadata]
+lock-version = "2.0"
+python-versions = "^3.9"
+content-hash = "0123"
+"""
+
+PIPFILE_LOCK = {
+    "_meta": {"sources": [{"name": "pypi", "url": "https://pypi.org/simple"}]},
+    "default": {
+        "django": {"hashes": ["sha256:aaa"], "version": "==4.2.7"},
+        "tzdata": {
+            "hashes": ["sha256:bbb"],
+            "markers": "sys_platform == 'win32'",
+            "version": "==2023.3",
+        },
+    },
+    "develop": {"pytest": {"hashes": ["sha256:ccc"], "version": "==7.4.3"}},
+}
+
+
+class TestPoetryLock:
+    """Tests for poetry.lock."""
+
+    def test_packages_markers_and_sources(self):
+        """Test the install set, edge markers, hashes and private indexes."""
+        locked = parse_poetry_lock(POETRY_LOCK)
+
+        specs = [r.spec for r in locked.requirements]
+        assert specs == [
+            "requests==2.31.0",
+            "idna==3.6",
+            'colorama==0.4.6; platform_system == "Windows"',
+            "internal-lib==1.0",
+        ]
+        assert locked.requirements[0].hashes == ("sha256:aaa", "sha256:bbb")
+        assert locked.requirements[0].dependencies == ("idna", "colorama", "pysocks")
+        assert locked.hashed is True
+        assert locked.options == ("--extra-index-url", "https://pypi.example.org/simple")
+
+    def test_git_source_is_not_locked(self):
+        """Test that locks with VCS sources fall back to the manifest."""
+        content = POETRY_LOCK.replace(b'type = "legacy"', b'type = "git"')
+        assert parse_poetry_lock(content) is None
+
+
+class TestPipfileLock:
+    """Tests for Pipfile.lock."""
+
+    def test_default_section(self):
+        """Test that the default section and the sources are used."""
+        locked = parse_pipfile_lock(json.dumps(PIPFILE_LOCK).encode())
+
+        assert [r.spec for r in locked.requirements] == [
+            "django==4.2.7",
+            "tzdata==2023.3; sys_platform == 'win32'",
+        ]
+        assert locked.options == ("--index-url", "https://pypi.org/simple")
+
+    def test_unpinned_entry(self):
+        """Test that VCS and path entries are not locked."""
+        data = dict(PIPFILE_LOCK, default={"demo": {"path": ".", "editable": True}})
+        assert parse_pipfile_lock(json.dumps(data).encode()) is None
+
+
+class TestPinnedRequirements:
+    """Tests for requirements files that lock a complete set."""
+
+    def test_hashed(self):
+        """Test a hash-checked file with continuation lines and markers."""
+        locked = parse_pinned_requirements(
+            "--index-url https://pypi.org/simple\n"
+            "six==1.16.0 \\\n    --hash=sha256:aaa \\\n    --hash=sha256:bbb\n"
+            'tomli==2.0.1 ; python_version < "3.11" \\\n    --hash=sha256:ccc\n'
+        )
+
+        assert [r.spec for r in locked.requirements] == [
+            "six==1.16.0",
+            'tomli==2.0.1; python_version < "3.11"',
+        ]
+        assert locked.requirements[0].hashes == ("sha256:aaa", "sha256:bbb")
+        assert locked.options == ("--index-url", "https://pypi.org/simple")
+
+    def test_compiled(self):
+        """Test pip-compile output without hashes."""
+        locked = parse_pinned_requirements(
+            "asgiref==3.7.2\n    # via django\ndjango==4.2.7\n    # via -r requirements.in\n"
+        )
+        assert [r.pin for r in locked.requirements] == ["asgiref==3.7.2", "django==4.2.7"]
+        assert locked.hashed is False
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "django==4.2.7\nrequests==2.31.0\n",
+            "django>=4.2\n    # via -r requirements.in\n",
+            "django==4.2.*\n    # via -r requirements.in\n",
+            "-r base.txt\ndjango==4.2.7 --hash=sha256:aaa\n",
+            "-e ./lib\ndjango==4.2.7 --hash=sha256:aaa\n",
+        ],
+    )
+    def test_not_a_lock(self, text):
+        """Test that hand-written, unpinned or incomplete files are not locks."""
+        assert parse_pinned_requirements(text) is None
+
+
+class TestLockDetection:
+    """Tests for choosing the install file."""
+
+    def test_lockfile_takes_precedence(self, temp_project_dir):
+        """Test that poetry.lock is installed instead of pyproject.toml."""
+        (temp_project_dir / "pyproject.toml").write_text('[tool.poetry]\nname = "demo"\n')
+        (temp_project_dir / "poetry.lock").write_bytes(POETRY_LOCK)
+        detector = DependencyDetector(temp_project_dir)
+
+        assert detector.get_dependency_file()[0] == "pyproject.toml"
+        assert detector.get_install_file()[0] == "poetry.lock"
+        assert "idna==3.6" in detector.get_dependency_set()
+        assert read_lockfile(temp_project_dir / "poetry.lock") is not None
+
+    def test_lockfile_of_other_manifest_is_ignored(self, temp_project_dir):
+        """Test that a Pipfile.lock does not lock a requirements.txt project."""
+        (temp_project_dir / "requirements.txt").write_text("django\n")
+        (temp_project_dir / "Pipfile.lock").write_text(json.dumps(PIPFILE_LOCK))
+
+        assert DependencyDetector(temp_project_dir).get_install_file()[0] == "requirements.txt"
@@ -0,0 +1,177 @@
+"""Tests for the parsed project manifest."""
+
+import pytest
+
+from envwizard.core import EnvWizard
+from envwizard.detectors import DependencyDetector, ProjectIndex, ProjectManifest
+from envwizard.detectors.manifest import (
+    parse_requirements_text,
+    poetry_constraint,
+    poetry_requirement,
+)
+
+
+def _manifest(path):
+    return ProjectManifest(ProjectIndex(path))
+
+
+class TestRequirementParsing:
+    """Tests for the individual manifest formats."""
+
+    def test_requirements_text(self):
+        """Test that options, comments and bare URLs are skipped."""
+        text = (
+            "# comment\n"
+            "Django[argon2]>=4.2  # web\n"
+            "-r base.txt\n"
+            "-e .\n"
+            "git+https://example.com/repo.git\n"
+            "pkg @ https://example.com/pkg.whl\n"
+        )
+        requirements = parse_requirements_text(text, "requirements.txt")
+
+        assert [r.name for r in requirements] == ["Django", "pkg"]
+        assert requirements[0].spec == "Django[argon2]>=4.2"
+        assert requirements[0].key == "django"
+
+    def test_requirements_groups_from_filename(self, temp_project_dir):
+        """Test that requirements-dev.txt lands in the dev group."""
+        (temp_project_dir / "requirements.txt").write_text("flask\n")
+        (temp_project_dir / "requirements-dev.txt").write_text("pytest\n")
+        manifest = _manifest(temp_project_dir)
+
+        assert [r.name for r in manifest.runtime_requirements()] == ["flask"]
+        assert {r.name: r.group for r in manifest.requirements()} == {
+            "flask": None,
+            "pytest": "dev",
+        }
+
+    def test_pyproject_pep621_and_poetry(self, temp_project_dir):
+        """Test PEP 621 dependencies, extras and Poetry groups."""
+        (temp_project_dir / "pyproject.toml").write_text(
+            "[project]\n"
+            'requires-python = ">=3.10"\n'
+            'dependencies = ["fastapi>=0.100"]\n'
+            "[project.optional-dependencies]\n"
+            'test = ["pytest"]\n'
+            "[tool.poetry.dependencies]\n"
+            'python = "^3.10"\n'
+            'celery = "^5.0"\n'
+            'redis = "*"\n'
+            "[tool.poetry.group.dev.dependencies]\n"
+            'black = "*"\n'
+        )
+        manifest = _manifest(temp_project_dir)
+
+        runtime = [r.spec for r in manifest.runtime_requirements()]
+        assert runtime == ["fastapi>=0.100", "celery>=5.0,<6.0", "redis"]
+        assert manifest.groups("pyproject.toml") == {"test", "dev"}
+        assert manifest.requires_python == ">=3.10"
+
+    @pytest.mark.parametrize(
+        "constraint,expected",
+        [
+            ("^2.28", ">=2.28,<3.0"),
+            ("^0.2.3", ">=0.2.3,<0.3.0"),
+            ("^0.0.3", ">=0.0.3,<0.0.4"),
+            ("~8.1", ">=8.1,<8.2"),
+            ("~1", ">=1,<2"),
+            ("*", ""),
+            ("1.2.3", "==1.2.3"),
+            ("1.2.*", "==1.2.*"),
+            (">= 1.2, < 1.5", ">=1.2,<1.5"),
+            (">=1.2 <2.0", ">=1.2,<2.0"),
+            ("~=1.4", "~=1.4"),
+            ("^1.0 || ^2.0", None),
+        ],
+    )
+    def test_poetry_constraint(self, constraint, expected):
+        """Test that caret, tilde and bare Poetry constraints become PEP 440."""
+        assert poetry_constraint(constraint) == expected
+
+    def test_poetry_requirement_tables(self):
+        """Test extras, markers and python keys, and sources pip cannot install by name."""
+        assert poetry_requirement("requests", {"version": "^2.28", "extras": ["socks"]}) == (
+            "requests[socks]>=2.28,<3.0"
+        )
+        assert poetry_requirement("tomli", {"version": "^2.0", "python": "<3.11"}) == (
+            'tomli>=2.0,<3.0; python_version < "3.11"'
+        )
+        assert poetry_requirement("mylib", {"git": "https://example.org/mylib.git"}) is None
+        assert poetry_requirement("foo", [{"version": "1.0", "python": "<3.9"}]) is None
+
+    def test_pipfile(self, temp_project_dir):
+        """Test Pipfile packages and dev-packages."""
+        (temp_project_dir / "Pipfile").write_text(
+            '[packages]\ndjango = "==4.2"\nrequests = "*"\n\n[dev-packages]\npytest = "*"\n'
+        )
+        manifest = _manifest(temp_project_dir)
+
+        assert [r.spec for r in manifest.runtime_requirements()] == ["django==4.2", "requests"]
+        assert manifest.groups("Pipfile") == {"dev"}
+
+    def test_setup_cfg(self, temp_project_dir):
+        """Test install_requires, extras_require and python_requires."""
+        (temp_project_dir / "setup.cfg").write_text(
+            "[options]\n"
+            "python_requires = >=3.9\n"
+            "install_requires =\n"
+            "    flask>=2\n"
+            "    sqlalchemy\n"
+            "[options.extras_require]\n"
+            "postgres = psycopg2\n"
+        )
+        manifest = _manifest(temp_project_dir)
+
+        assert [r.name for r in manifest.runtime_requirements()] == ["flask", "sqlalchemy"]
+        assert manifest.groups("setup.cfg") == {"postgres"}
+        assert manifest.requires_python == ">=3.9"
+
+    def test_invalid_files_are_empty(self, temp_project_dir):
+        """Test that broken manifests yield no requirements."""
+        (temp_project_dir / "pyproject.toml").write_text("[project\n")
+        (temp_project_dir / "setup.cfg").write_text("not ini\n")
+
+        assert _manifest(temp_project_dir).requirements() == []
+
+
+class TestSharedManifest:
+    """Tests that detectors consume one parsed manifest."""
+
+    def test_each_file_parsed_once(self, temp_project_dir, monkeypatch):
+        """Test that a full analysis reads every manifest file a single time."""
+        import envwizard.detectors.manifest as manifest_module
+
+        (temp_project_dir / "requirements.txt").write_text("django\npsycopg2\n")
+        (temp_project_dir / "pyproject.toml").write_text(
+            '[project]\nrequires-python = ">=3.10"\ndependencies = ["celery"]\n'
+        )
+        calls = []
+        parse = manifest_module.parse_manifest
+
+        def counting_parse(name, content, source):
+            calls.append(source)
+            return parse(name, content, source)
+
+        monkeypatch.setattr(manifest_module, "parse_manifest", counting_parse)
+        wizard = EnvWizard(temp_project_dir, use_cache=False)
+        info = wizard.get_project_info()
+        wizard.dependency_detector.get_all_dependencies()
+        wizard.dependency_detector.has_dev_dependencies()
+        wizard.dotenv_generator.generate_dotenv(info["frameworks"])
+
+        assert {"django", "celery"} <= set(info["frameworks"])
+        assert info["python_version"] == ">=3.10"
+        assert sorted(calls) == ["pyproject.toml", "requirements.txt"]
+        assert "POSTGRES_HOST" in (temp_project_dir / ".env").read_text()
+
+    def test_dev_dependencies_from_poetry_group(self, temp_project_dir):
+        """Test that Poetry dependency groups count as dev dependencies."""
+        (temp_project_dir / "pyproject.toml").write_text(
+            "[tool.poetry.dependencies]\n"
+            'python = "^3.10"\n'
+            "[tool.poetry.group.dev.dependencies]\n"
+            'pytest = "*"\n'
+        )
+
+        assert DependencyDetector(temp_project_dir).has_dev_dependencies()
@@ -0,0 +1,199 @@
+"""Tests for caching pip's resolutions."""
+
+import json
+
+from click.testing import CliRunner
+
+from envwizard.cli.main import cli
+from envwizard.resolution_cache import ResolutionCache, report_is_complete, resolved_pins
+from envwizard.venv import VirtualEnvManager
+
+ENVIRONMENT = {"sys_platform": "linux", "python_full_version": "3.11.7"}
+
+
+def dry_run_report(*pins):
+    """A `pip install --report` resolving to the given (name, version) pins."""
+    return {
+        "version": "1",
+        "install": [
+            {
+                "metadata": {"name": name, "version": version},
+                "is_direct": False,
+                "download_info": {
+                    "url": f"https://example.org/{name}-{version}-py3-none-any.whl",
+                    "archive_info": {"hashes": {"sha256": "abc"}},
+                },
+            }
+            for name, version in pins
+        ],
+    }
+
+
+def fake_pip(commands, report):
+    """A run_streamed stand-in that records commands and writes the report pip is asked for."""
+
+    def fake_run(command, on_output=None):
+        commands.append(command)
+        if "--report" in command:
+            with open(command[command.index("--report") + 1], "w") as f:
+                json.dump(report, f)
+        return 0, []
+
+    return fake_run
+
+
+class TestResolutionCache:
+    """Tests for keys and entries."""
+
+    def test_key_ignores_formatting(self, user_cache_dir):
+        """Test that reordering and reformatting requirements keeps the key."""
+        cache = ResolutionCache(user_cache_dir)
+        key = cache.key(["Django >= 4.2", "six"], [], ENVIRONMENT)
+
+        assert cache.key(["six", "django>=4.2"], [], ENVIRONMENT) == key
+        assert cache.key(["six", "django>=5.0"], [], ENVIRONMENT) != key
+        assert cache.key(["six", "django>=4.2"], ["--pre"], ENVIRONMENT) != key
+        other = dict(ENVIRONMENT, python_full_version="3.12.1")
+        assert cache.key(["six", "django>=4.2"], [], other) != key
+
+    def test_store_and_get(self, tmp_path, user_cache_dir):
+        """Test that a stored report comes back as an exact set."""
+        cache = ResolutionCache(user_cache_dir)
+        report = tmp_path / "report.json"
+        report.write_text(json.dumps(dry_run_report(("Django", "4.2.7"), ("asgiref", "3.7.2"))))
+
+        stored = cache.store("k", report, ["django>=4.2"], ["--index-url", "https://pypi.org"])
+        cached = cache.get("k")
+
+        assert stored.cached is False
+        assert cached.cached is True
+        assert [r.pin for r in cached.pins.requirements] == ["Django==4.2.7", "asgiref==3.7.2"]
+        assert cached.pins.options == ("--index-url", "https://pypi.org")
+        assert cache.remove("k") is True
+        assert cache.get("k") is None
+
+    def test_requires_dist(self):
+        """Test that Requires-Dist names are kept for the install order."""
+        report = dry_run_report(("requests", "2.31.0"))
+        report["install"][0]["metadata"]["requires_dist"] = [
+            "charset_normalizer<4,>=2",
+            "PySocks!=1.5.7,>=1.5.6; extra == 'socks'",
+        ]
+
+        (pin,) = resolved_pins(report)
+        assert pin.dependencies == ("charset-normalizer", "pysocks")
+
+    def test_report_is_complete(self):
+        """Test that applicable dependencies, with requested extras, must be reported."""
+        report = dry_run_report(("requests", "2.31.0"), ("idna", "3.6"))
+        report["install"][0]["metadata"]["requires_dist"] = [
+            "idna<4,>=2.5",
+            "PySocks!=1.5.7,>=1.5.6; extra == 'socks'",
+            "win-inet-pton; sys_platform == 'win32'",
+        ]
+
+        assert report_is_complete(report, ["requests"], ENVIRONMENT) is True
+        assert report_is_complete(report, ["requests", "six"], ENVIRONMENT) is False
+        report["install"][0]["requested_extras"] = ["socks"]
+        assert report_is_complete(report, ["requests[socks]"], ENVIRONMENT) is False
+
+    def test_direct_requirements_are_not_cached(self, tmp_path, user_cache_dir):
+        """Test that reports with URL or local distributions are not reused."""
+        report = dry_run_report(("demo", "0.1"))
+        report["install"][0]["is_direct"] = True
+        assert resolved_pins(report) is None
+
+        path = tmp_path / "report.json"
+        path.write_text(json.dumps(report))
+        assert ResolutionCache(user_cache_dir).store("k", path, ["demo"], []) is None
+
+
+class TestInstallWithResolutionCache:
+    """Tests for install_dependencies with the resolution cache."""
+
+    def test_second_install_does_not_resolve(self, temp_project_dir, monkeypatch):
+        """Test that the first install's report is cached and installed with --no-deps."""
+        manager = VirtualEnvManager(temp_project_dir)
+        _, _, venv_path = manager.create_venv("venv")
+        req_file = temp_project_dir / "requirements.txt"
+        req_file.write_text("django>=4.2\n")
+        commands = []
+        # The install upgraded pip as well
+        report = dry_run_report(("Django", "4.2.7"), ("asgiref", "3.7.2"), ("pip", "24.0"))
+        report["install"][0]["metadata"]["requires_dist"] = ["asgiref<4,>=3.6.0"]
+        monkeypatch.setattr("envwizard.venv.run_streamed", fake_pip(commands, report))
+
+        success, message = manager.install_dependencies(venv_path, req_file)
+        assert success is True
+        (install,) = commands
+        assert "--dry-run" not in install
+        assert "--no-deps" not in install
+        assert install[-1] == "django>=4.2"
+
+        commands.clear()
+        success, message = manager.install_dependencies(venv_path, req_file)
+        assert success is True
+        assert "a cached resolution" in message
+        (install,) = commands
+        assert "--no-deps" in install
+        assert install[-2:] == ["Django==4.2.7", "asgiref==3.7.2"]
+
+    def test_incomplete_install_report_is_not_cached(self, temp_project_dir, monkeypatch):
+        """Test that an install which kept a dependency the venv had is not reused."""
+        manager = VirtualEnvManager(temp_project_dir)
+        _, _, venv_path = manager.create_venv("venv")
+        req_file = temp_project_dir / "requirements.txt"
+        req_file.write_text("django>=4.2\n")
+        report = dry_run_report(("Django", "4.2.7"))
+        report["install"][0]["metadata"]["requires_dist"] = ["asgiref<4,>=3.6.0"]
+        monkeypatch.setattr("envwizard.venv.run_streamed", fake_pip([], report))
+
+        assert manager.install_dependencies(venv_path, req_file)[0] is True
+        assert list(manager.resolution_cache.root.glob("*.json")) == []
+
+    def test_failed_install_drops_cached_resolution(self, temp_project_dir, monkeypatch):
+        """Test that pins which no longer install are resolved again next time."""
+        manager = VirtualEnvManager(temp_project_dir)
+        _, _, venv_path = manager.create_venv("venv")
+        req_file = temp_project_dir / "requirements.txt"
+        req_file.write_text("six\n")
+        monkeypatch.setattr(
+            "envwizard.venv.run_streamed", fake_pip([], dry_run_report(("six", "1.16.0")))
+        )
+        manager.install_dependencies(venv_path, req_file)
+        monkeypatch.setattr("envwizard.venv.run_streamed", lambda command, on_output=None: (1, []))
+
+        assert manager.install_dependencies(venv_path, req_file)[0] is False
+        assert list(manager.resolution_cache.root.glob("*.json")) == []
+
+
+class TestResolveCommand:
+    """Tests for `envwizard resolve`."""
+
+    def test_resolve_and_refresh(self, temp_project_dir, monkeypatch):
+        """Test that the pins are listed and --refresh resolves again."""
+        _, _, venv_path = VirtualEnvManager(temp_project_dir).create_venv("venv")
+        (temp_project_dir / "requirements.txt").write_text("six\n")
+        commands = []
+        monkeypatch.setattr(
+            "envwizard.venv.run_streamed", fake_pip(commands, dry_run_report(("six", "1.16.0")))
+        )
+        runner = CliRunner()
+
+        result = runner.invoke(cli, ["resolve", "-p", str(temp_project_dir)])
+        assert result.exit_code == 0
+        assert "Resolved 1 packages" in result.output
+        assert "1.16.0" in result.output
+
+        result = runner.invoke(cli, ["resolve", "-p", str(temp_project_dir)])
+        assert "cached resolution" in result.output
+        result = runner.invoke(cli, ["resolve", "-p", str(temp_project_dir), "--refresh"])
+        assert "Resolved 1 packages" in result.output
+        assert len(commands) == 2
+
+    def test_missing_venv(self, temp_project_dir):
+        """Test that resolving needs the project's venv."""
+        (temp_project_dir / "requirements.txt").write_text("six\n")
+        result = CliRunner().invoke(cli, ["resolve", "-p", str(temp_project_dir)])
+        assert result.exit_code == 1
+        assert "not found" in result.output
@@ -0,0 +1,63 @@
+"""Startup cost regression tests."""
+
+import subprocess
+import sys
+
+# Importing the CLI used to take ~230 ms; with lazy imports it is a
+# fraction of that. The budget leaves room for slow CI machines.
+STARTUP_BUDGET_MS = 150
+
+# Modules that only specific commands need
+DEFERRED_MODULES = [
+    "envwizard.core",
+    "envwizard.venv",
+    "envwizard.detectors",
+    "rich.console",
+    "rich.progress",
+    "yaml",
+    "sqlite3",
+    "concurrent.futures.process",
+]
+
+
+def _import_times(module: str):
+    """Import a module in a fresh interpreter and return {name: cumulative_us}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = max(times.get(name.strip(), 0), int(cumulative))
+    return times
+
+
+class TestStartup:
+    """Tests that quick commands do not pay for heavy imports."""
+
+    def test_cli_defers_heavy_modules(self):
+        """Test that importing the CLI does not import core, rich or yaml."""
+        times = _import_times("envwizard.cli.main")
+
+        assert "envwizard.cli.main" in times
+        assert [name for name in DEFERRED_MODULES if name in times] == []
+
+    def test_package_import_is_lazy(self):
+        """Test that `import envwizard` does not import core until EnvWizard is used."""
+        assert "envwizard.core" not in _import_times("envwizard")
+
+        import envwizard
+
+        assert envwizard.EnvWizard.__name__ == "EnvWizard"
+
+    def test_cli_import_budget(self):
+        """Test that the CLI imports within the startup budget (best of three)."""
+        best_us = min(_import_times("envwizard.cli.main")["envwizard.cli"] for _ in range(3))
+
+        assert best_us / 1000 < STARTUP_BUDGET_MS
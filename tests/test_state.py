@@ -0,0 +1,120 @@
+"""Tests for the setup state ledger."""
+
+import json
+
+import pytest
+
+from envwizard.core import EnvWizard
+from envwizard.state import STATE_VERSION, StateLedger, fingerprint
+
+
+class TestStateLedger:
+    """Tests for StateLedger persistence."""
+
+    def test_round_trip(self, temp_project_dir):
+        """Test that recorded phases survive a save and reload."""
+        path = temp_project_dir / ".envwizard" / "state.json"
+        ledger = StateLedger(path)
+        ledger.record("deps", "abc", file="requirements.txt")
+        assert ledger.save()
+
+        reloaded = StateLedger(path)
+        assert reloaded.is_current("deps", "abc")
+        assert not reloaded.is_current("deps", "def")
+        assert reloaded.get("deps")["file"] == "requirements.txt"
+        assert (path.parent / ".gitignore").exists()
+
+    def test_unreadable_or_outdated_file_is_ignored(self, temp_project_dir):
+        """Test that a corrupt or old-format ledger counts as empty."""
+        path = temp_project_dir / "state.json"
+        path.write_text("{not json")
+        assert StateLedger(path).get("deps") is None
+
+        path.write_text(json.dumps({"version": STATE_VERSION - 1, "phases": {"deps": {}}}))
+        assert StateLedger(path).get("deps") is None
+
+    def test_fingerprint_is_stable(self):
+        """Test that fingerprints depend only on the values."""
+        assert fingerprint(["a"], {"b": 1, "c": 2}) == fingerprint(["a"], {"c": 2, "b": 1})
+        assert fingerprint("a") != fingerprint("b")
+
+
+class TestIdempotentSetup:
+    """Tests that repeated setups only redo what changed."""
+
+    @pytest.fixture
+    def installs(self, monkeypatch):
+        """Record dependency installs instead of running pip."""
+        calls = []
+
+        def fake_install(self, venv_path, requirements_file=None, on_output=None, **options):
+            calls.append(requirements_file.name)
+            return True, "Dependencies installed successfully"
+
+        monkeypatch.setattr("envwizard.venv.VirtualEnvManager.install_dependencies", fake_install)
+        return calls
+
+    def test_second_setup_is_a_no_op(self, django_project, installs, monkeypatch):
+        """Test that an unchanged project skips detection, install and .env generation."""
+        first = EnvWizard(django_project).setup(venv_name="test_venv")
+        assert first["deps_installed"] is True
+        assert first["dotenv_created"] is True
+        assert installs == ["requirements.txt"]
+
+        wizard = EnvWizard(django_project)
+        detections = []
+        monkeypatch.setattr(
+            wizard.project_detector, "detect_project_type", lambda *a: detections.append(a)
+        )
+        second = wizard.setup(venv_name="test_venv")
+
+        assert detections == []
+        assert second["project_info"]["frameworks"] == first["project_info"]["frameworks"]
+        assert set(second["skipped"]) == {"deps", "dotenv"}
+        assert second["deps_installed"] is True
+        assert installs == ["requirements.txt"]
+
+    def test_only_changed_phases_are_redone(self, django_project, installs):
+        """Test that editing requirements.txt reinstalls without touching .env."""
+        EnvWizard(django_project).setup(venv_name="test_venv")
+
+        with open(django_project / "requirements.txt", "a") as f:
+            f.write("requests>=2.0\n")
+        results = EnvWizard(django_project).setup(venv_name="test_venv")
+
+        assert installs == ["requirements.txt", "requirements.txt"]
+        assert results["skipped"] == ["dotenv"]
+
+    def test_editing_an_included_file_reinstalls(self, django_project, installs):
+        """Test that a change to a -r include is not hidden behind the top-level file."""
+        (django_project / "base.txt").write_text("django>=4.0\n")
+        (django_project / "requirements.txt").write_text("-r base.txt\n")
+        EnvWizard(django_project).setup(venv_name="test_venv")
+
+        (django_project / "base.txt").write_text("django>=4.0\nrequests>=2.0\n")
+        results = EnvWizard(django_project).setup(venv_name="test_venv")
+
+        assert installs == ["requirements.txt", "requirements.txt"]
+        assert "deps" not in results["skipped"]
+
+    def test_changed_install_options_reinstall(self, django_project, installs, tmp_path):
+        """Test that installing with other options does not count as up to date."""
+        EnvWizard(django_project).setup(venv_name="test_venv")
+        EnvWizard(django_project).setup(venv_name="test_venv", wheelhouse=tmp_path)
+        EnvWizard(django_project).setup(venv_name="test_venv", wheelhouse=tmp_path)
+        EnvWizard(django_project).setup(
+            venv_name="test_venv", wheelhouse=tmp_path, precompile="checked-hash"
+        )
+
+        assert len(installs) == 3
+
+    def test_clearing_the_ledger_forces_a_full_run(self, django_project, installs):
+        """Test that a cleared ledger (init --force) redoes every phase."""
+        EnvWizard(django_project).setup(venv_name="test_venv")
+
+        wizard = EnvWizard(django_project)
+        wizard.state.clear()
+        results = wizard.setup(venv_name="test_venv")
+
+        assert len(installs) == 2
+        assert results["skipped"] == []
@@ -1,10 +1,23 @@
 """Tests for virtual environment management."""
 
 import platform
+import shutil
+import sys
+import zipfile
 import pytest
 from pathlib import Path
 
-from envwizard.venv import VirtualEnvManager
+from envwizard.pip_cache import PTH_FILENAME, SharedPip
+from envwizard.venv import VirtualEnvManager, run_streamed
+from envwizard.venv_metadata import read_pyvenv_cfg, read_venv_metadata
+
+
+def without_report(command):
+    """Drop the `--report FILE` that installs pass to pip."""
+    if "--report" not in command:
+        return command
+    index = command.index("--report")
+    return command[:index] + command[index + 2 :]
 
 
 class TestVirtualEnvManager:
@@ -121,3 +134,182 @@ class TestVirtualEnvManager:
 
         info = manager.get_venv_info(venv_path)
         assert info["exists"] is False
+
+
+class TestVenvMetadata:
+    """Tests for reading venv metadata without running Python."""
+
+    @pytest.fixture
+    def fake_venv(self, temp_project_dir):
+        """A venv layout with pyvenv.cfg and two installed distributions."""
+        home = temp_project_dir / "base" / "bin"
+        home.mkdir(parents=True)
+        venv_path = temp_project_dir / "fake_venv"
+        site_packages = venv_path / "lib" / "python3.11" / "site-packages"
+        site_packages.mkdir(parents=True)
+        (site_packages / "click-8.1.7.dist-info").mkdir()
+        (site_packages / "six-1.16.0.dist-info").mkdir()
+        (site_packages / "six.py").write_text("# six\n")
+        (venv_path / "bin").mkdir()
+        (venv_path / "bin" / "python").write_text("")
+        (venv_path / "pyvenv.cfg").write_text(
+            f"home = {home}\ninclude-system-site-packages = true\nversion = 3.11.7\n"
+        )
+        return venv_path
+
+    def test_read_pyvenv_cfg(self, fake_venv, temp_project_dir):
+        """Test that pyvenv.cfg keys are parsed case-insensitively."""
+        cfg = read_pyvenv_cfg(fake_venv)
+        assert cfg["version"] == "3.11.7"
+        assert cfg["include-system-site-packages"] == "true"
+        assert read_pyvenv_cfg(temp_project_dir) == {}
+
+    @pytest.mark.skipif(platform.system() == "Windows", reason="POSIX venv layout")
+    def test_read_venv_metadata(self, fake_venv):
+        """Test version, site-packages and package count from the files alone."""
+        meta = read_venv_metadata(fake_venv, measure_size=True)
+
+        assert meta.version == "3.11.7"
+        assert meta.include_system_site_packages is True
+        assert meta.site_packages.endswith("site-packages")
+        assert meta.package_count == 2
+        assert meta.interpreter_alive is True
+        assert meta.size_bytes == len("# six\n")
+
+    def test_dead_interpreter(self, fake_venv, temp_project_dir):
+        """Test that a venv whose base Python is gone is reported as dead."""
+        (temp_project_dir / "base" / "bin").rmdir()
+        assert read_venv_metadata(fake_venv).interpreter_alive is False
+
+    def test_not_a_venv(self, temp_project_dir):
+        """Test that a directory without pyvenv.cfg has no metadata."""
+        assert read_venv_metadata(temp_project_dir) is None
+
+    def test_get_venv_info_spawns_no_process(self, temp_project_dir, monkeypatch):
+        """Test that get_venv_info never starts the venv's interpreter."""
+        manager = VirtualEnvManager(temp_project_dir)
+        success, _, venv_path = manager.create_venv("test_venv")
+        assert success is True
+
+        def no_subprocess(*args, **kwargs):
+            raise AssertionError("get_venv_info started a process")
+
+        monkeypatch.setattr("subprocess.run", no_subprocess)
+        monkeypatch.setattr("subprocess.Popen", no_subprocess)
+        info = manager.get_venv_info(venv_path)
+
+        expected = "Python {}.{}.{}".format(*sys.version_info[:3])
+        assert info["python_version"] == expected
+        assert info["interpreter_alive"] is True
+        assert info["package_count"] >= 0
+
+
+class TestSharedPip:
+    """Tests for venvs that use the pip shared through the user cache."""
+
+    @pytest.fixture
+    def ensurepip_wheel(self):
+        """Skip when the interpreter ships without ensurepip's bundled wheels."""
+        wheels = SharedPip().wheels()
+        if not wheels:
+            pytest.skip("No bundled pip wheel")
+        return wheels[0]
+
+    def test_create_venv_links_shared_pip(self, temp_project_dir, ensurepip_wheel):
+        """Test that a shared-pip venv has no pip of its own but can run pip."""
+        manager = VirtualEnvManager(temp_project_dir)
+        success, _, venv_path = manager.create_venv("test_venv", shared_pip=True)
+        assert success is True
+
+        site_packages = Path(manager.get_venv_info(venv_path)["site_packages"])
+        assert not (site_packages / "pip").exists()
+        shared_dir = SharedPip.linked_dir(venv_path)
+        assert (shared_dir / "pip" / "__init__.py").exists()
+        assert (site_packages / PTH_FILENAME).exists()
+        assert manager._pip_command(venv_path)[1:] == ["-m", "pip"]
+
+    def test_install_skips_pip_upgrade(self, temp_project_dir, ensurepip_wheel, monkeypatch):
+        """Test that installing into a shared-pip venv does not upgrade pip."""
+        manager = VirtualEnvManager(temp_project_dir)
+        _, _, venv_path = manager.create_venv("test_venv", shared_pip=True)
+        req_file = temp_project_dir / "requirements.txt"
+        req_file.write_text("click\n")
+
+        commands = []
+
+        def fake_run(command, on_output=None):
+            commands.append(without_report(command))
+            return 0, []
+
+        monkeypatch.setattr("envwizard.venv.run_streamed", fake_run)
+        success, _ = manager.install_dependencies(venv_path, req_file)
+
+        assert success is True
+        assert len(commands) == 1
+        assert commands[0][1:] == ["-m", "pip", "install", "click"]
+
+    def test_relinks_after_cache_removal(self, temp_project_dir, ensurepip_wheel):
+        """Test that a venv whose shared pip was pruned gets it back."""
+        manager = VirtualEnvManager(temp_project_dir)
+        _, _, venv_path = manager.create_venv("test_venv", shared_pip=True)
+        shared_dir = SharedPip.linked_dir(venv_path)
+        shutil.rmtree(shared_dir)
+
+        assert manager._pip_command(venv_path) is not None
+        assert (shared_dir / "pip" / "__init__.py").exists()
+
+    def test_incompatible_wheels_are_passed_over(self, user_cache_dir, ensurepip_wheel):
+        """Test that a newer wheel excluded by Requires-Python is not used."""
+        shared = SharedPip(user_cache_dir)
+        shared.root.mkdir(parents=True)
+        with zipfile.ZipFile(shared.root / "pip-99.0-py3-none-any.whl", "w") as wheel:
+            wheel.writestr("pip/__init__.py", "")
+            wheel.writestr(
+                "pip-99.0.dist-info/METADATA",
+                "Metadata-Version: 2.1\nName: pip\nRequires-Python: >=99\n",
+            )
+
+        version, _ = ensurepip_wheel
+        assert shared.ensure((3, 11)).name == "pip-" + ".".join(map(str, version))
+        assert shared.ensure((99, 0)).name == "pip-99.0"
+
+
+class TestStreamedInstall:
+    """Tests for streaming pip output."""
+
+    def test_run_streamed_keeps_bounded_tail(self):
+        """Test that every line is streamed but only the last ones are kept."""
+        lines = []
+        code = "import sys\nfor i in range(100): print(i)\nsys.exit(3)"
+        returncode, tail = run_streamed(
+            [sys.executable, "-c", code], on_output=lines.append, tail_lines=5
+        )
+
+        assert returncode == 3
+        assert lines == [str(i) for i in range(100)]
+        assert tail == ["95", "96", "97", "98", "99"]
+
+    def test_failure_message_has_output_tail(self, temp_project_dir, monkeypatch):
+        """Test that a failed install reports the end of pip's output in one run."""
+        manager = VirtualEnvManager(temp_project_dir)
+        _, _, venv_path = manager.create_venv("test_venv")
+        req_file = temp_project_dir / "requirements.txt"
+        req_file.write_text("click\nrich\n")
+
+        commands = []
+
+        def fake_run(command, on_output=None):
+            commands.append(without_report(command))
+            on_output("Collecting click")
+            return 1, ["Collecting click", "ERROR: No matching distribution found for click"]
+
+        monkeypatch.setattr("envwizard.venv.run_streamed", fake_run)
+        streamed = []
+        success, message = manager.install_dependencies(venv_path, req_file, streamed.append)
+
+        assert success is False
+        assert commands == [
+            manager._pip_command(venv_path) + ["install", "--upgrade", "pip", "click", "rich"]
+        ]
+        assert streamed == ["Collecting click"]
+        assert message.endswith("ERROR: No matching distribution found for click")
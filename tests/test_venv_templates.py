@@ -0,0 +1,126 @@
+"""Tests for venv templates."""
+
+import errno
+import os
+import platform
+import subprocess
+import sys
+
+import pytest
+
+from envwizard import venv_templates
+from envwizard.venv import VirtualEnvManager
+from envwizard.venv_templates import TemplateStore, TreeCloner
+
+pytestmark = pytest.mark.skipif(
+    platform.system() == "Windows", reason="Templates are not used on Windows"
+)
+
+
+def _unsupported(code):
+    def clone(src, dst):
+        raise OSError(code, os.strerror(code))
+
+    return clone
+
+
+class TestTreeCloner:
+    """Tests for the reflink/hardlink/copy fallback chain."""
+
+    def test_falls_back_and_reports_chain(self, tmp_path, monkeypatch):
+        """Test that unsupported methods are skipped and named in the description."""
+        monkeypatch.setitem(venv_templates._CLONERS, "reflink", _unsupported(errno.EOPNOTSUPP))
+        monkeypatch.setitem(venv_templates._CLONERS, "hardlink", _unsupported(errno.EXDEV))
+        (tmp_path / "src").write_text("data")
+
+        cloner = TreeCloner(["reflink", "hardlink", "copy"])
+        cloner.clone_file(str(tmp_path / "src"), str(tmp_path / "dst"))
+
+        assert (tmp_path / "dst").read_text() == "data"
+        assert cloner.describe() == "copy; reflink, hardlink unsupported"
+
+    def test_other_errors_are_raised(self, tmp_path):
+        """Test that a missing source is an error, not a reason to fall back."""
+        cloner = TreeCloner(["hardlink", "copy"])
+        with pytest.raises(FileNotFoundError):
+            cloner.clone_file(str(tmp_path / "missing"), str(tmp_path / "dst"))
+        assert cloner.unsupported == []
+
+
+class TestTemplateClone:
+    """Tests for creating venvs from templates."""
+
+    def test_second_venv_is_cloned(self, temp_project_dir, user_cache_dir):
+        """Test that venvs are cloned and rewritten for their own location."""
+        manager = VirtualEnvManager(temp_project_dir)
+        success, message, venv_path = manager.create_venv("myenv", use_template=True)
+        assert success is True
+        assert "cloned from template via" in message
+
+        activate = (venv_path / "bin" / "activate").read_text()
+        assert f'VIRTUAL_ENV="{venv_path}"' in activate
+        assert "(myenv) " in activate
+        assert str(user_cache_dir) not in (venv_path / "pyvenv.cfg").read_text()
+        assert (venv_path / "bin" / "pip").read_text().startswith(f"#!{venv_path}/bin/python")
+
+        info = manager.get_venv_info(venv_path)
+        assert info["interpreter_alive"] is True
+        assert info["package_count"] >= 1
+
+    def test_template_is_left_untouched(self, temp_project_dir, user_cache_dir):
+        """Test that rewritten files are new files, not writes through hardlinks."""
+        manager = VirtualEnvManager(temp_project_dir)
+        _, _, venv_path = manager.create_venv("myenv", use_template=True)
+        (template,) = (user_cache_dir / TemplateStore.DIRNAME).glob("*/venv")
+
+        assert str(template) in (template / "bin" / "activate").read_text()
+        clone_stat = os.stat(venv_path / "bin" / "activate")
+        assert clone_stat.st_ino != os.stat(template / "bin" / "activate").st_ino
+
+    def test_clone_runs_from_its_own_path(self, temp_project_dir, user_cache_dir):
+        """Test that a clone's scripts and pyvenv.cfg work away from the template."""
+        manager = VirtualEnvManager(temp_project_dir)
+        _, _, venv_path = manager.create_venv("myenv", use_template=True)
+        (template,) = (user_cache_dir / TemplateStore.DIRNAME).glob("*/venv")
+        assert venv_path != template
+
+        cfg = (venv_path / "pyvenv.cfg").read_text()
+        home = os.path.dirname(os.path.realpath(sys.executable))
+        assert cfg == (template / "pyvenv.cfg").read_text().replace(str(template), str(venv_path))
+        assert any(
+            os.path.realpath(line.split("=", 1)[1].strip()) == home
+            for line in cfg.splitlines()
+            if line.startswith("home")
+        )
+
+        result = subprocess.run(
+            [str(venv_path / "bin" / "pip"), "--version"], capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+        assert str(venv_path) in result.stdout
+
+        result = subprocess.run(
+            [str(venv_path / "bin" / "python"), "-c", "import sys; print(sys.prefix)"],
+            capture_output=True,
+            text=True,
+        )
+        assert result.stdout.strip() == str(venv_path)
+
+    def test_without_template(self, temp_project_dir, user_cache_dir):
+        """Test that venvs are built directly unless templates are asked for."""
+        manager = VirtualEnvManager(temp_project_dir)
+        success, message, _ = manager.create_venv("myenv")
+
+        assert success is True
+        assert "cloned" not in message
+        assert not (user_cache_dir / TemplateStore.DIRNAME).exists()
+
+    def test_template_being_built_elsewhere(self, temp_project_dir, user_cache_dir):
+        """Test that a template under construction is not waited for."""
+        manager = VirtualEnvManager(temp_project_dir)
+        key = manager.templates.key(sys.executable, "pip")
+        (manager.templates.root / key).mkdir(parents=True)
+
+        success, message, _ = manager.create_venv("myenv", use_template=True)
+        assert success is True
+        assert "cloned" not in message
@@ -0,0 +1,93 @@
+"""Tests for the project directory walker."""
+
+import os
+
+import pytest
+
+from envwizard.detectors import ProjectDetector
+from envwizard.detectors.walker import iter_project_files, walk_project
+
+
+class TestWalkProject:
+    """Tests for walk_project and iter_project_files."""
+
+    def test_finds_nested_python_files(self, temp_project_dir):
+        """Test that files up to the default depth are found."""
+        nested = temp_project_dir / "a" / "b" / "c"
+        nested.mkdir(parents=True)
+        (temp_project_dir / "top.py").write_text("")
+        (nested / "deep.py").write_text("")
+
+        names = {e.name for e in iter_project_files(temp_project_dir, ["*.py"])}
+
+        assert names == {"top.py", "deep.py"}
+
+    def test_respects_max_depth(self, temp_project_dir):
+        """Test that directories below max_depth are not entered."""
+        nested = temp_project_dir / "a" / "b"
+        nested.mkdir(parents=True)
+        (temp_project_dir / "a" / "one.py").write_text("")
+        (nested / "two.py").write_text("")
+
+        names = {e.name for e in iter_project_files(temp_project_dir, ["*.py"], max_depth=1)}
+
+        assert names == {"one.py"}
+
+    def test_prunes_ignored_directories(self, temp_project_dir):
+        """Test that venvs, VCS and vendored directories are skipped."""
+        for name in ["venv", ".git", "node_modules", "__pycache__"]:
+            (temp_project_dir / name).mkdir()
+            (temp_project_dir / name / "skipped.py").write_text("")
+        (temp_project_dir / "app.py").write_text("")
+
+        names = {e.name for e in iter_project_files(temp_project_dir, ["*.py"])}
+
+        assert names == {"app.py"}
+
+    def test_prunes_custom_named_virtualenv(self, temp_project_dir):
+        """Test that any directory containing pyvenv.cfg is skipped."""
+        custom_env = temp_project_dir / "my-env"
+        (custom_env / "lib").mkdir(parents=True)
+        (custom_env / "pyvenv.cfg").write_text("home = /usr/bin\n")
+        (custom_env / "lib" / "vendored.py").write_text("")
+
+        assert list(iter_project_files(temp_project_dir, ["*.py"])) == []
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks not supported")
+    def test_symlink_loop_terminates(self, temp_project_dir):
+        """Test that a symlink pointing back to the root is not followed forever."""
+        (temp_project_dir / "pkg").mkdir()
+        (temp_project_dir / "pkg" / "mod.py").write_text("")
+        try:
+            os.symlink(temp_project_dir, temp_project_dir / "pkg" / "loop")
+        except OSError:
+            pytest.skip("cannot create symlinks")
+
+        entries = list(walk_project(temp_project_dir, max_depth=10))
+        names = [e.name for e, _ in entries]
+
+        assert names.count("mod.py") == 1
+
+
+class TestDetectorUsesWalker:
+    """Tests that ProjectDetector relies on the pruned walk."""
+
+    def test_virtualenv_imports_are_ignored(self, temp_project_dir):
+        """Test that imports inside a venv do not trigger detection."""
+        site = temp_project_dir / "venv" / "lib" / "site-packages"
+        site.mkdir(parents=True)
+        (site / "vendored.py").write_text("import django\n")
+
+        detector = ProjectDetector(temp_project_dir)
+        info = detector.detect_project_type()
+
+        assert "django" not in info["frameworks"]
+
+    def test_configurable_depth(self, temp_project_dir):
+        """Test that max_depth limits the import scan."""
+        nested = temp_project_dir / "a" / "b"
+        nested.mkdir(parents=True)
+        (nested / "views.py").write_text("import flask\n")
+
+        assert "flask" not in ProjectDetector(temp_project_dir, max_depth=1)._detect_from_imports()
+        assert "flask" in ProjectDetector(temp_project_dir, max_depth=2)._detect_from_imports()
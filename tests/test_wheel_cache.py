@@ -0,0 +1,148 @@
+"""Tests for the built-wheel cache."""
+
+import json
+
+from envwizard.venv import VirtualEnvManager
+from envwizard.wheel_cache import WheelCache, sdist_installs, wheel_tags
+
+SHA = "1d6d69ce66211143803fbc56652b41d73b4a400a2891d7bf7a1cdf4c02de613b"
+WHEEL = "termcolor-1.1.0-py3-none-any.whl"
+
+
+def pip_report(url="https://example.org/termcolor-1.1.0.tar.gz"):
+    """A `pip install --report` with one sdist, one wheel and one local directory."""
+    return {
+        "version": "1",
+        "install": [
+            {
+                "metadata": {"name": "termcolor", "version": "1.1.0"},
+                "download_info": {"url": url, "archive_info": {"hashes": {"sha256": SHA}}},
+            },
+            {
+                "metadata": {"name": "six", "version": "1.17.0"},
+                "download_info": {
+                    "url": "https://example.org/six-1.17.0-py2.py3-none-any.whl",
+                    "archive_info": {"hash": "sha256=abc"},
+                },
+            },
+            {
+                "metadata": {"name": "demo", "version": "0.1"},
+                "download_info": {"url": "file:///src/demo", "dir_info": {"editable": True}},
+            },
+        ],
+    }
+
+
+class TestReport:
+    """Tests for reading pip's install report and wheel names."""
+
+    def test_wheel_tags(self):
+        """Test tags of plain and build-numbered wheel names."""
+        assert wheel_tags(WHEEL) == ("py3", "none", "any")
+        assert wheel_tags("pkg-1.0-1-cp311-cp311-linux_x86_64.whl") == (
+            "cp311",
+            "cp311",
+            "linux_x86_64",
+        )
+        assert wheel_tags("pkg-1.0.tar.gz") is None
+
+    def test_sdist_installs(self):
+        """Test that only source archives are reported, with their hashes."""
+        (sdist,) = sdist_installs(pip_report())
+        assert sdist.name == "termcolor"
+        assert sdist.version == "1.1.0"
+        assert sdist.sha256 == SHA
+
+
+class TestWheelCache:
+    """Tests for storing built wheels."""
+
+    def test_store_keys_by_sdist_abi_and_platform(self, tmp_path, user_cache_dir):
+        """Test the keyed layout and the flat --find-links directory."""
+        cache = WheelCache(user_cache_dir)
+        assert cache.find_links() is None
+        (tmp_path / WHEEL).write_bytes(b"wheel")
+
+        stored = cache.store(SHA, tmp_path / WHEEL)
+
+        assert stored == cache.root / "builds" / SHA / "none-any" / WHEEL
+        assert stored.read_bytes() == b"wheel"
+        assert cache.find_links() == cache.links
+        assert (cache.links / WHEEL).read_bytes() == b"wheel"
+        assert cache.store(SHA, tmp_path / WHEEL) == stored
+
+    def test_add_builds_uses_pips_wheel(self, tmp_path, user_cache_dir, monkeypatch):
+        """Test that a wheel pip kept is cached without building again."""
+        cache = WheelCache(user_cache_dir)
+        (tmp_path / WHEEL).write_bytes(b"wheel")
+        report = tmp_path / "report.json"
+        report.write_text(json.dumps(pip_report()))
+
+        def no_build(*args):
+            raise AssertionError("rebuilt")
+
+        monkeypatch.setattr(cache, "build", no_build)
+
+        added = cache.add_builds(report, {"termcolor": tmp_path / WHEEL}, ["pip"], [])
+
+        assert added == 1
+        assert (cache.links / WHEEL).exists()
+
+    def test_add_builds_rebuilds_lost_wheel(self, tmp_path, user_cache_dir, monkeypatch):
+        """Test that pip wheel builds the sdist when pip's build is gone."""
+        cache = WheelCache(user_cache_dir)
+        sdist = tmp_path / "termcolor-1.1.0.tar.gz"
+        sdist.write_bytes(b"sdist")
+        report = tmp_path / "report.json"
+        report.write_text(json.dumps(pip_report(sdist.as_uri())))
+        calls = []
+
+        def fake_build(pip, url, options):
+            calls.append(url)
+            out = tmp_path / "out"
+            out.mkdir()
+            (out / WHEEL).write_bytes(b"rebuilt")
+            return out / WHEEL
+
+        monkeypatch.setattr(cache, "build", fake_build)
+        added = cache.add_builds(report, {"termcolor": tmp_path / "gone.whl"}, ["pip"], [])
+
+        assert added == 1
+        assert calls == [sdist.as_uri()]
+        assert (cache.root / "builds" / SHA / "none-any" / WHEEL).read_bytes() == b"rebuilt"
+        assert not (tmp_path / "out").exists()
+
+
+class TestInstallWithWheelCache:
+    """Tests for install_dependencies with the wheel cache."""
+
+    def test_built_wheel_is_offered_to_later_installs(self, temp_project_dir, monkeypatch):
+        """Test that a source build is cached and passed to the next install."""
+        manager = VirtualEnvManager(temp_project_dir)
+        _, _, venv_path = manager.create_venv("venv")
+        req_file = temp_project_dir / "requirements.txt"
+        req_file.write_text("termcolor==1.1.0\n")
+        built = temp_project_dir / "pip-wheels"
+        built.mkdir()
+        (built / WHEEL).write_bytes(b"wheel")
+        commands = []
+
+        def fake_run(command, on_output=None):
+            commands.append(command)
+            report = command[command.index("--report") + 1]
+            with open(report, "w") as f:
+                json.dump(pip_report(), f)
+            on_output("Collecting termcolor==1.1.0")
+            on_output("  Building wheel for termcolor (pyproject.toml): started")
+            on_output("  Created wheel for termcolor: filename=" + WHEEL + " size=4902")
+            on_output(f"  Stored in directory: {built}")
+            return 0, []
+
+        monkeypatch.setattr("envwizard.venv.run_streamed", fake_run)
+        assert manager.install_dependencies(venv_path, req_file)[0] is True
+        assert "--find-links" not in commands[0]
+
+        assert manager.install_dependencies(venv_path, req_file)[0] is True
+        links = commands[1][commands[1].index("--find-links") + 1]
+        assert links == str(manager.wheel_cache.links)
+        assert (manager.wheel_cache.links / WHEEL).exists()
@@ -0,0 +1,151 @@
+"""Tests for wheelhouses and the local simple index."""
+
+import hashlib
+import subprocess
+import sys
+import zipfile
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+from click.testing import CliRunner
+
+from envwizard.cli.main import cli
+from envwizard.venv import VirtualEnvManager
+from envwizard.wheelhouse import WheelhouseIndex, archive_project
+
+
+def make_wheel(directory, name="demo_pkg", version="0.1"):
+    """A minimal pure-Python wheel."""
+    dist_info = f"{name}-{version}.dist-info"
+    path = directory / f"{name}-{version}-py3-none-any.whl"
+    with zipfile.ZipFile(path, "w") as wheel:
+        wheel.writestr(f"{name}/__init__.py", "")
+        wheel.writestr(
+            f"{dist_info}/METADATA",
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n",
+        )
+        wheel.writestr(
+            f"{dist_info}/WHEEL",
+            "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+        )
+        wheel.writestr(f"{dist_info}/RECORD", "")
+    return path
+
+
+class TestArchiveProject:
+    """Tests for naming the project of a distribution file."""
+
+    def test_archive_project(self):
+        """Test wheels, sdists and other files."""
+        assert archive_project("Django-4.2.7-py3-none-any.whl") == "django"
+        assert archive_project("zope.interface-6.1.tar.gz") == "zope-interface"
+        assert archive_project("my_pkg-1.0.zip") == "my-pkg"
+        assert archive_project("README.md") is None
+        assert archive_project("archive.tar.gz") is None
+
+
+class TestWheelhouseIndex:
+    """Tests for the PEP 503 index over a wheelhouse."""
+
+    def test_pages_and_files(self, tmp_path):
+        """Test the project list, the file links with hashes and the downloads."""
+        wheel = make_wheel(tmp_path)
+        (tmp_path / "notes.txt").write_text("not a distribution\n")
+
+        with WheelhouseIndex(tmp_path) as index:
+            projects = urlopen(index.url).read().decode()
+            files = urlopen(index.url + "Demo.Pkg/").read().decode()
+            base = index.url[: -len("/simple/")]
+            data = urlopen(f"{base}/files/{wheel.name}").read()
+            with pytest.raises(HTTPError):
+                urlopen(index.url + "missing/")
+            with pytest.raises(HTTPError):
+                urlopen(f"{base}/files/notes.txt")
+
+        assert '<a href="demo-pkg/">demo-pkg</a>' in projects
+        assert f"#sha256={hashlib.sha256(wheel.read_bytes()).hexdigest()}" in files
+        assert data == wheel.read_bytes()
+
+    def test_pip_downloads_from_index(self, tmp_path):
+        """Test that pip finds and verifies a wheel through the index."""
+        wheelhouse = tmp_path / "wheelhouse"
+        wheelhouse.mkdir()
+        make_wheel(wheelhouse)
+        dest = tmp_path / "downloads"
+
+        with WheelhouseIndex(wheelhouse) as index:
+            result = subprocess.run(
+                [sys.executable, "-m", "pip", "--isolated", "download", "--no-deps"]
+                + ["--no-cache-dir", "--index-url", index.url, "-d", str(dest), "demo-pkg==0.1"],
+                capture_output=True,
+                text=True,
+            )
+
+        assert result.returncode == 0, result.stderr
+        assert (dest / "demo_pkg-0.1-py3-none-any.whl").exists()
+
+
+class TestOfflineInstall:
+    """Tests for install_dependencies and build_wheelhouse."""
+
+    def test_install_from_wheelhouse(self, temp_project_dir, tmp_path, monkeypatch):
+        """Test that pip only looks in the wheelhouse and is not upgraded."""
+        manager = VirtualEnvManager(temp_project_dir)
+        _, _, venv_path = manager.create_venv("venv")
+        req_file = temp_project_dir / "requirements.txt"
+        req_file.write_text("six\n")
+        commands = []
+
+        def fake_run(command, on_output=None):
+            commands.append(command)
+            return 0, []
+
+        monkeypatch.setattr("envwizard.venv.run_streamed", fake_run)
+        success, _ = manager.install_dependencies(venv_path, req_file, wheelhouse=tmp_path)
+
+        assert success is True
+        (install,) = commands
+        assert ["--no-index", "--find-links", str(tmp_path)] == install[-4:-1]
+        assert install[-1] == "six"
+        assert "pip" not in install[3:]
+
+    def test_build_collects_exact_set(self, temp_project_dir, monkeypatch):
+        """Test that a lockfile is collected as its pins, without resolving."""
+        manager = VirtualEnvManager(temp_project_dir)
+        _, _, venv_path = manager.create_venv("venv")
+        (temp_project_dir / "poetry.lock").write_text(
+            '[[package]]\nname = "six"\nversion = "1.16.0"\n'
+        )
+        wheelhouse = temp_project_dir / "wheelhouse"
+        commands = []
+
+        def fake_run(command, on_output=None):
+            commands.append(command)
+            make_wheel(wheelhouse, "six", "1.16.0")
+            return 0, []
+
+        monkeypatch.setattr("envwizard.venv.run_streamed", fake_run)
+        success, message = manager.build_wheelhouse(
+            venv_path, temp_project_dir / "poetry.lock", wheelhouse
+        )
+
+        assert success is True
+        assert message == f"Collected 1 wheels in {wheelhouse}"
+        (command,) = commands
+        assert command[3:6] == ["wheel", "--wheel-dir", str(wheelhouse)]
+        assert "--no-deps" in command
+        assert "six==1.16.0" in command
+
+    def test_build_command(self, temp_project_dir, monkeypatch):
+        """Test `envwizard wheelhouse build` with a failing pip."""
+        VirtualEnvManager(temp_project_dir).create_venv("venv")
+        (temp_project_dir / "requirements.txt").write_text("six @ https://example.org/six.whl\n")
+        monkeypatch.setattr(
+            "envwizard.venv.run_streamed", lambda command, on_output=None: (1, ["no network"])
+        )
+
+        result = CliRunner().invoke(cli, ["wheelhouse", "build", "-p", str(temp_project_dir)])
+
+        assert result.exit_code == 1
+        assert "no network" in result.output